@@ -0,0 +1,65 @@
+# search in a worker thread, so that long searches never block the window: the worker runs the searcher at full speed
+# and records its progress as event trace; after every step it publishes how many events are complete. The main loop
+# replays the published events at frame time (same stepping interface as the searchers). Only the trace and the
+# metrics are shared, both are written by the worker only (single writer, single reader --> no lock is needed)
+import threading
+import time
+from Pathfinding import EventTrace, SearchStats, TracePlayer, TimedObserver, unpack_graph
+
+
+class BackgroundSearch(TracePlayer):
+    def __init__(self, graph, algorithm_class, start, end):
+        super().__init__(graph, EventTrace(), SearchStats())
+        self.core, _ = unpack_graph(graph)  # searched by the worker (the view is only colored by the main thread)
+        self.published = 0  # number of events of complete steps; the rest of the trace is still being written
+        self.done = False  # True when the worker has ended (search finished or cancelled)
+        self.path = None  # list of node ids from start to end (when the search finished and found one)
+        self.cost = None
+        self.verbose = True  # print the outcome of the search to the console
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._work, args=(algorithm_class, start, end), daemon=True)
+        self.thread.start()
+
+    # runs in the worker thread; preprocessing (e.g. landmarks of ALT*) happens here as well and can be cancelled
+    def _work(self, algorithm_class, start, end):
+        try:
+            begin = time.perf_counter()
+            if not algorithm_class.prepare(self.core, self.cancelled.is_set):
+                return
+            preprocessing = time.perf_counter() - begin
+            searcher = algorithm_class(self.core, start, end)
+            searcher.stats.phases["preprocessing"] += preprocessing
+            searcher.verbose = False
+            searcher.observer = TimedObserver(self.trace, searcher.stats)
+            self.stats = searcher.stats
+            while not searcher.has_finished() and not self.cancelled.is_set():
+                searcher.step()
+                self.published = len(self.trace)
+            self.path, self.cost = searcher.path, searcher.cost
+            if self.verbose and not self.cancelled.is_set():
+                if searcher.path is None:
+                    print("START AND END NODE ARE NOT CONNECTED --> NO PATH CAN BE FOUND")
+                else:
+                    print(f"PATH FOUND (LENGTH {searcher.cost:.1f}, {len(self.trace)} EVENTS) in the background")
+        finally:
+            self.done = True
+
+    def available(self):
+        return self.published
+
+    # True while the worker is still searching
+    def is_running(self):
+        return not self.done
+
+    # True if everything the worker published was shown and it is still searching (nothing to show right now)
+    def waiting(self):
+        return not self.done and self.position >= self.published
+
+    def has_finished(self):
+        return self.done and self.position >= self.published
+
+    # stop the worker; returns when it has finished its current step, so the graph can be edited right afterwards.
+    # Steps that were published are still shown
+    def cancel(self):
+        self.cancelled.set()
+        self.thread.join()
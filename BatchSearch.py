@@ -0,0 +1,71 @@
+# answer many (start, end) queries on the same graph in parallel: the graph is written once into a block of shared
+# memory, the worker processes of a multiprocessing pool read it from there without copying it (the searchers only
+# read the graph), and every worker answers a chunk of the queries at a time
+import os
+from array import array
+from multiprocessing import Pool, shared_memory
+from GraphIO import graph_chunks, read_core
+from Pathfinding import Dijkstra, SearchResult, node_id
+
+CHUNKS_PER_PROCESS = 4  # queries are split into this many chunks per process (evens out slow and fast chunks)
+
+_worker_core = None  # graph of a worker process (views of the shared memory block)
+_worker_memory = None  # shared memory block of a worker process (has to stay open while the graph is used)
+_worker_algorithm = None  # searcher class that is used by a worker process
+
+
+# copy the binary image of a graph into a new shared memory block
+def share_graph(graph):
+    chunks = graph_chunks(graph)
+    memory = shared_memory.SharedMemory(create=True, size=sum(len(chunk) for chunk in chunks))
+    position = 0
+    for chunk in chunks:
+        memory.buf[position:position + len(chunk)] = chunk
+        position += len(chunk)
+    return memory
+
+
+def _init_worker(memory_name, algorithm_class):
+    global _worker_core, _worker_memory, _worker_algorithm
+    # pool workers share the resource tracker of the creating process, which removes the block in the end
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_core, _, _ = read_core(_worker_memory.buf, zero_copy=True, owner=_worker_memory)
+    _worker_algorithm = algorithm_class
+
+
+# answer the queries (starts[i], ends[i]) on a graph; returns a list of (path, cost) tuples
+def _solve(core, algorithm_class, starts, ends):
+    results = []
+    for start, end in zip(starts, ends):
+        result = algorithm_class(core, start, end).run(record_trace=False)
+        results.append((result.path, result.cost))
+    return results
+
+
+def _solve_chunk(chunk):
+    starts, ends = chunk
+    return _solve(_worker_core, _worker_algorithm, starts, ends)
+
+
+# find the paths for many (start, end) pairs of nodes (ids or Node views) on a graph (NetworkGraph or GraphCore);
+# returns a list of SearchResult (without trace) in the order of the pairs.
+# processes = number of worker processes (None --> one per cpu core, 1 --> no pool, the queries are answered here)
+def solve_queries(graph, pairs, algorithm_class=Dijkstra, processes=None):
+    starts = array('i', (node_id(start) for start, _ in pairs))
+    ends = array('i', (node_id(end) for _, end in pairs))
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(starts)))
+    if processes == 1:
+        results = _solve(getattr(graph, "core", graph), algorithm_class, starts, ends)
+        return [SearchResult(path, cost) for path, cost in results]
+
+    chunk_size = -(-len(starts) // (processes * CHUNKS_PER_PROCESS))  # ceil
+    chunks = [(starts[i:i + chunk_size], ends[i:i + chunk_size]) for i in range(0, len(starts), chunk_size)]
+    memory = share_graph(graph)
+    try:
+        with Pool(processes, initializer=_init_worker, initargs=(memory.name, algorithm_class)) as pool:
+            return [SearchResult(path, cost) for results in pool.imap(_solve_chunk, chunks) for path, cost in results]
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,44 @@
+MIN_ZOOM = 0.001  # smallest zoom factor (zoomed out)
+MAX_ZOOM = 8.0  # largest zoom factor (zoomed in)
+
+
+# view of the graph on screen: the world coordinates of the nodes are mapped to the screen by
+# screen = (world - (x, y)) * zoom, i.e. (x, y) is the world position at the upper left corner of the screen
+class Camera:
+    def __init__(self, x=0.0, y=0.0, zoom=1.0):
+        self.x = x
+        self.y = y
+        self.zoom = zoom
+
+    # (x, y, zoom); changes whenever the camera moves
+    def state(self):
+        return self.x, self.y, self.zoom
+
+    def to_screen(self, x, y):
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def to_world(self, pos):
+        return pos[0] / self.zoom + self.x, pos[1] / self.zoom + self.y
+
+    # part of the world (x0, y0, x1, y1) that is visible on a screen of the given size
+    def visible_area(self, size):
+        return self.x, self.y, self.x + size[0] / self.zoom, self.y + size[1] / self.zoom
+
+    # move the view by (dx, dy) screen pixels (the content moves along with the mouse)
+    def pan(self, dx, dy):
+        self.x -= dx / self.zoom
+        self.y -= dy / self.zoom
+
+    # zoom in (factor > 1) or out (factor < 1); the world position at pos stays at the same place on screen
+    def zoom_at(self, pos, factor):
+        x, y = self.to_world(pos)
+        self.zoom = min(max(self.zoom * factor, MIN_ZOOM), MAX_ZOOM)
+        self.x = x - pos[0] / self.zoom
+        self.y = y - pos[1] / self.zoom
+
+    # show the world area (x0, y0, x1, y1) plus a margin (in world units) completely and centered on the screen
+    def fit(self, x0, y0, x1, y1, size, margin=0):
+        x0, y0, x1, y1 = x0 - margin, y0 - margin, x1 + margin, y1 + margin
+        self.zoom = min(max(min(size[0] / max(x1 - x0, 1e-9), size[1] / max(y1 - y0, 1e-9)), MIN_ZOOM), MAX_ZOOM)
+        self.x = (x0 + x1) / 2 - size[0] / 2 / self.zoom
+        self.y = (y0 + y1) / 2 - size[1] / 2 / self.zoom
@@ -0,0 +1,107 @@
+# one-to-all and all-pairs shortest path distances of a graph (NetworkGraph or GraphCore), based on the edge weights.
+# Results are cached on the GraphCore (core.cache), which is cleared whenever the graph is edited, so asking again
+# for the same result is free until the next edit (of the shortest path trees, only the MAX_CACHED_TREES most recently
+# used ones are kept). Cached results are shared --> do not modify them.
+# The all-pairs distance matrices need numpy (imported on first use, everything else works without it).
+import heapq
+import math
+from array import array
+
+# Floyd-Warshall is used for the distance matrix if the graph has more than (nodes^2 / DENSE_FACTOR) edges:
+# its O(n^3) steps run inside numpy, while repeated Dijkstra makes O(n * m log n) steps in python
+DENSE_FACTOR = 1000
+STOP_INTERVAL = 4096  # a dijkstra that can be stopped checks whether it should stop after this many nodes
+MAX_CACHED_TREES = 8  # a tree takes 12 bytes per node of the graph (two arrays over all nodes)
+
+
+# shortest path tree from source: returns (dist, prev), two arrays indexed by node id
+# (dist = distance from source, inf if not reachable; prev = previous node on the shortest path, -1 if there is none)
+def shortest_path_tree(graph, source):
+    core = getattr(graph, "core", graph)
+    trees = core.cache.setdefault("trees", {})  # source -> (dist, prev), least recently used first
+    tree = trees.pop(source, None)
+    if tree is None:
+        tree = dijkstra_tree(core, source)
+        if len(trees) >= MAX_CACHED_TREES:
+            del trees[next(iter(trees))]
+    trees[source] = tree
+    return tree
+
+
+# dijkstra from source to all nodes of a GraphCore (not cached): returns (dist, prev) like shortest_path_tree.
+# stop: function that is called every STOP_INTERVAL nodes, the search is abandoned (None) as soon as it returns True
+def dijkstra_tree(core, source, stop=None):
+    dist = array('d', [math.inf]) * len(core.xs)
+    prev = array('i', [-1]) * len(core.xs)
+    weights = core.edge_w
+    dist[source] = 0
+    heap = [(0, source)]
+    settled = 0
+    while heap:
+        curr_dist, curr_node = heapq.heappop(heap)
+        if curr_dist > dist[curr_node]:  # outdated entry (lazy deletion)
+            continue
+        settled += 1
+        if stop is not None and settled % STOP_INTERVAL == 0 and stop():
+            return None
+        for neighbour, edge in core.neighbours(curr_node):
+            new_dist = curr_dist + weights[edge]
+            if new_dist < dist[neighbour]:
+                dist[neighbour] = new_dist
+                prev[neighbour] = curr_node
+                heapq.heappush(heap, (new_dist, neighbour))
+    return dist, prev
+
+
+# distances between all pairs of nodes: returns (ids, matrix), ids = numpy array of the node ids,
+# matrix[i, j] = distance from node ids[i] to node ids[j] (inf if not connected).
+# method = "floyd-warshall", "dijkstra" or "auto" (chosen by the density of the graph)
+def distance_matrix(graph, method="auto"):
+    core = getattr(graph, "core", graph)
+    if "matrix" not in core.cache:
+        n = core.node_count
+        if method == "auto":
+            method = "floyd-warshall" if core.edge_count * DENSE_FACTOR > n * n else "dijkstra"
+        if method == "floyd-warshall":
+            core.cache["matrix"] = _floyd_warshall(core)
+        elif method == "dijkstra":
+            core.cache["matrix"] = _repeated_dijkstra(core)
+        else:
+            raise ValueError(f"unknown method {method!r}")
+    return core.cache["matrix"]
+
+
+# ids of the living nodes and a map node id -> row of the matrix (-1 for removed nodes)
+def _node_index(core):
+    import numpy as np
+    ids = np.flatnonzero(np.frombuffer(core.alive, dtype=np.uint8))
+    index = np.full(len(core.xs), -1, dtype=np.int64)
+    index[ids] = np.arange(len(ids))
+    return ids, index
+
+
+def _floyd_warshall(core):
+    import numpy as np
+    ids, index = _node_index(core)
+    n = len(ids)
+    matrix = np.full((n, n), np.inf)
+    edges = np.flatnonzero(np.frombuffer(core.edge_alive, dtype=np.uint8))
+    rows = index[np.frombuffer(core.edge_u, dtype=np.int32)[edges]]
+    columns = index[np.frombuffer(core.edge_v, dtype=np.int32)[edges]]
+    weights = np.frombuffer(core.edge_w, dtype=np.float64)[edges]
+    matrix[rows, columns] = weights
+    matrix[columns, rows] = weights
+    np.fill_diagonal(matrix, 0)
+    for k in range(n):  # allow paths over node k: one vectorized relaxation of the whole matrix per node
+        np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+    return ids, matrix
+
+
+def _repeated_dijkstra(core):
+    import numpy as np
+    ids, _ = _node_index(core)
+    matrix = np.empty((len(ids), len(ids)))
+    for i, source in enumerate(ids):
+        dist, _ = dijkstra_tree(core, int(source))
+        matrix[i] = np.frombuffer(dist, dtype=np.float64)[ids]
+    return ids, matrix
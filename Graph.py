@@ -1,15 +1,76 @@
-import math
 from enum import Enum
-import pygame
+import itertools
+import math
 #from pathfinding_visualizer.ColorCollection import Colors
+from Camera import Camera
 from ColorCollection import Colors
+from Distances import shortest_path_tree
+from GraphCore import GraphCore
+from SpatialIndex import EdgeGrid, SpatialGrid, k_nearest_pairs, pairs_within_radius
+from Triangulation import delaunay_pairs
 
 NODE_RADIUS = 20  # radius of nodes
-MAX_NODES = 50  # max 50 nodes can be displayed
 HOVER_RADIUS_DECREASE = 3
-
-pygame.font.init()
-font = pygame.font.SysFont(None, 30)
+LABEL_MIN_RADIUS = 8  # labels are only drawn if a node is at least this big (in pixels) on screen
+LABEL_FONT_SIZES = (30, 22, 16, 12)  # font sizes that are tried (largest first) to fit a label into its node
+NEAREST_NEIGHBOURS = 3  # number of closest nodes every node is connected with (ConnectMode.NEAREST)
+CONNECT_RADIUS = 150  # nodes that are at most this far apart are connected (ConnectMode.RADIUS)
+HEAT_LEVELS = 32  # number of colors of the heat map (distance from a node)
+HEAT_NEAR_COLOR = Colors.YELLOW  # heat map color of the closest nodes
+HEAT_FAR_COLOR = Colors.RED  # heat map color of the farthest nodes
+EDGE_WIDTH = 3  # width of connections (in pixels at zoom 1)
+EDGE_CELL_SIZE = 200  # cell size of the spatial index of the connections (longer connections are always looked at)
+
+fonts = {}  # font size -> font for node labels; created on first use so importing needs no display/font system
+# pygame is only imported by the functions that draw, so the graph model (loading graphs, searching, ...) works
+# without it and is imported fast
+
+
+# get the font for node labels (initializes pygame's font module on first call)
+def get_font(size=30):
+    if size not in fonts:
+        import pygame
+        pygame.font.init()
+        fonts[size] = pygame.font.SysFont(None, size)
+    return fonts[size]
+
+
+# label of a node id --> bijective base-26 ('A'..'Z', 'AA'..'ZZ', 'AAA', ...), so every id has a unique label
+def node_label(node_id):
+    label = ""
+    node_id += 1
+    while node_id > 0:
+        node_id, rest = divmod(node_id - 1, 26)
+        label = chr(65 + rest) + label
+    return label
+
+
+# render a label so that it fits into a node with the given on-screen radius; None if it would not be readable
+def render_label(label, radius):
+    if radius < LABEL_MIN_RADIUS:
+        return None
+    for size in LABEL_FONT_SIZES:
+        img = get_font(size).render(label, True, Colors.WHITE)
+        if img.get_width() <= 2 * radius - 4:
+            return img
+    return None
+
+
+# draw a node with its center at pos onto surface (scale = zoom factor of the camera)
+def draw_node(surface, pos, color, node_type, hovered, label, scale=1.0):
+    import pygame
+    radius = (NODE_RADIUS - HOVER_RADIUS_DECREASE if hovered else NODE_RADIUS) * scale
+    ring_width = max(1, round(2 * scale))
+    if node_type == Type.START:  # draw one outer ring around start node
+        pygame.draw.circle(surface, color, pos, radius + 5 * scale, ring_width)
+    elif node_type == Type.END:  # draw two outer rings around end node
+        pygame.draw.circle(surface, color, pos, radius + 5 * scale, ring_width)
+        pygame.draw.circle(surface, color, pos, radius + 10 * scale, ring_width)
+    pygame.draw.circle(surface, color, pos, radius)
+    # draw label onto the node (only if it is readable at the node's size)
+    img = render_label(label, radius)
+    if img is not None:
+        surface.blit(img, img.get_rect(center=pos))
 
 
 # type of node
@@ -26,81 +87,125 @@ class State(Enum):
     VISITED = 2  # node was already looked at
     INSPECTED = 3  # actively looked at from pathfinding algorithm
     HIGHLIGHTED = 4 # when final path is shown
+    ENQUEUED_BACKWARD = 5  # node waiting in queue of the search from the end node (bidirectional search)
+    VISITED_BACKWARD = 6  # node was already looked at by the search from the end node (bidirectional search)
+
+
+# how the selected nodes are connected with each other
+class ConnectMode(Enum):
+    CLIQUE = 0  # every node with every other node
+    NEAREST = 1  # every node with its NEAREST_NEIGHBOURS closest nodes
+    DELAUNAY = 2  # delaunay triangulation (planar, no crossing connections)
+    RADIUS = 3  # every pair of nodes that are at most CONNECT_RADIUS apart
+
+
+# color of nodes/connections dependent on their state (selected default nodes are drawn in BLUE)
+STATE_COLORS = {
+    State.DEFAULT: Colors.BLACK,
+    State.ENQUEUED: Colors.GREY,
+    State.INSPECTED: Colors.LIME,
+    State.VISITED: Colors.PURPLE,
+    State.HIGHLIGHTED: Colors.PINK,
+    State.ENQUEUED_BACKWARD: Colors.SKYBLUE,
+    State.VISITED_BACKWARD: Colors.ORANGE,
+}
 
 
-# class for representing a single node
+# color of a heat map level (1 = closest, HEAT_LEVELS = farthest)
+def heat_color(level):
+    t = (level - 1) / (HEAT_LEVELS - 1)
+    return tuple(round(near + (far - near) * t) for near, far in zip(HEAT_NEAR_COLOR, HEAT_FAR_COLOR))
+
+
+# thin view of a single node of a NetworkGraph; all data lives in the graph's arrays
 class Node:
-    def __init__(self, pos, label=""):
-        self.pos = pos  # tuple (x, y)
-        self.label = label  # label of node --> ASCII character
-        self.type = Type.DEFAULT  # what kind of node is it
-        self.state = State.DEFAULT  # state of the node
-        self.radius = NODE_RADIUS  # radius of the node
-        self.color = Colors.BLACK  # color of node --> dependent on state
-        self.hovered = False  # is node currently hovered on
-        self.selected = False  # is node currently selected
-        self.neighbours = {}  # dict that has all nodes that are connected with this node
-
-    # add a neighbour node and it's connection
-    def add_neighbour(self, neighbour, connection):
-        if neighbour in self.neighbours.keys():
-            print(f"Connection from {self} to {neighbour} already exists!")
-        else:
-            self.neighbours[neighbour] = connection
+    __slots__ = ("graph", "id")
 
-    # remove neighbour from the neighbour list/dict
-    def remove_neighbour(self, neighbour):
-        if neighbour in self.neighbours.keys():
-            del self.neighbours[neighbour]
-        else:
-            print("There is no connection that could be removed...")
+    def __init__(self, graph, node_id):
+        self.graph = graph  # graph the node belongs to
+        self.id = node_id  # id of the node in the graph core
+
+    @property
+    def pos(self):  # tuple (x, y)
+        return self.graph.core.pos(self.id)
+
+    @property
+    def label(self):  # label of node --> derived from its id
+        return self.graph.get_label(self.id)
 
-    # make the node to start node or revoke this status
-    def make_start_node(self, make_start=True):
-        self.type = Type.START if make_start else Type.DEFAULT
+    @property
+    def type(self):  # what kind of node is it
+        if self.id == self.graph.start_id:
+            return Type.START
+        if self.id == self.graph.end_id:
+            return Type.END
+        return Type.DEFAULT
 
-    # make the node to start node or revoke this status
-    def make_end_node(self, make_end=True):
-        self.type = Type.END if make_end else Type.DEFAULT
+    @property
+    def state(self):  # state of the node
+        return State(self.graph.node_state[self.id])
+
+    @state.setter
+    def state(self, state):
+        self.graph.set_node_state(self.id, state)
+
+    @property
+    def radius(self):
+        return NODE_RADIUS
+
+    @property
+    def color(self):  # color of node --> dependent on state
+        return self.graph.node_color(self.id)
+
+    @property
+    def hovered(self):  # is node currently hovered on
+        return self.graph.hovered_id == self.id
+
+    @property
+    def selected(self):  # is node currently selected
+        return self.graph.node_selected[self.id] == 1
+
+    @property
+    def neighbours(self):  # dict that has all nodes that are connected with this node
+        return {Node(self.graph, v): Connection(self.graph, e) for v, e in self.graph.core.neighbours(self.id)}
+
+    # add a neighbour node (creates the connection in the graph)
+    def add_neighbour(self, neighbour):
+        self.graph.connect_nodes(self, neighbour)
+
+    # remove neighbour (and the connection to it)
+    def remove_neighbour(self, neighbour):
+        self.graph.disconnect_nodes(self, neighbour)
+
+    # get the connection between this node and node
+    def connection_to(self, node):
+        return Connection(self.graph, self.graph.core.find_edge(self.id, node.id))
 
     # add hover effect
     def hover(self):
-        self.hovered = True
+        self.graph.set_hovered(self.id)
 
     # node is put in queue from another node
     def enqueued_from(self, node):  # node was added to queue from a node
-        self.state = State.ENQUEUED
-        self.neighbours[node].set_enqueued(True)
-        self.adjust_color()
+        self.graph.enqueued_from(self.id, node.id)
 
     def inspected_from(self, node=None):
-        if node is not None:
-            self.neighbours[node].set_inspected(True)
-        self.state = State.INSPECTED
-        self.adjust_color()
+        self.graph.inspected_from(self.id, node.id if node is not None else -1)
 
     def visited_from(self, node=None):
-        if node is not None:
-            self.neighbours[node].set_visited(True)
-        self.state = State.VISITED
-        self.adjust_color()
+        self.graph.visited_from(self.id, node.id if node is not None else -1)
 
     def already_visited(self):
-        return self.state == State.VISITED or self.state == State.ENQUEUED or self.state == State.INSPECTED
+        return self.state != State.DEFAULT and self.state != State.HIGHLIGHTED
 
     def highlight_path_to_node(self, node=None):
-        self.color = Colors.PINK
-        self.state = State.HIGHLIGHTED
-        self.adjust_color()
-        if node is not None:
-            self.neighbours[node].set_highlighted(True)
+        self.graph.highlight_path_to_node(self.id, node.id if node is not None else -1)
 
     # reset node state to DEFAULT, as well as all outgoing connections
     def reset_state(self):
         self.state = State.DEFAULT
         for connection in self.neighbours.values():
             connection.reset()
-        self.adjust_color()
 
     def is_start_node(self):
         return self.type == Type.START
@@ -111,27 +216,11 @@ class Node:
     def is_selected(self):
         return self.selected
 
-    def adjust_color(self):
-        if self.state == State.DEFAULT:
-            if self.selected:
-                self.color = Colors.BLUE
-            else:
-                self.color = Colors.BLACK
-        elif self.state == State.ENQUEUED:
-            self.color = Colors.GREY
-        elif self.state == State.INSPECTED:
-            self.color = Colors.LIME
-        elif self.state == State.VISITED:
-            self.color = Colors.PURPLE
-        elif self.state == State.HIGHLIGHTED:
-            self.color == Colors.PINK
-
     def click(self):
-        self.selected = not self.selected  # inverse the selection
-        self.adjust_color()
+        self.graph.toggle_selected(self.id)  # inverse the selection
 
     def get_neighbours(self):
-        return self.neighbours.keys()
+        return [Node(self.graph, v) for v, _ in self.graph.core.neighbours(self.id)]
 
     def get_pos(self):
         return self.pos
@@ -141,200 +230,454 @@ class Node:
 
     # draw all the connections of this node on screen
     def draw_connections(self, screen):
-        for node, connection in self.neighbours.items():
+        for connection in self.neighbours.values():
             connection.draw(screen)
 
-    def draw(self, screen):  # draw node and its connections on screen
-        if self.type == Type.START:  # draw one outer ring around start node
-            pygame.draw.circle(screen, self.color, self.pos,
-                               self.radius - HOVER_RADIUS_DECREASE + 5 if self.hovered else self.radius + 5, 2)
-        elif self.type == Type.END:  # draw two outer rings around start node
-            pygame.draw.circle(screen, self.color, self.pos,
-                               self.radius - HOVER_RADIUS_DECREASE + 5 if self.hovered else self.radius + 5, 2)
-            pygame.draw.circle(screen, self.color, self.pos,
-                               self.radius - HOVER_RADIUS_DECREASE + 10 if self.hovered else self.radius + 10, 2)
-        pygame.draw.circle(screen, self.color, self.pos,
-                           self.radius - HOVER_RADIUS_DECREASE if self.hovered else self.radius)
-        self.hovered = False  # reset hover effect
-        # draw label onto the node
-        img = font.render(self.label, True, Colors.WHITE)
-        screen.blit(img, (self.pos[0] - 7, self.pos[1] - 7))
+    def draw(self, screen, camera=None):  # draw node on screen
+        if camera is None:
+            draw_node(screen, self.pos, self.color, self.type, self.hovered, self.label)
+        else:
+            draw_node(screen, camera.to_screen(*self.pos), self.color, self.type, self.hovered, self.label, camera.zoom)
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and other.graph is self.graph and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
 
     def __str__(self):
         return self.label
 
 
+# thin view of a single (undirected) connection of a NetworkGraph
 class Connection:
-    def __init__(self, start_pos, end_pos):
-        self.start_pos = start_pos
-        self.end_pos = end_pos
-        self.weight = math.dist(start_pos, end_pos)  # weight = distance
-        self.color = Colors.BLACK
-        self.state = State.DEFAULT
+    __slots__ = ("graph", "id")
+
+    def __init__(self, graph, edge_id):
+        self.graph = graph  # graph the connection belongs to
+        self.id = edge_id  # id of the edge in the graph core
+
+    @property
+    def start_pos(self):
+        return self.graph.core.pos(self.graph.core.edge_u[self.id])
+
+    @property
+    def end_pos(self):
+        return self.graph.core.pos(self.graph.core.edge_v[self.id])
+
+    @property
+    def weight(self):  # weight = distance
+        return self.graph.core.edge_w[self.id]
+
+    @property
+    def state(self):
+        return State(self.graph.edge_state[self.id])
+
+    @state.setter
+    def state(self, state):
+        self.graph.set_edge_state(self.id, state)
+
+    @property
+    def color(self):
+        return STATE_COLORS[self.state]
 
     def set_enqueued(self, enqueued):
         self.state = State.ENQUEUED if enqueued else State.DEFAULT
-        self.adjust_color()
 
     def set_inspected(self, inspected):
         self.state = State.INSPECTED if inspected else State.DEFAULT
-        self.adjust_color()
 
     def set_visited(self, visited):
         self.state = State.VISITED if visited else State.DEFAULT
-        self.adjust_color()
 
     def set_highlighted(self, highlighted):
         self.state = State.HIGHLIGHTED if highlighted else State.DEFAULT
-        self.adjust_color()
-
-    def adjust_color(self):
-        if self.state == State.HIGHLIGHTED:
-            self.color = Colors.PINK
-        elif self.state == State.VISITED:
-            self.color = Colors.PURPLE
-        elif self.state == State.INSPECTED:
-            self.color = Colors.LIME
-        elif self.state == State.ENQUEUED:
-            self.color = Colors.GREY
-        elif self.state == State.DEFAULT:
-            self.color = Colors.BLACK
 
     def reset(self):
         self.state = State.DEFAULT
-        self.adjust_color()
 
-    def draw(self, screen):  # draw connection on screen
-        pygame.draw.line(screen, self.color, self.start_pos, self.end_pos, 3)
+    def draw(self, screen, camera=None):  # draw connection on screen
+        import pygame
+        if camera is None:
+            pygame.draw.line(screen, self.color, self.start_pos, self.end_pos, EDGE_WIDTH)
+        else:
+            pygame.draw.line(screen, self.color, camera.to_screen(*self.start_pos), camera.to_screen(*self.end_pos),
+                             max(1, round(EDGE_WIDTH * camera.zoom)))
+
+    def __eq__(self, other):
+        return isinstance(other, Connection) and other.graph is self.graph and other.id == self.id
 
+    def __hash__(self):
+        return hash(self.id)
 
-# collection of nodes that are connected
+
+# collection of nodes that are connected; topology lives in a GraphCore, the rendering state
+# (node/connection states, selection, hover, start/end) lives in flat arrays next to it
 class NetworkGraph:
-    def __init__(self):
-        self.nodes = set()  # collection of all nodes that are part of the graph
-        self.node_count = 0  # nodes that are currently part of the graph
-        self.start_node = None  # node marked as start node
-        self.end_node = None  # node marked as end/target node
-        self.total_nodes_created = 0  # total number of nodes that were created (deleted ones inclusive)
-
-    # add new node to graph at coordinate (pos)
+    def __init__(self, core=None):
+        self.core = core if core is not None else GraphCore()  # nodes, coordinates and weighted edges
+        self.node_state = bytearray(len(self.core.xs))  # State value per node id
+        self.node_selected = bytearray(len(self.core.xs))  # 1 if node is currently selected
+        self.edge_state = bytearray(len(self.core.edge_u))  # State value per edge id
+        self.node_heat = bytearray(len(self.core.xs))  # heat map level per node id (0 --> not part of the heat map)
+        self.heat_source = -1  # id of the node whose distances are shown as heat map (-1 --> no heat map)
+        self.touched_nodes = set()  # nodes whose state is not DEFAULT (reset_states only has to look at these)
+        self.touched_edges = set()  # connections whose state is not DEFAULT
+        self.hovered_id = -1  # id of the node that is currently hovered on
+        self.start_id = -1  # id of node marked as start node
+        self.end_id = -1  # id of node marked as end/target node
+        self.dirty_nodes = set()  # nodes whose appearance changed since the last draw (consumed by the renderer)
+        self.dirty_edges = set()  # connections whose appearance changed since the last draw
+        self.edges_version = 0  # incremented whenever connections are added or removed
+        self._spatial_index = None  # grid of node positions for fast hit-testing (built on first use)
+        self._edge_index = None  # grid of connections for finding the visible ones (built on first use)
+        self.listeners = []  # objects that are notified about edits (edges_changed(node_ids), endpoints_changed())
+
+    # grid of node positions for fast hit-testing; built when it is needed for the first time,
+    # so that wrapping a large (e.g. loaded) core is fast
+    @property
+    def spatial_index(self):
+        if self._spatial_index is None:
+            self._spatial_index = SpatialGrid(2 * NODE_RADIUS)
+            for u in self.core.node_ids():
+                self._spatial_index.insert(u, self.core.xs[u], self.core.ys[u])
+        return self._spatial_index
+
+    # spatial index of the connections (see EdgeGrid); removed connections are still in it
+    @property
+    def edge_index(self):
+        if self._edge_index is None:
+            self._edge_index = EdgeGrid(self.core, EDGE_CELL_SIZE)
+        return self._edge_index
+
+    # ids of the nodes whose center lies in the area (x0, y0) - (x1, y1) (in world coordinates)
+    def nodes_in_area(self, x0, y0, x1, y1):
+        xs, ys, alive = self.core.xs, self.core.ys, self.core.alive
+        return [u for u in self.spatial_index.candidates(x0, y0, x1, y1)
+                if alive[u] and x0 <= xs[u] <= x1 and y0 <= ys[u] <= y1]
+
+    # ids of the connections whose bounding box overlaps the area (x0, y0) - (x1, y1) (in world coordinates)
+    def edges_in_area(self, x0, y0, x1, y1):
+        xs, ys, edge_alive = self.core.xs, self.core.ys, self.core.edge_alive
+        edge_u, edge_v = self.core.edge_u, self.core.edge_v
+        edges = []
+        for e in self.edge_index.candidates(x0, y0, x1, y1):
+            if edge_alive[e]:
+                u, v = edge_u[e], edge_v[e]
+                if (min(xs[u], xs[v]) <= x1 and max(xs[u], xs[v]) >= x0
+                        and min(ys[u], ys[v]) <= y1 and max(ys[u], ys[v]) >= y0):
+                    edges.append(e)
+        return edges
+
+    # register an object that is notified when connections are added/removed or start/end node change
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    # connections at the nodes with the given ids were added or removed
+    def _notify_edges_changed(self, node_ids):
+        for listener in list(self.listeners):
+            listener.edges_changed(node_ids)
+
+    # start or end node changed
+    def _notify_endpoints_changed(self):
+        for listener in list(self.listeners):
+            listener.endpoints_changed()
+
+    # get a view of the node with id node_id
+    def node(self, node_id):
+        return Node(self, node_id)
+
+    # label of a node (alphabetical order --> 'A', 'B', ..., 'Z', 'AA', 'AB', ...)
+    def get_label(self, node_id):
+        return node_label(node_id)
+
+    # grow the rendering state arrays to the size of the core arrays
+    def _sync_state_arrays(self):
+        self.node_state.extend(bytes(len(self.core.xs) - len(self.node_state)))
+        self.node_selected.extend(bytes(len(self.core.xs) - len(self.node_selected)))
+        self.node_heat.extend(bytes(len(self.core.xs) - len(self.node_heat)))
+        self.edge_state.extend(bytes(len(self.core.edge_u) - len(self.edge_state)))
+
+    # add new node to graph at coordinate (pos); O(1), the id of the node is its index in the core arrays
     def add_node(self, pos):
-        if self.node_count < MAX_NODES:
-            node = Node(pos, chr(
-                65 + self.total_nodes_created))  # label of node is character (alphabetical order --> Ascii char 65 = 'A')
-            self.nodes.add(node)
-            self.node_count += 1
-            self.total_nodes_created += 1
-        else:
-            print(f"You can not create more than {MAX_NODES} nodes!")
-
-    # connect two nodes
+        node_id = self.core.add_node(pos[0], pos[1])
+        if self._spatial_index is not None:
+            self._spatial_index.insert(node_id, pos[0], pos[1])
+        self._sync_state_arrays()
+        self.dirty_nodes.add(node_id)
+        return Node(self, node_id)
+
+    # connect two nodes; False if they were already connected
     def connect_nodes(self, node1, node2):
-        connection = Connection(node1.get_pos(), node2.get_pos())
-        node1.add_neighbour(node2, connection)
-        node2.add_neighbour(node1, connection)
+        return self.connect_node_pairs((node1.id,), (node2.id,)) == 1
 
-    # disconnect two nodes
+    # disconnect two nodes; False if there was no connection between them
     def disconnect_nodes(self, node1, node2):
-        node1.remove_neighbour(node2)
-        node2.remove_neighbour(node1)
+        return self.disconnect_node_pairs((node1.id,), (node2.id,)) == 1
+
+    # connect many pairs of nodes at once (node ids us[i] and vs[i]); returns the number of new connections
+    def connect_node_pairs(self, us, vs):
+        added = self.core.add_edges(us, vs)
+        if added:
+            self._sync_state_arrays()
+            self.edges_version += 1
+            self.clear_heat_map()
+            if self.listeners:
+                self._notify_edges_changed(set(us).union(vs))
+        return added
+
+    # disconnect many pairs of nodes at once (node ids us[i] and vs[i]); returns the number of removed connections
+    def disconnect_node_pairs(self, us, vs):
+        edges = [e for e in map(self.core.find_edge, us, vs) if e != -1]
+        removed = self.core.remove_edges(us, vs)
+        if removed:
+            self._forget_edges(edges)
+            self.edges_version += 1
+            self.clear_heat_map()
+            if self.listeners:
+                self._notify_edges_changed(set(us).union(vs))
+        return removed
 
     # check if the graph has a node near a certain position, so that a new node would not overlap
     def has_node_near_pos(self, pos):
-        for node in self.nodes:
-            if math.dist(node.get_pos(), pos) <= 2 * NODE_RADIUS:
-                return True
-        return False
+        return self.spatial_index.any_within(pos[0], pos[1], 2 * NODE_RADIUS, self.core.xs, self.core.ys)
 
-    # get the node that is currently focused with the mouse; None otherwise
+    # get the node that is currently focused with the mouse (closest one if nodes overlap); None otherwise
     def get_focused_node(self, mouse_pos):
-        for node in self.nodes:
-            if math.dist(mouse_pos, node.get_pos()) <= NODE_RADIUS:
-                return node
-        return None
+        u = self.spatial_index.nearest_within(mouse_pos[0], mouse_pos[1], NODE_RADIUS, self.core.xs, self.core.ys)
+        return Node(self, u) if u != -1 else None
+
+    # removed connections keep no state (their ids are never reused, a colored dead connection would still be drawn)
+    def _forget_edges(self, edges):
+        for e in edges:
+            self.edge_state[e] = State.DEFAULT.value
+            self.touched_edges.discard(e)
 
-    # reset states of all nodes
+    # reset states of all nodes and connections; only the ones a search colored are looked at, so the cost
+    # depends on how much of the graph the last search explored, not on the size of the graph
     def reset_states(self):
-        for node in self.nodes:
-            node.reset_state()
+        for u in self.touched_nodes:
+            self.node_state[u] = State.DEFAULT.value
+        for e in self.touched_edges:
+            self.edge_state[e] = State.DEFAULT.value
+        self.dirty_nodes.update(self.touched_nodes)
+        self.dirty_edges.update(self.touched_edges)
+        self.touched_nodes = set()
+        self.touched_edges = set()
 
     # get all the nodes that are part of the graph
     def get_nodes(self):
-        return self.nodes
+        return [Node(self, u) for u in self.core.node_ids()]
 
     # get the start node of the graph
     def get_start_node(self):
-        return self.start_node
+        return Node(self, self.start_id) if self.start_id != -1 else None
 
     # mark a node of the graph as start node
     def set_start_node(self, node):
         if node.is_end_node():  # user wants to change current end node to start node
-            self.end_node = None    # reset end node to None
-        if self.start_node is not None:  # start node already exists
-            self.start_node.make_start_node(False)  # reset previous start node
-        node.make_start_node()
-        self.start_node = node
+            self.end_id = -1    # reset end node to None
+        self.dirty_nodes.update((self.start_id, node.id))
+        self.start_id = node.id  # previous start node (if any) loses its status
+        self._notify_endpoints_changed()
 
     # get the end node of the graph
     def get_end_node(self):
-        return self.end_node
+        return Node(self, self.end_id) if self.end_id != -1 else None
 
     # mark a node of the graph as end node
     def set_end_node(self, node):
         if node.is_start_node():  # user wants to change current start node to end node
-            self.start_node = None  # reset start node to None
-        if self.end_node is not None:  # end node already exists
-            self.end_node.make_end_node(False)  # reset previous end node
-        node.make_end_node()
-        self.end_node = node
+            self.start_id = -1  # reset start node to None
+        self.dirty_nodes.update((self.end_id, node.id))
+        self.end_id = node.id  # previous end node (if any) loses its status
+        self._notify_endpoints_changed()
+
+    # set the node that is currently hovered on (-1 --> no node)
+    def set_hovered(self, node_id):
+        if node_id != self.hovered_id:
+            self.dirty_nodes.update((self.hovered_id, node_id))
+            self.hovered_id = node_id
+
+    # select or unselect a node
+    def toggle_selected(self, node_id):
+        self.node_selected[node_id] ^= 1
+        self.dirty_nodes.add(node_id)
+
+    def set_node_state(self, node_id, state):
+        self.node_state[node_id] = state.value
+        self.dirty_nodes.add(node_id)
+        if state == State.DEFAULT:
+            self.touched_nodes.discard(node_id)
+        else:
+            self.touched_nodes.add(node_id)
+
+    def set_edge_state(self, edge_id, state):
+        self.edge_state[edge_id] = state.value
+        self.dirty_edges.add(edge_id)
+        if state == State.DEFAULT:
+            self.touched_edges.discard(edge_id)
+        else:
+            self.touched_edges.add(edge_id)
+
+    # color a node is drawn in: selected --> BLUE, heat map color if it is part of the heat map, else by its state
+    def node_color(self, node_id):
+        if self.node_state[node_id] == State.DEFAULT.value:
+            if self.node_selected[node_id]:
+                return Colors.BLUE
+            if self.node_heat[node_id]:
+                return heat_color(self.node_heat[node_id])
+        return STATE_COLORS[State(self.node_state[node_id])]
+
+    # color all nodes by their distance from a node (heat map); nodes that cannot be reached keep their color.
+    # Distances are cached on the graph until it is edited; connections that are added or removed also remove the
+    # heat map (its colors would show the old distances). Returns (reached nodes, largest distance)
+    def show_distances(self, node):
+        dist, _ = shortest_path_tree(self.core, node.id)
+        reached = [u for u in self.core.node_ids() if dist[u] != math.inf]
+        farthest = max(dist[u] for u in reached)
+        for u in reached:
+            self.node_heat[u] = 1 + int((HEAT_LEVELS - 1) * dist[u] / farthest) if farthest > 0 else 1
+        self.heat_source = node.id
+        self.dirty_nodes.update(reached)
+        return len(reached), farthest
+
+    # remove the heat map
+    def clear_heat_map(self):
+        if self.heat_source != -1:
+            self.dirty_nodes.update(u for u in range(len(self.node_heat)) if self.node_heat[u])
+            self.node_heat = bytearray(len(self.node_heat))
+            self.heat_source = -1
 
     # return the current number of nodes in the graph
     def get_node_count(self):
-        return self.node_count
+        return self.core.node_count
+
+    # set the state of a node and of the connection it was reached from (from_id = -1 --> no connection)
+    def _set_state(self, node_id, from_id, state):
+        self.set_node_state(node_id, state)
+        if from_id != -1:
+            edge = self.core.find_edge(node_id, from_id)
+            if edge != -1:
+                self.set_edge_state(edge, state)
+
+    # methods for visualizing the progress of a search (nodes are given by id)
+    def enqueued_from(self, node_id, from_id):  # node was added to queue from another node
+        self._set_state(node_id, from_id, State.ENQUEUED)
 
-    # highlight the final path from start to end node; final_path = list of nodes
+    def inspected_from(self, node_id, from_id=-1):
+        self._set_state(node_id, from_id, State.INSPECTED)
+
+    def visited_from(self, node_id, from_id=-1):
+        self._set_state(node_id, from_id, State.VISITED)
+
+    def enqueued_backward_from(self, node_id, from_id):  # node was added to queue of the search from the end node
+        self._set_state(node_id, from_id, State.ENQUEUED_BACKWARD)
+
+    def visited_backward_from(self, node_id, from_id=-1):
+        self._set_state(node_id, from_id, State.VISITED_BACKWARD)
+
+    def highlight_path_to_node(self, node_id, next_id=-1):
+        self._set_state(node_id, next_id, State.HIGHLIGHTED)
+
+    # reset the connection between two nodes (e.g. a node is reached over a shorter connection now)
+    def reset_connection(self, node_id, from_id):
+        self.set_edge_state(self.core.find_edge(node_id, from_id), State.DEFAULT)
+
+    # highlight the final path from start to end node; final_path = list of node ids
     def highlight_final_path(self, final_path):
         i = 0
         while i < len(final_path):  # iterate over every node in final_path
             if i == len(final_path) - 1:
-                final_path[i].highlight_path_to_node() # last node in path has no connection --> only highlight the node
+                self.highlight_path_to_node(final_path[i]) # last node in path has no connection --> only highlight the node
             else:
-                final_path[i].highlight_path_to_node(final_path[i + 1]) # highlight node and the connection to next one
+                self.highlight_path_to_node(final_path[i], final_path[i + 1]) # highlight node and the connection to next one
             i += 1
 
-    # connect all nodes that were selected by user
-    def connect_selected_nodes(self):
-        selected_nodes = [node for node in self.nodes if node.is_selected()]    # get all selected nodes
-        while len(selected_nodes) > 0:
-            n = selected_nodes.pop()    # pop last node
-            for node in selected_nodes: # connect every other node with the popped node
-                self.connect_nodes(n, node)
-            n.click()  # deselect node
-
-    # disconnect all nodes that were selected by user
+    # get the ids of all nodes that are currently selected
+    def get_selected_ids(self):
+        node_selected = self.node_selected
+        return [u for u in self.core.node_ids() if node_selected[u]]
+
+    # unselect all nodes with the given ids
+    def deselect(self, node_ids):
+        for u in node_ids:
+            self.node_selected[u] = 0
+        self.dirty_nodes.update(node_ids)
+
+    # pairs of node ids (us, vs) that a connect mode would add between the nodes with the given ids
+    def connect_pairs(self, node_ids, mode=ConnectMode.CLIQUE):
+        xs, ys = self.core.xs, self.core.ys
+        if mode == ConnectMode.NEAREST:
+            return k_nearest_pairs(node_ids, xs, ys, NEAREST_NEIGHBOURS, 2 * NODE_RADIUS)
+        if mode == ConnectMode.DELAUNAY:
+            return delaunay_pairs(node_ids, xs, ys, 2 * NODE_RADIUS)
+        if mode == ConnectMode.RADIUS:
+            return pairs_within_radius(node_ids, xs, ys, CONNECT_RADIUS)
+        pairs = list(itertools.combinations(node_ids, 2))  # clique: every node with every other node
+        return [u for u, _ in pairs], [v for _, v in pairs]
+
+    # connect the nodes that were selected by user (all nodes if none is selected, except for a clique);
+    # returns the number of new connections
+    def connect_selected_nodes(self, mode=ConnectMode.CLIQUE):
+        selected = self.get_selected_ids()
+        node_ids = selected if selected or mode == ConnectMode.CLIQUE else list(self.core.node_ids())
+        us, vs = self.connect_pairs(node_ids, mode)
+        added = self.connect_node_pairs(us, vs)
+        self.deselect(selected)
+        return added
+
+    # disconnect all nodes that were selected by user from each other; returns the number of removed connections
     def disconnect_selected_nodes(self):
-        selected_nodes = [node for node in self.nodes if node.is_selected()]    # get all selected nodes
-        while len(selected_nodes) > 0:
-            n = selected_nodes.pop()    # pop last node
-            for node in selected_nodes: # disconnect every other node
-                self.disconnect_nodes(n, node)
-            n.click()   # deselect node
+        selected = self.get_selected_ids()
+        selected_set = set(selected)
+        us, vs = [], []
+        for u in selected:  # only look at connections that exist instead of all pairs of selected nodes
+            for v, _ in self.core.neighbours(u):
+                if u < v and v in selected_set:
+                    us.append(u)
+                    vs.append(v)
+        removed = self.disconnect_node_pairs(us, vs)
+        self.deselect(selected)
+        return removed
 
     # remove a single node (and all it's connections) from graph
     def remove_node(self, node):
-        self.nodes.remove(node)
-        self.node_count -= 1
-        for neighbour in node.get_neighbours(): # remove node from all the neighbours' nodes lists
-            neighbour.remove_neighbour(node)
-        if node == self.start_node:
-            self.start_node = None
-        if node == self.end_node:
-            self.end_node = None
-        del node
-
-    # draw the network with all its nodes and connections
-    def draw(self, screen):
-        for node in self.nodes:  # draw all connections first so they appear in background
-            node.draw_connections(screen)
-        for node in self.nodes:  # draw nodes on top
-            node.draw(screen)
\ No newline at end of file
+        incident = list(self.core.neighbours(node.id))
+        neighbours = [v for v, _ in incident]  # nodes that lose a connection
+        self.core.remove_node(node.id)
+        self._forget_edges(e for _, e in incident)
+        if self._spatial_index is not None:
+            self._spatial_index.remove(node.id, self.core.xs[node.id], self.core.ys[node.id])
+        self.node_state[node.id] = State.DEFAULT.value
+        self.touched_nodes.discard(node.id)
+        self.node_selected[node.id] = 0
+        endpoint_removed = node.id in (self.start_id, self.end_id)
+        if node.id == self.start_id:
+            self.start_id = -1
+        if node.id == self.end_id:
+            self.end_id = -1
+        if node.id == self.hovered_id:
+            self.hovered_id = -1
+        self.dirty_nodes.add(node.id)
+        self.edges_version += 1
+        self.clear_heat_map()
+        if endpoint_removed:
+            self._notify_endpoints_changed()
+        elif self.listeners:
+            self._notify_edges_changed(neighbours + [node.id])
+
+    # draw the nodes and connections of the network that are visible through the camera (default: world coordinates
+    # = screen coordinates); redraws everything that is visible, see Renderer for incremental drawing
+    def draw(self, screen, camera=None):
+        view = camera if camera is not None else Camera()
+        x0, y0, x1, y1 = view.visible_area(screen.get_size())
+        margin = NODE_RADIUS + 12  # nodes just outside of the screen may reach into it (incl. rings of end nodes)
+        for e in self.edges_in_area(x0, y0, x1, y1):  # draw connections first so they appear in background
+            Connection(self, e).draw(screen, camera)
+        for u in self.nodes_in_area(x0 - margin, y0 - margin, x1 + margin, y1 + margin):  # draw nodes on top
+            Node(self, u).draw(screen, camera)
@@ -0,0 +1,304 @@
+import math
+from array import array
+
+# number of edges that may be added after the last compaction before the CSR arrays are rebuilt
+# (the threshold grows with the graph, so adding edges stays O(1) amortized)
+COMPACT_THRESHOLD = 1024
+
+
+# headless graph engine: nodes and undirected weighted edges are stored in contiguous arrays, no pygame involved.
+# node ids and edge ids are plain integers (index into the arrays). Removed nodes/edges are only marked as dead,
+# so ids stay stable for the whole lifetime of the graph.
+class GraphCore:
+    def __init__(self):
+        # node arrays (indexed by node id)
+        self.xs = array('d')  # x coordinate of node
+        self.ys = array('d')  # y coordinate of node
+        self.alive = bytearray()  # 1 if node is part of the graph, 0 if it was removed
+        self.node_count = 0  # nodes that are currently part of the graph
+
+        # edge arrays (indexed by edge id)
+        self.edge_u = array('i')  # first endpoint of edge
+        self.edge_v = array('i')  # second endpoint of edge
+        self.edge_w = array('d')  # weight of edge
+        self.edge_alive = bytearray()  # 1 if edge is part of the graph, 0 if it was removed
+        self.edge_count = 0  # edges that are currently part of the graph
+
+        # adjacency in CSR form: neighbours of node u are adj_node[offsets[u]:offsets[u + 1]]
+        # (adj_edge holds the matching edge ids). Only covers nodes/edges that existed at the last compaction.
+        self.offsets = array('q', [0])
+        self.adj_node = array('i')
+        self.adj_edge = array('i')
+        self.pending = {}  # node id -> list of edge ids that were added after the last compaction
+        self.pending_count = 0  # number of edges in pending
+        self.writable = True  # False if the arrays are read-only views (e.g. of a memory-mapped file)
+        self.buffer = None  # object that owns the memory of read-only views (kept alive with the graph)
+        self.cache = {}  # results computed from the graph (e.g. distances); cleared whenever the graph is edited
+        self._weight_scale = 1.0  # see weight_scale(); None --> not known yet
+
+    # build a graph in one pass from coordinate and edge arrays (weights default to euclidean distance)
+    @classmethod
+    def from_arrays(cls, xs, ys, us=(), vs=(), ws=None):
+        core = cls()
+        core.xs = array('d', xs)
+        core.ys = array('d', ys)
+        core.alive = bytearray(b'\x01') * len(core.xs)
+        core.node_count = len(core.xs)
+        core.edge_u = array('i', us)
+        core.edge_v = array('i', vs)
+        if ws is None:
+            xs, ys = core.xs, core.ys
+            core.edge_w = array('d', (math.hypot(xs[u] - xs[v], ys[u] - ys[v])
+                                      for u, v in zip(core.edge_u, core.edge_v)))
+        else:
+            core.edge_w = array('d', ws)
+            core._weight_scale = None
+        core.edge_alive = bytearray(b'\x01') * len(core.edge_u)
+        core.edge_count = len(core.edge_u)
+        core.compact()
+        return core
+
+    # create a graph whose arrays are (read-only) views of existing memory, e.g. of a memory-mapped file;
+    # nothing is copied until the graph is modified for the first time
+    @classmethod
+    def from_buffers(cls, xs, ys, alive, edge_u, edge_v, edge_w, edge_alive, offsets, adj_node, adj_edge,
+                     node_count, edge_count, buffer=None):
+        core = cls()
+        core.xs, core.ys, core.alive = xs, ys, alive
+        core.edge_u, core.edge_v, core.edge_w, core.edge_alive = edge_u, edge_v, edge_w, edge_alive
+        core.offsets, core.adj_node, core.adj_edge = offsets, adj_node, adj_edge
+        core.node_count = node_count
+        core.edge_count = edge_count
+        core.writable = False
+        core.buffer = buffer
+        core._weight_scale = None
+        return core
+
+    # copy read-only views into own arrays before the graph is modified
+    def make_writable(self):
+        if self.writable:
+            return
+        for name in ("xs", "ys", "edge_u", "edge_v", "edge_w", "offsets", "adj_node", "adj_edge"):
+            view = getattr(self, name)
+            copy = array(view.format)
+            copy.frombytes(view.cast('B'))
+            setattr(self, name, copy)
+        self.alive = bytearray(self.alive)
+        self.edge_alive = bytearray(self.edge_alive)
+        self.writable = True
+        self.buffer = None
+
+    # add a new node at coordinate (x, y) and return its id
+    def add_node(self, x, y):
+        self.make_writable()
+        self.cache.clear()
+        self.xs.append(x)
+        self.ys.append(y)
+        self.alive.append(1)
+        self.node_count += 1
+        return len(self.xs) - 1
+
+    # remove a node and all of its edges
+    def remove_node(self, u):
+        if not self.has_node(u):
+            return False
+        self.make_writable()
+        self.cache.clear()
+        for _, e in list(self.neighbours(u)):
+            self._kill_edge(e)
+        self.alive[u] = 0
+        self.node_count -= 1
+        return True
+
+    def has_node(self, u):
+        return 0 <= u < len(self.alive) and self.alive[u] == 1
+
+    # add an undirected edge between u and v; returns the edge id, or -1 if the edge already exists
+    def add_edge(self, u, v, weight=None):
+        if u == v or self.find_edge(u, v) != -1:
+            return -1
+        self.make_writable()
+        self.cache.clear()
+        if weight is None:
+            weight = math.hypot(self.xs[u] - self.xs[v], self.ys[u] - self.ys[v])
+        e = len(self.edge_u)
+        self.edge_u.append(u)
+        self.edge_v.append(v)
+        self.edge_w.append(weight)
+        self.edge_alive.append(1)
+        if self._weight_scale is not None:  # default weights have the ratio 1, which can lower a scale above 1
+            self._weight_scale = self._lowest_scale((e,), self._weight_scale)
+        self.edge_count += 1
+        self.pending.setdefault(u, []).append(e)
+        self.pending.setdefault(v, []).append(e)
+        self.pending_count += 1
+        if self.pending_count > COMPACT_THRESHOLD + self.edge_count // 4:
+            self.compact()
+        return e
+
+    # add many undirected edges at once (pairs us[i], vs[i]; weights default to euclidean distance);
+    # duplicates, self loops and already existing edges are skipped. Returns the number of added edges
+    def add_edges(self, us, vs, ws=None):
+        self.make_writable()
+        existing = set()  # keys (min id, max id) of edges that exist at the nodes involved
+        for u in set(us).union(vs):
+            for v, _ in self.neighbours(u):
+                existing.add((u, v) if u < v else (v, u))
+        xs, ys = self.xs, self.ys
+        edge_u, edge_v, edge_w, edge_alive, pending = self.edge_u, self.edge_v, self.edge_w, self.edge_alive, self.pending
+        added, first = 0, len(edge_u)
+        for i in range(len(us)):
+            u, v = us[i], vs[i]
+            key = (u, v) if u < v else (v, u)
+            if u == v or key in existing:
+                continue
+            existing.add(key)
+            e = len(edge_u)
+            edge_u.append(u)
+            edge_v.append(v)
+            edge_w.append(math.hypot(xs[u] - xs[v], ys[u] - ys[v]) if ws is None else ws[i])
+            edge_alive.append(1)
+            pending.setdefault(u, []).append(e)
+            pending.setdefault(v, []).append(e)
+            added += 1
+        self.edge_count += added
+        self.pending_count += added
+        if added:
+            self.cache.clear()
+        if added and self._weight_scale is not None:
+            self._weight_scale = self._lowest_scale(range(first, len(edge_u)), self._weight_scale)
+        if self.pending_count > COMPACT_THRESHOLD + self.edge_count // 4:
+            self.compact()
+        return added
+
+    # remove many undirected edges at once (pairs us[i], vs[i]); returns the number of removed edges
+    def remove_edges(self, us, vs):
+        wanted = {(u, v) if u < v else (v, u) for u, v in zip(us, vs)}
+        removed = 0
+        for u in {u for key in wanted for u in key}:
+            for v, e in list(self.neighbours(u)):
+                if u < v and (u, v) in wanted:
+                    self.make_writable()
+                    self._kill_edge(e)
+                    removed += 1
+        return removed
+
+    # remove the edge between u and v; returns the removed edge id, or -1 if there was no such edge
+    def remove_edge(self, u, v):
+        e = self.find_edge(u, v)
+        if e != -1:
+            self.make_writable()
+            self._kill_edge(e)
+        return e
+
+    def _kill_edge(self, e):
+        self.edge_alive[e] = 0
+        self.edge_count -= 1
+        self.cache.clear()
+
+    # get the id of the edge between u and v; -1 if they are not connected
+    def find_edge(self, u, v):
+        if self.degree_bound(v) < self.degree_bound(u):
+            u, v = v, u
+        for w, e in self.neighbours(u):
+            if w == v:
+                return e
+        return -1
+
+    # upper bound of the degree of u (dead edges that were not compacted yet are included)
+    def degree_bound(self, u):
+        degree = len(self.pending.get(u, ()))
+        if u < len(self.offsets) - 1:
+            degree += self.offsets[u + 1] - self.offsets[u]
+        return degree
+
+    # iterate over (neighbour id, edge id) of all living edges of u
+    def neighbours(self, u):
+        edge_alive = self.edge_alive
+        if u < len(self.offsets) - 1:
+            adj_node, adj_edge = self.adj_node, self.adj_edge
+            for i in range(self.offsets[u], self.offsets[u + 1]):
+                e = adj_edge[i]
+                if edge_alive[e]:
+                    yield adj_node[i], e
+        extra = self.pending.get(u)
+        if extra:
+            edge_u, edge_v = self.edge_u, self.edge_v
+            for e in extra:
+                if edge_alive[e]:
+                    yield (edge_v[e] if edge_u[e] == u else edge_u[e]), e
+
+    # factor with weight >= factor * euclidean length for every edge, so that factor * straight-line distance is a
+    # lower bound of the length of every path (heuristic of A*). 1 for the default weights (euclidean distances);
+    # other weights (e.g. road lengths in meters of an import with keep_weights) are looked at once, every edge that is
+    # added later (also with the default weight) lowers the factor if needed. Removing edges keeps the factor (it stays
+    # a lower bound)
+    def weight_scale(self):
+        if self._weight_scale is None:
+            self._weight_scale = self._lowest_scale(self.edge_ids())
+        return self._weight_scale
+
+    # lowest weight / euclidean length of the given edges and scale (edges of length 0 are skipped)
+    def _lowest_scale(self, edges, scale=math.inf):
+        xs, ys, edge_u, edge_v, edge_w = self.xs, self.ys, self.edge_u, self.edge_v, self.edge_w
+        for e in edges:
+            u, v = edge_u[e], edge_v[e]
+            length = math.hypot(xs[u] - xs[v], ys[u] - ys[v])
+            if length > 0 and edge_w[e] < scale * length:
+                scale = edge_w[e] / length
+        return scale if scale != math.inf else 1.0
+
+    # get the endpoint of edge e that is not u
+    def other(self, e, u):
+        return self.edge_v[e] if self.edge_u[e] == u else self.edge_u[e]
+
+    def pos(self, u):
+        return self.xs[u], self.ys[u]
+
+    def weight(self, e):
+        return self.edge_w[e]
+
+    # iterate over the ids of all nodes that are part of the graph
+    def node_ids(self):
+        alive = self.alive
+        return (u for u in range(len(alive)) if alive[u])
+
+    # iterate over the ids of all edges that are part of the graph
+    def edge_ids(self):
+        edge_alive = self.edge_alive
+        return (e for e in range(len(edge_alive)) if edge_alive[e])
+
+    # rebuild the CSR arrays from all living edges (counting sort, O(V + E))
+    def compact(self):
+        self.make_writable()
+        n = len(self.xs)
+        edge_u, edge_v, edge_alive = self.edge_u, self.edge_v, self.edge_alive
+        offsets = array('q', bytes(8 * (n + 1)))
+        for e in range(len(edge_u)):
+            if edge_alive[e]:
+                offsets[edge_u[e] + 1] += 1
+                offsets[edge_v[e] + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+        fill = offsets[:-1]
+        adj_node = array('i', bytes(4 * offsets[n]))
+        adj_edge = array('i', bytes(4 * offsets[n]))
+        for e in range(len(edge_u)):
+            if edge_alive[e]:
+                u, v = edge_u[e], edge_v[e]
+                i = fill[u]
+                adj_node[i] = v
+                adj_edge[i] = e
+                fill[u] = i + 1
+                i = fill[v]
+                adj_node[i] = u
+                adj_edge[i] = e
+                fill[v] = i + 1
+        self.offsets, self.adj_node, self.adj_edge = offsets, adj_node, adj_edge
+        self.pending = {}
+        self.pending_count = 0
+
+    # approximate number of bytes used by the node/edge/adjacency arrays
+    def nbytes(self):
+        arrays = (self.xs, self.ys, self.edge_u, self.edge_v, self.edge_w, self.offsets, self.adj_node, self.adj_edge)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.alive) + len(self.edge_alive)
@@ -0,0 +1,93 @@
+import math
+import random
+from array import array
+from GraphCore import GraphCore
+from SpatialIndex import SpatialGrid
+
+
+# generators for synthetic graphs (used by the benchmarks); all of them return a GraphCore
+
+
+# random node positions for n nodes (about one node per spacing x spacing square)
+def random_positions(n, spacing, rng):
+    side = math.sqrt(n) * spacing
+    xs = array('d', (rng.uniform(0, side) for _ in range(n)))
+    ys = array('d', (rng.uniform(0, side) for _ in range(n)))
+    return xs, ys
+
+
+# grid graph with width x height nodes, every node is connected with its right and lower neighbour
+def grid_graph(width, height, spacing=50):
+    xs = array('d', (spacing * (i % width) for i in range(width * height)))
+    ys = array('d', (spacing * (i // width) for i in range(width * height)))
+    us, vs = array('i'), array('i')
+    for y in range(height):
+        row = y * width
+        for x in range(width):
+            u = row + x
+            if x + 1 < width:
+                us.append(u)
+                vs.append(u + 1)
+            if y + 1 < height:
+                us.append(u)
+                vs.append(u + width)
+    return GraphCore.from_arrays(xs, ys, us, vs)
+
+
+# random geometric graph: n nodes placed uniformly at random (about one node per spacing x spacing square),
+# every pair of nodes closer than radius is connected (default radius --> average degree of about 8)
+def random_geometric_graph(n, radius=None, spacing=50, seed=None):
+    rng = random.Random(seed)
+    if radius is None:
+        radius = spacing * math.sqrt(8 / math.pi)
+    xs, ys = random_positions(n, spacing, rng)
+    grid = SpatialGrid(radius)
+    for u in range(n):
+        grid.insert(u, xs[u], ys[u])
+    us, vs = array('i'), array('i')
+    radius_sq = radius * radius
+    for u in range(n):
+        x, y = xs[u], ys[u]
+        for v in grid.candidates(x - radius, y - radius, x + radius, y + radius):
+            if v > u and (xs[v] - x) ** 2 + (ys[v] - y) ** 2 <= radius_sq:
+                us.append(u)
+                vs.append(v)
+    return GraphCore.from_arrays(xs, ys, us, vs)
+
+
+# erdős–rényi graph G(n, m): m = n * average_degree / 2 connections between uniformly random pairs of nodes
+# (positions are random and do not influence the connections)
+def erdos_renyi_graph(n, average_degree=6, spacing=50, seed=None):
+    rng = random.Random(seed)
+    xs, ys = random_positions(n, spacing, rng)
+    m = min(n * average_degree // 2, n * (n - 1) // 2)
+    pairs = set()
+    while len(pairs) < m:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            pairs.add((u, v) if u < v else (v, u))
+    us = array('i', (u for u, _ in pairs))
+    vs = array('i', (v for _, v in pairs))
+    return GraphCore.from_arrays(xs, ys, us, vs)
+
+
+# scale-free graph (barabási–albert): every new node is connected with m existing nodes, chosen with probability
+# proportional to their degree --> few hubs with a very high degree, most nodes with a low degree
+def scale_free_graph(n, m=3, spacing=50, seed=None):
+    rng = random.Random(seed)
+    xs, ys = random_positions(n, spacing, rng)
+    us, vs = array('i'), array('i')
+    endpoints = array('i')  # every node appears once per connection --> uniform choice is proportional to degree
+    for u in range(1, n):
+        if u <= m:  # the first nodes are connected with all nodes before them
+            targets = set(range(u))
+        else:
+            targets = set()
+            while len(targets) < m:
+                targets.add(endpoints[rng.randrange(len(endpoints))])
+        for v in targets:
+            us.append(u)
+            vs.append(v)
+            endpoints.append(u)
+            endpoints.append(v)
+    return GraphCore.from_arrays(xs, ys, us, vs)
@@ -0,0 +1,125 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from GraphCore import GraphCore
+
+# binary graph file: a fixed size header followed by flat little-endian arrays, each section 8-byte aligned:
+#   xs, ys (float64 per node id), alive (uint8 per node id),
+#   edge_u, edge_v (int32 per edge id), edge_w (float64 per edge id), edge_alive (uint8 per edge id),
+#   offsets (int64, node slots + 1), adj_node, adj_edge (int32 per CSR entry)
+# Removed nodes/edges are kept as dead slots, so ids --> labels stay the same after loading.
+MAGIC = b"PFVG"
+VERSION = 1
+HEADER = struct.Struct("<4sIqqqqqqq")  # magic, version, node slots, edge slots, csr entries,
+                                       # node count, edge count, start id, end id
+HEADER_SIZE = 64  # size of the header in bytes (multiple of 8, so all sections are aligned)
+
+
+# sections of the file in order: (attribute name of GraphCore, typecode, length key)
+SECTIONS = (
+    ("xs", 'd', "nodes"), ("ys", 'd', "nodes"), ("alive", 'B', "nodes"),
+    ("edge_u", 'i', "edges"), ("edge_v", 'i', "edges"), ("edge_w", 'd', "edges"), ("edge_alive", 'B', "edges"),
+    ("offsets", 'q', "offsets"), ("adj_node", 'i', "csr"), ("adj_edge", 'i', "csr"),
+)
+
+
+def _padding(size):
+    return -size % 8
+
+
+# the binary image of a graph (NetworkGraph or GraphCore) as list of byte chunks (views, nothing is copied
+# on little-endian machines); the chunks written one after another form a graph file
+def graph_chunks(graph):
+    core = getattr(graph, "core", graph)
+    start_id, end_id = getattr(graph, "start_id", -1), getattr(graph, "end_id", -1)
+    if core.pending_count > 0 or len(core.offsets) != len(core.xs) + 1:
+        core.compact()  # all edges have to be part of the CSR arrays
+    header = HEADER.pack(MAGIC, VERSION, len(core.xs), len(core.edge_u), len(core.adj_node),
+                         core.node_count, core.edge_count, start_id, end_id)
+    chunks = [header + bytes(HEADER_SIZE - len(header))]
+    for name, typecode, _ in SECTIONS:
+        data = getattr(core, name)
+        if typecode != 'B' and sys.byteorder == "big":
+            data = array(typecode, data)
+            data.byteswap()
+        data = memoryview(data).cast('B')
+        chunks.append(data)
+        chunks.append(bytes(_padding(len(data))))
+    return chunks
+
+
+# write a graph (NetworkGraph or GraphCore) to path; written to a temporary file next to it that replaces the old
+# file at the end, because the arrays of a loaded graph may still be views of the memory-mapped old file
+def save_graph(graph, path):
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        for chunk in graph_chunks(graph):
+            file.write(chunk)
+    os.replace(temp_path, path)
+
+
+# read a graph file; returns (GraphCore, start id, end id). With use_mmap the arrays of the core are
+# zero-copy views of the memory-mapped file (they are copied when the graph is modified for the first time)
+def load_core(path, use_mmap=True):
+    with open(path, "rb") as file:
+        if use_mmap and sys.byteorder == "little":
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = file.read()
+    return read_core(data, zero_copy=isinstance(data, mmap.mmap), source=path)
+
+
+# read the binary image of a graph from a buffer (bytes, mmap, shared memory, ...); returns (GraphCore, start id,
+# end id). With zero_copy the arrays of the core are views of the buffer (owner = object that owns its memory)
+def read_core(data, zero_copy=False, owner=None, source="buffer"):
+    if zero_copy and sys.byteorder != "little":
+        zero_copy = False  # views would have the wrong byte order
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"{source} is not a graph file (too short)")
+    magic, version, nodes, edges, csr, node_count, edge_count, start_id, end_id = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{source} is not a graph file")
+    if version != VERSION:
+        raise ValueError(f"unsupported graph file version {version}")
+    if min(nodes, edges, csr, node_count, edge_count) < 0 or node_count > nodes or edge_count > edges:
+        raise ValueError(f"{source} is corrupt (invalid counts in the header)")
+    lengths = {"nodes": nodes, "edges": edges, "offsets": nodes + 1, "csr": csr}
+    size = HEADER_SIZE
+    for _, typecode, length_key in SECTIONS:
+        section_size = lengths[length_key] * struct.calcsize(typecode)
+        size += section_size + _padding(section_size)
+    if len(data) < size:
+        raise ValueError(f"{source} is truncated ({len(data)} bytes, the header needs {size} bytes)")
+    view = memoryview(data)
+    arrays = {}
+    position = HEADER_SIZE
+    for name, typecode, length_key in SECTIONS:
+        size = lengths[length_key] * struct.calcsize(typecode)
+        section = view[position:position + size]
+        if zero_copy:
+            arrays[name] = section.cast(typecode) if typecode != 'B' else section
+        else:  # own arrays (byte order fixed if necessary)
+            arrays[name] = array(typecode)
+            arrays[name].frombytes(section)
+            if typecode != 'B' and sys.byteorder == "big":
+                arrays[name].byteswap()
+        position += size + _padding(size)
+    if zero_copy:
+        core = GraphCore.from_buffers(**arrays, node_count=node_count, edge_count=edge_count,
+                                      buffer=data if owner is None else owner)
+    else:
+        core = GraphCore.from_buffers(**arrays, node_count=node_count, edge_count=edge_count)
+        core.alive, core.edge_alive = bytearray(core.alive), bytearray(core.edge_alive)
+        core.writable = True
+    return core, start_id, end_id
+
+
+# read a graph file into a NetworkGraph (with start and end node)
+def load_graph(path, use_mmap=True):
+    from Graph import NetworkGraph  # imported here, so that load_core works without pygame
+    core, start_id, end_id = load_core(path, use_mmap)
+    graph = NetworkGraph(core)
+    graph.start_id, graph.end_id = start_id, end_id
+    return graph
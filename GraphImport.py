@@ -0,0 +1,184 @@
+import csv
+import math
+import xml.etree.ElementTree as ElementTree
+from array import array
+from GraphCore import GraphCore
+
+# importers for road networks/ graphs stored in common file formats. Every file is read as a stream
+# (line by line/ element by element), the adjacency is built in one pass at the end and the coordinates
+# are projected into the screen space of the visualizer.
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 800
+SCREEN_MARGIN = 30
+
+
+# scale and move coordinates (in place) so that they fit into the screen; geographic coordinates (x = longitude,
+# y = latitude) are projected equirectangularly and flipped, so that north is at the top of the screen
+def project_to_screen(xs, ys, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, margin=SCREEN_MARGIN, geographic=False):
+    if len(xs) == 0:
+        return
+    if geographic:
+        factor = math.cos(math.radians((min(ys) + max(ys)) / 2))
+        for i in range(len(xs)):
+            xs[i] *= factor
+    min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+    scale = min((width - 2 * margin) / ((max_x - min_x) or 1), (height - 2 * margin) / ((max_y - min_y) or 1))
+    for i in range(len(xs)):
+        xs[i] = margin + (xs[i] - min_x) * scale
+        ys[i] = margin + ((max_y - ys[i]) if geographic else (ys[i] - min_y)) * scale
+
+
+# build a GraphCore from a stream of nodes (key, x, y) and a stream of edges (key, key, weight); node keys can
+# be anything hashable, they are mapped to dense ids in order of appearance. Duplicate edges (e.g. both
+# directions of a road), self loops and edges to unknown nodes are skipped.
+def build_core(nodes, edges, keep_weights=False, geographic=False, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    index = {}
+    xs, ys = array('d'), array('d')
+    for key, x, y in nodes:
+        if key not in index:
+            index[key] = len(xs)
+            xs.append(x)
+            ys.append(y)
+    us, vs, ws = array('i'), array('i'), array('d')
+    seen = set()
+    for key_u, key_v, weight in edges:
+        u, v = index.get(key_u), index.get(key_v)
+        if u is None or v is None or u == v:
+            continue
+        if u > v:
+            u, v = v, u
+        key = (u << 32) | v
+        if key in seen:
+            continue
+        seen.add(key)
+        us.append(u)
+        vs.append(v)
+        ws.append(weight)
+    project_to_screen(xs, ys, width, height, geographic=geographic)
+    return GraphCore.from_arrays(xs, ys, us, vs, ws if keep_weights else None)
+
+
+# DIMACS shortest path challenge format: coordinates ("v <id> <x> <y>" lines in .co file)
+def read_dimacs_coordinates(path):
+    with open(path) as file:
+        for line in file:
+            if line.startswith("v "):
+                _, node, x, y = line.split()
+                yield int(node), float(x), float(y)
+
+
+# DIMACS shortest path challenge format: arcs ("a <from> <to> <weight>" lines in .gr file)
+def read_dimacs_arcs(path):
+    with open(path) as file:
+        for line in file:
+            if line.startswith("a "):
+                _, u, v, weight = line.split()
+                yield int(u), int(v), float(weight)
+
+
+# import a DIMACS road network (.gr arcs + .co coordinates, coordinates are longitude/latitude * 10^6)
+def import_dimacs(gr_path, co_path, keep_weights=False, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    nodes = ((node, x / 1e6, y / 1e6) for node, x, y in read_dimacs_coordinates(co_path))
+    return build_core(nodes, read_dimacs_arcs(gr_path), keep_weights, geographic=True, width=width, height=height)
+
+
+# rows of a csv file without the header row (if there is one)
+def read_csv_rows(path):
+    with open(path, newline="") as file:
+        try:
+            has_header = csv.Sniffer().has_header(file.read(4096))
+        except csv.Error:  # too few rows to decide
+            has_header = False
+        file.seek(0)
+        rows = csv.reader(file)
+        if has_header:
+            next(rows, None)
+        for row in rows:
+            if row:
+                yield row
+
+
+# import a plain csv edge list ("u,v" or "u,v,weight" per row); node coordinates are read from an optional
+# csv file with "id,x,y" rows, without one the nodes are placed on a grid in order of appearance
+def import_edge_list(edges_path, nodes_path=None, keep_weights=False, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    edges = ((row[0], row[1], float(row[2]) if len(row) > 2 else 1.0) for row in read_csv_rows(edges_path))
+    if nodes_path is not None:
+        nodes = ((row[0], float(row[1]), float(row[2])) for row in read_csv_rows(nodes_path))
+        return build_core(nodes, edges, keep_weights, width=width, height=height)
+    # without coordinates the node keys are only known from the edges --> materialize the edges once
+    us, vs, ws = [], [], array('d')
+    keys = {}
+    for u, v, weight in edges:
+        keys.setdefault(u, len(keys))
+        keys.setdefault(v, len(keys))
+        us.append(u)
+        vs.append(v)
+        ws.append(weight)
+    columns = max(1, math.ceil(math.sqrt(len(keys))))
+    nodes = ((key, i % columns, i // columns) for key, i in keys.items())
+    return build_core(nodes, zip(us, vs, ws), keep_weights, width=width, height=height)
+
+
+# OpenStreetMap XML: stream of ("node", id, lon, lat) and ("way", [node ids]) items for all ways with
+# a highway tag; the root is cleared after every node/ way/ relation, so memory does not grow with the file size
+def read_osm(path):
+    way_nodes, is_highway = [], False
+    events = ElementTree.iterparse(path, events=("start", "end"))
+    _, root = next(events)
+    for event, element in events:
+        if element.tag in ("node", "way", "relation"):
+            if event == "start":  # tags of nodes (e.g. highway=traffic_signals) must not carry over to a way
+                way_nodes, is_highway = [], False
+                continue
+            if element.tag == "node":
+                yield "node", int(element.get("id")), float(element.get("lon")), float(element.get("lat"))
+            elif element.tag == "way" and is_highway:
+                yield "way", way_nodes
+            way_nodes, is_highway = [], False
+            root.clear()
+        elif event == "end":
+            if element.tag == "nd":
+                way_nodes.append(int(element.get("ref")))
+            elif element.tag == "tag":
+                is_highway = is_highway or element.get("k") == "highway"
+
+
+# haversine distance in meters between two (longitude, latitude) points
+def geo_distance(lon1, lat1, lon2, lat2):
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371000 * math.asin(math.sqrt(a))
+
+
+# import the road network of a locally stored OSM XML extract (only nodes that are part of a road are kept;
+# keep_weights --> weights are road lengths in meters instead of screen distances). The file is read twice:
+# the roads first, then the positions of their nodes only (most nodes of an extract belong to buildings etc.)
+def import_osm(path, keep_weights=False, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    road_nodes = {}  # osm node id -> (lon, lat) of the nodes that are part of a road (None until it was read)
+    us, vs = array('q'), array('q')
+    for item in read_osm(path):
+        if item[0] == "way":
+            refs = item[1]
+            road_nodes.update(dict.fromkeys(refs))
+            for i in range(len(refs) - 1):
+                us.append(refs[i])
+                vs.append(refs[i + 1])
+    for item in read_osm(path):
+        if item[0] == "node" and item[1] in road_nodes:
+            road_nodes[item[1]] = (item[2], item[3])
+    nodes = ((key, *pos) for key, pos in road_nodes.items() if pos is not None)
+    edges = ((u, v, geo_distance(*road_nodes[u], *road_nodes[v]) if road_nodes[u] and road_nodes[v] else 0.0)
+             for u, v in zip(us, vs))
+    return build_core(nodes, edges, keep_weights, geographic=True, width=width, height=height)
+
+
+# import a graph file, the format is chosen by file extension (.gr --> DIMACS with coordinates in the .co file
+# next to it, .csv --> edge list, .osm --> OpenStreetMap XML)
+def import_graph(path, keep_weights=False, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    if path.endswith(".gr"):
+        return import_dimacs(path, path[:-len(".gr")] + ".co", keep_weights, width, height)
+    if path.endswith(".csv"):
+        return import_edge_list(path, keep_weights=keep_weights, width=width, height=height)
+    if path.endswith(".osm"):
+        return import_osm(path, keep_weights, width, height)
+    raise ValueError(f"unknown graph file format: {path}")
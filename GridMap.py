@@ -0,0 +1,292 @@
+# grid/maze mode: a map of square cells that are either free or blocked (wall), stored as numpy bool array instead of
+# one node object per cell, so grids with millions of cells fit into a few megabytes. Needs numpy.
+import math
+import random
+from array import array
+import numpy as np
+from ColorCollection import Colors
+from Graph import STATE_COLORS, State
+
+DIAGONAL_COST = math.sqrt(2)
+# possible moves (dx, dy): 4 straight ones first, then the 4 diagonal ones; the "edge" of a move is its index
+MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+MOVE_COSTS = (1.0, 1.0, 1.0, 1.0, DIAGONAL_COST, DIAGONAL_COST, DIAGONAL_COST, DIAGONAL_COST)
+WALL_COLOR = Colors.BLACK
+FREE_COLOR = Colors.WHITE
+START_COLOR = Colors.TURQUOISE
+END_COLOR = Colors.RED
+
+
+# width x height cells, walls[y, x] is True if the cell is blocked. Cell ids are y * width + x.
+# Offers the part of the GraphCore interface the searchers use (neighbours, find_edge, edge_w, xs/ys, ...),
+# so the searchers (except ALT*) run on grids as well. A cell is connected with its 8 surrounding free cells; diagonal moves
+# are only allowed if both cells next to the move are free (paths do not cut corners of walls)
+class GridMap:
+    def __init__(self, width, height, walls=None):
+        self.width = width
+        self.height = height
+        self.walls = walls if walls is not None else np.zeros((height, width), dtype=bool)
+        self.edge_w = MOVE_COSTS  # cost of a move = weight of its "edge"
+        # 1 per free cell, with a border of blocked cells around the grid (row length width + 2), so that
+        # neighbours can be looked up without checking the bounds; kept in sync with walls
+        padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = ~self.walls
+        self.free = bytearray(padded.tobytes())
+        self.cell_offsets = tuple(dx + dy * width for dx, dy in MOVES)  # id of neighbour = id of cell + offset
+        self.free_offsets = tuple(dx + dy * (width + 2) for dx, dy in MOVES)  # same for indices into free
+        self._xs = None
+        self._ys = None
+        self.cache = {}  # results computed from the grid (e.g. landmarks); cleared whenever walls change
+
+    # index of a cell in free (padded grid)
+    def free_index(self, u):
+        return (u // self.width + 1) * (self.width + 2) + u % self.width + 1
+
+    # id of the cell at an index of free
+    def cell_id(self, index):
+        row = self.width + 2
+        return (index // row - 1) * self.width + index % row - 1
+
+    def cell_at(self, x, y):  # id of the cell in column x and row y; -1 if it is outside the grid
+        return y * self.width + x if 0 <= x < self.width and 0 <= y < self.height else -1
+
+    def pos(self, u):  # (column, row) of a cell
+        return u % self.width, u // self.width
+
+    # x/y coordinates of all cells (in cells); created on first use (the heuristics of A* and LPA* need them)
+    @property
+    def xs(self):
+        if self._xs is None:
+            self._xs = array('d', map(float, range(self.width))) * self.height
+        return self._xs
+
+    @property
+    def ys(self):
+        if self._ys is None:
+            self._ys = array('d')
+            self._ys.frombytes(np.repeat(np.arange(self.height, dtype=np.float64), self.width).tobytes())
+        return self._ys
+
+    @property
+    def node_count(self):  # number of free cells
+        return int(self.walls.size - np.count_nonzero(self.walls))
+
+    def has_node(self, u):
+        return 0 <= u < self.walls.size and self.free[self.free_index(u)] == 1
+
+    def weight_scale(self):  # costs of moves are their euclidean lengths (see GraphCore.weight_scale)
+        return 1.0
+
+    # iterate over the ids of all free cells
+    def node_ids(self):
+        return iter(np.flatnonzero(~self.walls.reshape(-1)).tolist())
+
+    # list of (neighbour id, move index) of all cells that can be reached from u in one move
+    def neighbours(self, u):
+        free, i = self.free, self.free_index(u)
+        offsets = self.free_offsets
+        result = [(u + self.cell_offsets[k], k) for k in range(4) if free[i + offsets[k]]]
+        for k in range(4, 8):
+            dx, dy = MOVES[k]
+            if free[i + offsets[k]] and free[i + dx] and free[i + offsets[2 if dy > 0 else 3]]:
+                result.append((u + self.cell_offsets[k], k))
+        return result
+
+    # index of the move from u to v (-1 if v cannot be reached from u in one move)
+    def find_edge(self, u, v):
+        for neighbour, k in self.neighbours(u):
+            if neighbour == v:
+                return k
+        return -1
+
+    # block (blocked=True) or free cells; returns the list of cells that changed
+    def set_walls(self, cells, blocked):
+        changed = [u for u in cells if 0 <= u < self.walls.size and self.walls.flat[u] != blocked]
+        for u in changed:
+            self.walls.flat[u] = blocked
+            self.free[self.free_index(u)] = 0 if blocked else 1
+        if changed:
+            self.cache.clear()
+        return changed
+
+    # approximate number of bytes used by the grid
+    def nbytes(self):
+        return self.walls.nbytes + len(self.free)
+
+
+# grid without walls
+def open_grid(width, height):
+    return GridMap(width, height)
+
+
+# grid with randomly placed walls (density = probability that a cell is blocked)
+def random_grid(width, height, density=0.3, seed=None):
+    return GridMap(width, height, np.random.default_rng(seed).random((height, width)) < density)
+
+
+# maze (recursive backtracker): corridors of one cell between walls of one cell; the maze cells lie at odd
+# coordinates. loops = fraction of the remaining walls between two corridors that is removed (0 --> perfect maze,
+# exactly one path between two cells)
+def maze_grid(width, height, loops=0.0, seed=None):
+    rng = random.Random(seed)
+    walls = bytearray(b'\x01') * (width * height)
+    columns, rows = (width - 1) // 2, (height - 1) // 2  # number of maze cells
+    if columns > 0 and rows > 0:
+        visited = bytearray(columns * rows)
+        stack = [(0, 0)]
+        visited[0] = 1
+        walls[width + 1] = 0
+        while stack:
+            cx, cy = stack[-1]
+            options = [(nx, ny) for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1))
+                       if 0 <= nx < columns and 0 <= ny < rows and not visited[ny * columns + nx]]
+            if not options:
+                stack.pop()
+                continue
+            nx, ny = rng.choice(options)
+            visited[ny * columns + nx] = 1
+            walls[(2 * ny + 1) * width + 2 * nx + 1] = 0
+            walls[(cy + ny + 1) * width + cx + nx + 1] = 0  # wall between the two maze cells
+            stack.append((nx, ny))
+        if loops > 0:
+            for y in range(1, 2 * rows):
+                for x in range(1 + y % 2, 2 * columns, 2):  # cells between two maze cells
+                    if walls[y * width + x] and rng.random() < loops:
+                        walls[y * width + x] = 0
+    return GridMap(width, height, np.frombuffer(walls, dtype=bool).reshape(height, width).copy())
+
+
+# visual state of a GridMap for the grid mode: search states of the cells, start/end cell and the image that is
+# drawn. Has the same observer methods as NetworkGraph, so searches (and replays) color the cells while they run
+class GridView:
+    def __init__(self, core, cell_size):
+        self.core = core  # GridMap that is searched
+        self.cell_size = cell_size  # size of a cell on screen in pixels
+        self.cell_state = np.zeros(core.walls.size, dtype=np.uint8)  # State value per cell id
+        self.start_id = -1
+        self.end_id = -1
+        self.dirty = True  # appearance changed since the image was created
+        self.listeners = []  # objects that are notified about edits (edges_changed(node_ids), endpoints_changed())
+
+    # id of the cell at a position on screen; -1 if it is outside the grid
+    def cell_at_pos(self, pos):
+        return self.core.cell_at(int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+    # ids of the cells on the line between two positions on screen (no gaps, even if the mouse moved fast)
+    def cells_on_line(self, from_pos, to_pos):
+        steps = max(1, int(math.dist(from_pos, to_pos) / self.cell_size * 2))
+        cells = []
+        for i in range(steps + 1):
+            t = i / steps
+            u = self.cell_at_pos((from_pos[0] + (to_pos[0] - from_pos[0]) * t,
+                                  from_pos[1] + (to_pos[1] - from_pos[1]) * t))
+            if u != -1 and (not cells or cells[-1] != u):
+                cells.append(u)
+        return cells
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    # block (blocked=True) or free cells (start and end cell stay free); listeners are told about all cells whose
+    # moves changed (the cells and their neighbours). Returns the number of cells that changed
+    def paint_walls(self, cells, blocked):
+        changed = self.core.set_walls([u for u in cells if u != self.start_id and u != self.end_id], blocked)
+        if changed:
+            self.cell_state[changed] = State.DEFAULT.value
+            self.dirty = True
+            affected = set(changed)
+            for u in changed:
+                x, y = self.core.pos(u)
+                affected.update(self.core.cell_at(x + dx, y + dy) for dx, dy in MOVES)
+            affected = [u for u in affected if u != -1 and self.core.has_node(u)]
+            for listener in list(self.listeners):
+                listener.edges_changed(affected)
+        return len(changed)
+
+    # replace the whole grid (e.g. by a new maze)
+    def set_core(self, core):
+        self.core = core
+        self.cell_state = np.zeros(core.walls.size, dtype=np.uint8)
+        self.start_id = self.end_id = -1
+        self.dirty = True
+
+    def get_start_node(self):
+        return self.start_id if self.start_id != -1 else None
+
+    def get_end_node(self):
+        return self.end_id if self.end_id != -1 else None
+
+    # mark a free cell as start/end cell; returns False if the cell is a wall
+    def set_start_node(self, u):
+        return self._set_endpoint(u, True)
+
+    def set_end_node(self, u):
+        return self._set_endpoint(u, False)
+
+    def _set_endpoint(self, u, start):
+        if not self.core.has_node(u):
+            return False
+        if start:
+            self.end_id = -1 if u == self.end_id else self.end_id
+            self.start_id = u
+        else:
+            self.start_id = -1 if u == self.start_id else self.start_id
+            self.end_id = u
+        self.dirty = True
+        for listener in list(self.listeners):
+            listener.endpoints_changed()
+        return True
+
+    # reset the states of all cells
+    def reset_states(self):
+        self.cell_state.fill(State.DEFAULT.value)
+        self.dirty = True
+
+    def _set_state(self, node_id, state):
+        self.cell_state[node_id] = state.value
+        self.dirty = True
+
+    # methods for visualizing the progress of a search (see NetworkGraph; cells have no connections to color)
+    def enqueued_from(self, node_id, from_id):
+        self._set_state(node_id, State.ENQUEUED)
+
+    def inspected_from(self, node_id, from_id=-1):
+        self._set_state(node_id, State.INSPECTED)
+
+    def visited_from(self, node_id, from_id=-1):
+        self._set_state(node_id, State.VISITED)
+
+    def enqueued_backward_from(self, node_id, from_id):
+        self._set_state(node_id, State.ENQUEUED_BACKWARD)
+
+    def visited_backward_from(self, node_id, from_id=-1):
+        self._set_state(node_id, State.VISITED_BACKWARD)
+
+    def highlight_path_to_node(self, node_id, next_id=-1):
+        self._set_state(node_id, State.HIGHLIGHTED)
+
+    def reset_connection(self, node_id, from_id):
+        pass
+
+    def highlight_final_path(self, final_path):
+        self.cell_state[final_path] = State.HIGHLIGHTED.value
+        self.dirty = True
+
+    # image of the grid with one pixel per cell
+    def image(self):
+        import pygame
+        palette = np.array([FREE_COLOR] + [STATE_COLORS[State(value)] for value in range(1, len(State))],
+                           dtype=np.uint8)
+        colors = palette[self.cell_state]
+        colors[self.core.walls.reshape(-1)] = WALL_COLOR
+        if self.start_id != -1:
+            colors[self.start_id] = START_COLOR
+        if self.end_id != -1:
+            colors[self.end_id] = END_COLOR
+        self.dirty = False
+        # surfarray expects the pixels column by column
+        return pygame.surfarray.make_surface(colors.reshape(self.core.height, self.core.width, 3).transpose(1, 0, 2))
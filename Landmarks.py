@@ -0,0 +1,153 @@
+# ALT preprocessing (A*, Landmarks, Triangle inequality): the distances from a few landmark nodes to all nodes are
+# computed once. For every landmark L, |d(L, end) - d(L, node)| is a lower bound of the distance from node to end,
+# which is a much better A* heuristic than the straight-line distance on road-like graphs.
+# The table is cached on the GraphCore (cleared on edit) and can be stored next to a graph file.
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import zlib
+from array import array
+from Distances import dijkstra_tree
+
+LANDMARK_COUNT = 16  # default number of landmarks
+ACTIVE_LANDMARKS = 4  # landmarks a single search uses (the ones that give the best bound between start and end)
+MAGIC = b"PFVL"
+VERSION = 2  # version 1 had no checksum in the fingerprint
+# magic, version, landmarks, fingerprint (node slots, node count, edge slots, edge count, checksum)
+HEADER = struct.Struct("<4sIqqqqqq")
+HEADER_SIZE = 56  # size of the header in bytes (multiple of 8, so all sections are aligned)
+
+
+# landmark ids and their distances to all nodes (rows[i][u] = distance from landmarks[i] to node u, inf if
+# not reachable); fingerprint identifies the graph the table was built for
+class LandmarkTable:
+    def __init__(self, landmarks, rows, fingerprint, buffer=None):
+        self.landmarks = landmarks
+        self.rows = rows
+        self.fingerprint = fingerprint
+        self.buffer = buffer  # object that owns the memory of the rows if they are views (e.g. memory-mapped file)
+
+    # approximate number of bytes used by the table
+    def nbytes(self):
+        return 4 * len(self.landmarks) + sum(8 * len(row) for row in self.rows)
+
+
+# (node slots, node count, edge slots, edge count, checksum) of a graph; node and edge ids are never reused, so every
+# edit changes at least one of the counts. The checksum of coordinates, edges and weights tells apart different graphs
+# of the same size (e.g. another graph saved over a graph file whose landmark file is still there)
+def fingerprint(core):
+    checksum = 0
+    for data in (core.xs, core.ys, core.alive, core.edge_u, core.edge_v, core.edge_w, core.edge_alive):
+        checksum = zlib.crc32(data, checksum)
+    return len(core.xs), core.node_count, len(core.edge_u), core.edge_count, checksum
+
+
+# choose landmarks far away from each other (farthest point selection) and compute their distance tables.
+# stop: function that is checked while the tables are computed; None (nothing cached) if it returned True
+def build_landmarks(graph, count=LANDMARK_COUNT, seed=None, stop=None):
+    core = getattr(graph, "core", graph)
+    nodes = list(core.node_ids())
+    landmarks, rows = array('i'), []
+    if nodes:
+        rng = random.Random(seed)
+        tree = dijkstra_tree(core, rng.choice(nodes), stop)  # the first landmark is the node farthest from a random one
+        if tree is None:
+            return None
+        dist = tree[0]
+        closest = array('d', [math.inf]) * len(core.xs)  # distance of every node to its closest landmark so far
+        for _ in range(min(count, len(nodes))):
+            landmark = max(nodes, key=lambda u: dist[u] if dist[u] != math.inf else -1)
+            if landmarks and closest[landmark] == 0:
+                break  # every node is a landmark already
+            tree = dijkstra_tree(core, landmark, stop)
+            if tree is None:
+                return None
+            dist = tree[0]
+            landmarks.append(landmark)
+            rows.append(dist)
+            for u in nodes:
+                if dist[u] < closest[u]:
+                    closest[u] = dist[u]
+            dist = closest  # the next landmark is the node farthest from all landmarks
+    table = LandmarkTable(landmarks, rows, fingerprint(core))
+    core.cache["landmarks"] = table
+    return table
+
+
+# get the landmark table of a graph (built on first use, until the graph is edited; see build_landmarks for stop)
+def get_landmarks(graph, stop=None):
+    core = getattr(graph, "core", graph)
+    table = core.cache.get("landmarks")
+    return table if table is not None else build_landmarks(core, stop=stop)
+
+
+# file the landmark table of a graph file is stored in (next to it)
+def landmark_path(graph_path):
+    return os.path.splitext(graph_path)[0] + ".pfvl"
+
+
+# write a landmark table to path
+def save_landmarks(table, path):
+    temp_path = path + ".tmp"  # the table may still be a view of the memory-mapped old file (see GraphIO.save_graph)
+    with open(temp_path, "wb") as file:
+        header = HEADER.pack(MAGIC, VERSION, len(table.landmarks), *table.fingerprint)
+        file.write(header + bytes(HEADER_SIZE - len(header)))
+        landmarks = array('i', table.landmarks)
+        rows = [array('d', row) for row in table.rows]
+        if sys.byteorder == "big":
+            for data in [landmarks] + rows:
+                data.byteswap()
+        file.write(landmarks)
+        file.write(bytes(-len(landmarks) * 4 % 8))
+        for row in rows:
+            file.write(row)
+    os.replace(temp_path, path)
+
+
+# read the landmark table stored at path for a graph; the table is cached on the graph and returned.
+# None if there is no such file or it was built for another graph (e.g. the graph was edited since)
+def load_landmarks(graph, path, use_mmap=True):
+    core = getattr(graph, "core", graph)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        if use_mmap and sys.byteorder == "little" and os.fstat(file.fileno()).st_size > 0:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = file.read()
+    if len(data) < 8 or data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a landmark file")
+    version = struct.unpack_from("<I", data, 4)[0]
+    if version == 1:  # fingerprint without checksum --> cannot tell whether it belongs to this graph
+        return None
+    if version != VERSION:
+        raise ValueError(f"unsupported landmark file version {version}")
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"{path} is truncated (too short for the header)")
+    _, _, count, *table_fingerprint = HEADER.unpack_from(data)
+    if tuple(table_fingerprint) != fingerprint(core):
+        return None
+    size = HEADER_SIZE + count * 4 + -count * 4 % 8 + count * table_fingerprint[0] * 8
+    if count < 0 or len(data) < size:
+        raise ValueError(f"{path} is truncated ({len(data)} bytes, the header needs {size} bytes)")
+    view = memoryview(data)
+    position = HEADER_SIZE
+    sections = []
+    for length, typecode in [(count, 'i')] + [(table_fingerprint[0], 'd')] * count:
+        size = length * struct.calcsize(typecode)
+        section = view[position:position + size]
+        if isinstance(data, mmap.mmap):
+            sections.append(section.cast(typecode))
+        else:
+            sections.append(array(typecode))
+            sections[-1].frombytes(section)
+            if sys.byteorder == "big":
+                sections[-1].byteswap()
+        position += size + -size % 8
+    table = LandmarkTable(sections[0], sections[1:], tuple(table_fingerprint),
+                          data if isinstance(data, mmap.mmap) else None)
+    core.cache["landmarks"] = table
+    return table
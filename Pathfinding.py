@@ -1,98 +1,953 @@
-class BreadthFirst:
+import heapq
+import math
+import sys
+import time
+from array import array
+from collections import deque
+from GraphCore import GraphCore
+from Landmarks import ACTIVE_LANDMARKS, get_landmarks
+
+# event types of an event trace
+EVENT_ENQUEUED = 0  # node was put in queue from another node
+EVENT_INSPECTED = 1  # node is actively looked at (reached from another node)
+EVENT_VISITED = 2  # node was looked at
+EVENT_RESET_CONNECTION = 3  # node is no longer reached over the connection from another node
+EVENT_HIGHLIGHTED = 4  # node (and connection to next node) is part of the final path
+EVENT_ENQUEUED_BACKWARD = 5  # node was put in queue of the search from the end node (bidirectional search)
+EVENT_VISITED_BACKWARD = 6  # node was looked at by the search from the end node (bidirectional search)
+
+
+# split a graph into the core that is searched and the observer that visualizes the search
+# (a NetworkGraph/GridView observes its own searches, a bare GraphCore/GridMap is searched without visualization)
+def unpack_graph(graph):
+    if isinstance(graph, GraphCore) or not hasattr(graph, "core"):
+        return graph, None
+    return graph.core, graph
+
+
+# id of a node; nodes can be given as id or as Node view
+def node_id(node):
+    return node if isinstance(node, int) else node.id
+
+
+# observer that records the progress of a search as a compact event trace instead of coloring the graph;
+# the trace is a flat array of (event type, node id, from id) entries that can be replayed later on
+class EventTrace:
+    def __init__(self):
+        self.events = array('i')
+
+    def enqueued_from(self, node_id, from_id):
+        self.events.extend((EVENT_ENQUEUED, node_id, from_id))
+
+    def inspected_from(self, node_id, from_id=-1):
+        self.events.extend((EVENT_INSPECTED, node_id, from_id))
+
+    def visited_from(self, node_id, from_id=-1):
+        self.events.extend((EVENT_VISITED, node_id, from_id))
+
+    def reset_connection(self, node_id, from_id):
+        self.events.extend((EVENT_RESET_CONNECTION, node_id, from_id))
+
+    def enqueued_backward_from(self, node_id, from_id):
+        self.events.extend((EVENT_ENQUEUED_BACKWARD, node_id, from_id))
+
+    def visited_backward_from(self, node_id, from_id=-1):
+        self.events.extend((EVENT_VISITED_BACKWARD, node_id, from_id))
+
+    def highlight_final_path(self, final_path):
+        for i in range(len(final_path)):
+            next_id = final_path[i + 1] if i + 1 < len(final_path) else -1
+            self.events.extend((EVENT_HIGHLIGHTED, final_path[i], next_id))
+
+    def __len__(self):
+        return len(self.events) // 3
+
+    # get the i-th event as tuple (event type, node id, from id)
+    def __getitem__(self, i):
+        return tuple(self.events[3 * i:3 * i + 3])
+
+
+# metrics of a search run; phases = seconds per phase: preprocessing (e.g. landmarks), search (the algorithm itself)
+# and visualization (time spent in the observer, i.e. coloring nodes/connections or recording the trace)
+class SearchStats:
+    def __init__(self):
+        self.steps = 0  # calls of step()
+        self.expanded = 0  # nodes that were taken from the frontier and looked at
+        self.relaxed = 0  # connections that were looked at from an expanded node
+        self.max_frontier = 0  # largest number of entries in the frontier (queue/stack/heap)
+        self.peak_memory = None  # bytes allocated at most during the search (only measured while tracemalloc traces)
+        self.phases = {"preprocessing": 0.0, "search": 0.0, "visualization": 0.0}
+
+    def total_time(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        return {"steps": self.steps, "expanded": self.expanded, "relaxed": self.relaxed,
+                "max_frontier": self.max_frontier, "peak_memory": self.peak_memory, **self.phases}
+
+
+# forwards the calls of a searcher to its observer and measures the time spent in it
+class TimedObserver:
+    def __init__(self, target, stats):
+        self.target = target  # observer that is timed (NetworkGraph, EventTrace, ...)
+        self.stats = stats
+
+    def _timed(self, method, *args):
+        begin = time.perf_counter()
+        method(*args)
+        self.stats.phases["visualization"] += time.perf_counter() - begin
+
+    def enqueued_from(self, node_id, from_id):
+        self._timed(self.target.enqueued_from, node_id, from_id)
+
+    def inspected_from(self, node_id, from_id=-1):
+        self._timed(self.target.inspected_from, node_id, from_id)
+
+    def visited_from(self, node_id, from_id=-1):
+        self._timed(self.target.visited_from, node_id, from_id)
+
+    def reset_connection(self, node_id, from_id):
+        self._timed(self.target.reset_connection, node_id, from_id)
+
+    def enqueued_backward_from(self, node_id, from_id):
+        self._timed(self.target.enqueued_backward_from, node_id, from_id)
+
+    def visited_backward_from(self, node_id, from_id=-1):
+        self._timed(self.target.visited_backward_from, node_id, from_id)
+
+    def highlight_final_path(self, final_path):
+        self._timed(self.target.highlight_final_path, final_path)
+
+
+# result of a search that was run to completion
+class SearchResult:
+    def __init__(self, path, cost, trace=None, stats=None):
+        self.path = path  # list of node ids from start to end; None if they are not connected
+        self.cost = cost  # sum of the weights along the path; None if they are not connected
+        self.trace = trace  # EventTrace of the search (None if it was not recorded)
+        self.stats = stats  # SearchStats of the search
+
+
+# replays an event trace on a NetworkGraph; has the same stepping interface as the searchers,
+# one step shows everything the algorithm did in one of its steps
+class TracePlayer:
+    def __init__(self, graph, trace, stats=None):
+        self.graph = graph
+        self.trace = trace
+        self.stats = stats  # SearchStats of the search that is replayed
+        self.position = 0  # index of the next event that is shown
+        self.handlers = {
+            EVENT_ENQUEUED: graph.enqueued_from,
+            EVENT_INSPECTED: graph.inspected_from,
+            EVENT_VISITED: graph.visited_from,
+            EVENT_RESET_CONNECTION: graph.reset_connection,
+            EVENT_HIGHLIGHTED: graph.highlight_path_to_node,
+            EVENT_ENQUEUED_BACKWARD: graph.enqueued_backward_from,
+            EVENT_VISITED_BACKWARD: graph.visited_backward_from,
+        }
+
+    # number of events that can be shown (the whole trace; a trace that is still recorded may offer less)
+    def available(self):
+        return len(self.trace)
+
+    def has_finished(self):
+        return self.position >= self.available()
+
+    def step(self):
+        events, handlers = self.trace.events, self.handlers
+        inspected = False
+        available = self.available()
+        while self.position < available:
+            i = 3 * self.position
+            event = events[i]
+            if inspected and event in (EVENT_VISITED, EVENT_VISITED_BACKWARD, EVENT_INSPECTED):  # next step begins
+                return
+            inspected = inspected or event == EVENT_INSPECTED
+            handlers[event](events[i + 1], events[i + 2])
+            self.position += 1
+
+
+# common part of all searchers: the algorithm state (queue, visited, prev) belongs to the searcher only,
+# so the node states of the graph are never read and several searches can run on the same graph
+class Search:
     def __init__(self, graph, start, end):
         self.graph = graph
-        self.start_node = start
-        self.end_node = end
-        self.queue = []
-        self.prev = {node: None for node in
-                     self.graph.get_nodes()}  # dict for keeping track of what the previous node of a node was
-        self.queue.append(self.start_node)  # add start node to queue
+        self.core, observer = unpack_graph(graph)
+        self.stats = SearchStats()
+        self.observer = TimedObserver(observer, self.stats) if observer is not None else None
+        self.memory_baseline = None  # traced memory when the search started (if tracemalloc traces)
+        self.start_node = node_id(start)
+        self.end_node = node_id(end)
+        self.prev = {self.start_node: -1}  # dict for keeping track of what the previous node of a node was
         self.finished = False
-        self.previous_node = None
+        self.previous_node = -1
+        self.path = None  # list of node ids from start to end (set when the end node is reached)
+        self.cost = None  # sum of the weights along the path (set when the end node is reached)
+        self.verbose = True  # print the outcome of the search to the console
 
     def has_finished(self):
         return self.finished
 
+    # preprocessing of a graph that a search needs (e.g. the landmarks of ALT*), so that it can be done before the
+    # searcher is created; stop() is checked while it runs. False if it was stopped
+    @staticmethod
+    def prepare(core, stop=None):
+        return True
+
+    # run the search to completion at full speed without visualizing it; the progress is recorded
+    # as event trace (if record_trace is set), which can be shown afterwards with a TracePlayer
+    def run(self, record_trace=True):
+        self.verbose = False
+        self.observer = TimedObserver(EventTrace(), self.stats) if record_trace else None
+        while not self.finished:
+            self.step()
+        return SearchResult(self.path, self.cost, self.observer.target if record_trace else None, self.stats)
+
+    # perform one step of the algorithm (expand) and update the metrics of the run
     def step(self):
+        stats = self.stats
+        tracemalloc = sys.modules.get("tracemalloc")  # not imported here (slow import); whoever traces imported it
+        tracing = tracemalloc is not None and tracemalloc.is_tracing()
+        if tracing:  # peak is measured during the steps only (not while e.g. the screen is drawn in between)
+            if self.memory_baseline is None:
+                self.memory_baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        visualization = stats.phases["visualization"]
+        begin = time.perf_counter()
+        self.expand()
+        # observer time was measured separately --> search time is the rest
+        stats.phases["search"] += time.perf_counter() - begin - (stats.phases["visualization"] - visualization)
+        stats.steps += 1
+        frontier = self.frontier_size()
+        if frontier > stats.max_frontier:
+            stats.max_frontier = frontier
+        if tracing:
+            stats.peak_memory = max(stats.peak_memory or 0, tracemalloc.get_traced_memory()[1] - self.memory_baseline)
+
+    # methods that are implemented by the concrete searches
+    def expand(self):  # one step of the algorithm: take the next node from the frontier and look at it
+        raise NotImplementedError
+
+    def frontier_size(self):  # number of entries in the frontier
+        raise NotImplementedError
+
+    # mark the node that was inspected in the previous step (and its incoming connection) as visited
+    def finish_previous_node(self):
+        if self.previous_node != -1 and self.observer is not None:
+            self.observer.visited_from(self.previous_node, self.prev[self.previous_node])
+
+    def reconstruct_path(self):
+        path = []
+        curr_node = self.end_node
+        while curr_node != -1:
+            path.append(curr_node)
+            curr_node = self.prev[curr_node]
+        path.reverse()
+        self.set_path(path)
+
+    # keep the path that was found and color it; the graph can be edited between the steps of a search, so a
+    # connection of the path may have been removed meanwhile --> the search ends without a path then
+    def set_path(self, path):
+        edges = [self.core.find_edge(path[i], path[i + 1]) for i in range(len(path) - 1)]
+        if -1 in edges:
+            self.path = self.cost = None
+            if self.verbose:
+                print("\nA CONNECTION OF THE PATH WAS REMOVED DURING THE SEARCH --> START THE SEARCH AGAIN")
+            return
+        self.path = path
+        if self.cost is None:
+            self.cost = sum(self.core.edge_w[e] for e in edges)
+        if self.observer is not None:
+            self.observer.highlight_final_path(path)
+        if self.verbose:
+            print("PATH FOUND AND HIGHLIGHTED")
+
+    def not_connected(self):
+        self.finished = True  # algorithm finished but not successful
+        if self.verbose:
+            print("\nSTART AND END NODE ARE NOT CONNECTED --> NO PATH CAN BE FOUND")
+
+
+class BreadthFirst(Search):
+    def __init__(self, graph, start, end):
+        super().__init__(graph, start, end)
+        self.queue = deque([self.start_node])  # add start node to queue
+        self.visited = {self.start_node}  # nodes that were already put into the queue
+
+    def frontier_size(self):
+        return len(self.queue)
+
+    def expand(self):
         if len(self.queue) > 0:
-            curr_node = self.queue.pop(0)  # FIFO principal
+            curr_node = self.queue.popleft()  # FIFO principal
+            self.stats.expanded += 1
+            observer = self.observer
 
             # mark the node and its incoming connection from previous step as visited
-            if self.previous_node is not None:
-                self.previous_node.visited_from(self.prev[self.previous_node])
+            self.finish_previous_node()
 
             # mark current node as the inspected one (as well as its incoming connection if there is one)
-            curr_node.inspected_from(self.prev[curr_node])
+            if observer is not None:
+                observer.inspected_from(curr_node, self.prev[curr_node])
 
-            if curr_node.is_end_node():  # target found
+            if curr_node == self.end_node:  # target found
                 self.reconstruct_path()
                 self.finished = True  # algorithm finished
                 return
-            for neighbour in curr_node.get_neighbours():
-
-                if not neighbour.already_visited():  # check if neighbour was already visited
+            for neighbour, _ in self.core.neighbours(curr_node):
+                self.stats.relaxed += 1
+                if neighbour not in self.visited:  # check if neighbour was already visited
+                    self.visited.add(neighbour)
                     self.queue.append(neighbour)
-                    neighbour.enqueued_from(curr_node)  # mark the current node and its incoming connection as "is on waitlist"
                     self.prev[neighbour] = curr_node
+                    if observer is not None:  # mark the current node and its incoming connection as "is on waitlist"
+                        observer.enqueued_from(neighbour, curr_node)
             self.previous_node = curr_node
         else:  # no nodes in queue left and target was not found --> start and end not connected
-            self.finished = True  # algorithm finished but not successful
-            print("\nSTART AND END NODE ARE NOT CONNECTED --> NO PATH CAN BE FOUND")
+            self.not_connected()
+
+
+class DepthFirst(Search):
+    def __init__(self, graph, start, end):
+        super().__init__(graph, start, end)
+        self.stack = [self.start_node]
+        self.visited = {self.start_node}  # nodes that were already put onto the stack
+
+    def frontier_size(self):
+        return len(self.stack)
+
+    def expand(self):
+        if len(self.stack) > 0: # check if there are nodes left to check
+            curr_node = self.stack.pop()
+            self.stats.expanded += 1
+            observer = self.observer
+
+            self.finish_previous_node()
+
+            if observer is not None:
+                observer.inspected_from(curr_node, self.prev[curr_node])
+
+            if curr_node == self.end_node:
+                self.reconstruct_path()
+                self.finished = True
+                return
+            for neighbour, _ in self.core.neighbours(curr_node):
+                self.stats.relaxed += 1
+                if neighbour not in self.visited:
+                    self.visited.add(neighbour)
+                    self.stack.append(neighbour)
+                    self.prev[neighbour] = curr_node
+                    if observer is not None:
+                        observer.enqueued_from(neighbour, curr_node)
+            self.previous_node = curr_node
+        else:
+            self.not_connected()
+
+
+class Dijkstra(Search):
+    def __init__(self, graph, start, end):
+        super().__init__(graph, start, end)
+        self.dist = {self.start_node: 0}  # tentative distance from start node
+        self.settled = set()  # nodes whose shortest distance is final
+        self.heap = [(self.heuristic(self.start_node), self.start_node)]  # priority queue (binary heap)
+
+    # estimated remaining distance from node to end node (0 --> plain dijkstra)
+    def heuristic(self, node):
+        return 0
+
+    def frontier_size(self):
+        return len(self.heap)
+
+    def expand(self):
+        # lazy deletion: entries of already settled nodes are outdated (their key was decreased later on)
+        while len(self.heap) > 0 and self.heap[0][1] in self.settled:
+            heapq.heappop(self.heap)
+        if len(self.heap) > 0:
+            _, curr_node = heapq.heappop(self.heap)  # node with the smallest (estimated) distance
+            self.settled.add(curr_node)
+            self.stats.expanded += 1
+            observer = self.observer
+
+            self.finish_previous_node()
+
+            if observer is not None:
+                observer.inspected_from(curr_node, self.prev[curr_node])
+
+            if curr_node == self.end_node:
+                self.cost = self.dist[curr_node]
+                self.reconstruct_path()
+                self.finished = True
+                return
+            dist, prev, weights = self.dist, self.prev, self.core.edge_w
+            curr_dist = dist[curr_node]
+            for neighbour, edge in self.core.neighbours(curr_node):
+                self.stats.relaxed += 1
+                if neighbour in self.settled:
+                    continue
+                new_dist = curr_dist + weights[edge]
+                if new_dist < dist.get(neighbour, math.inf):  # shorter path found --> decrease key
+                    if observer is not None and neighbour in prev:  # neighbour is no longer reached over its old connection
+                        observer.reset_connection(neighbour, prev[neighbour])
+                    dist[neighbour] = new_dist
+                    prev[neighbour] = curr_node
+                    heapq.heappush(self.heap, (new_dist + self.heuristic(neighbour), neighbour))
+                    if observer is not None:
+                        observer.enqueued_from(neighbour, curr_node)
+            self.previous_node = curr_node
+        else:
+            self.not_connected()
 
     def reconstruct_path(self):
+        super().reconstruct_path()
+        if self.verbose and self.path is not None:
+            print(f"PATH LENGTH: {self.cost:.1f}")
+
+
+# dijkstra guided by the euclidean distance to the end node, scaled by GraphCore.weight_scale so that it stays
+# admissible if weights are not screen distances (e.g. road lengths in meters; weights of 0 --> plain dijkstra)
+class AStar(Dijkstra):
+    def __init__(self, graph, start, end):
+        self.scale = unpack_graph(graph)[0].weight_scale()  # set first, the start node is estimated on init
+        super().__init__(graph, start, end)
+
+    def heuristic(self, node):
+        xs, ys = self.core.xs, self.core.ys
+        return self.scale * math.hypot(xs[node] - xs[self.end_node], ys[node] - ys[self.end_node])
+
+
+# A* with the ALT heuristic: lower bounds from the landmark distance table of the graph (see Landmarks), which is
+# built before the first search and reused until the graph is edited
+class ALTStar(AStar):
+    def __init__(self, graph, start, end):
+        core, _ = unpack_graph(graph)
+        start_id, end_id = node_id(start), node_id(end)
+        begin = time.perf_counter()
+        rows = [(row, row[end_id]) for row in get_landmarks(core).rows
+                if row[start_id] != math.inf and row[end_id] != math.inf]
+        rows.sort(key=lambda item: abs(item[1] - item[0][start_id]), reverse=True)
+        preprocessing = time.perf_counter() - begin
+        self.end_rows = rows[:ACTIVE_LANDMARKS]  # (distances from landmark, distance from landmark to end node)
+        self.estimates = {}  # node id -> heuristic (every node is estimated once)
+        super().__init__(graph, start, end)
+        self.stats.phases["preprocessing"] = preprocessing
+
+    @staticmethod
+    def prepare(core, stop=None):
+        return get_landmarks(core, stop) is not None
+
+    def heuristic(self, node):
+        estimate = self.estimates.get(node)
+        if estimate is None:
+            estimate = super().heuristic(node)  # straight-line distance is a lower bound as well
+            for row, end_dist in self.end_rows:
+                dist = row[node]
+                if dist != math.inf and abs(end_dist - dist) > estimate:
+                    estimate = abs(end_dist - dist)
+            self.estimates[node] = estimate
+        return estimate
+
+
+# searches from both ends at the same time and stops as soon as the two frontiers meet; the frontier of the
+# search from the end node is visualized with its own colors. Side 0 searches from the start node, side 1 from the end node.
+class BidirectionalSearch(Search):
+    def __init__(self, graph, start, end):
+        super().__init__(graph, start, end)
+        self.dists = ({self.start_node: 0}, {self.end_node: 0})  # distance from start node / from end node
+        self.prevs = (self.prev, {self.end_node: -1})  # previous node on the way from start node / from end node
+        self.previous_nodes = [-1, -1]  # node that was inspected in the previous step of each side
+        self.best = math.inf  # length of the shortest path found so far
+        self.meeting = None  # (node reached from start, node reached from end) of the shortest path found so far
+
+    # methods that are implemented by the concrete searches
+    def frontier_empty(self, side):
+        raise NotImplementedError
+
+    def frontier_sizes(self):  # number of entries in the frontiers of both sides
+        raise NotImplementedError
+
+    def pop(self, side):  # remove and return the next node of the frontier of side
+        raise NotImplementedError
+
+    def relax(self, side, node, neighbour, edge):  # True if neighbour is reached over a shorter path now
+        raise NotImplementedError
+
+    def edge_length(self, edge):
+        raise NotImplementedError
+
+    def lower_bound(self):  # length of the shortest path that could still be found
+        raise NotImplementedError
+
+    def choose_side(self):  # side that is expanded next
+        raise NotImplementedError
+
+    # check if a path over node and neighbour (reached from the other side) is shorter than the best one so far
+    def check_meeting(self, side, node, neighbour, length):
+        other = self.dists[1 - side]
+        if neighbour in other:
+            length += self.dists[side][node] + other[neighbour]
+            if length < self.best:
+                self.best = length
+                self.meeting = (node, neighbour) if side == 0 else (neighbour, node)
+
+    def frontier_size(self):
+        return sum(self.frontier_sizes())
+
+    def expand(self):
+        if self.frontier_empty(0) or self.frontier_empty(1) or self.best <= self.lower_bound():
+            self.finish()
+            return
+        side = self.choose_side()
+        curr_node = self.pop(side)
+        self.stats.expanded += 1
+        observer = self.observer
+        prev = self.prevs[side]
+
+        previous_node = self.previous_nodes[side]
+        if previous_node != -1 and observer is not None:
+            if side == 0:
+                observer.visited_from(previous_node, prev[previous_node])
+            else:
+                observer.visited_backward_from(previous_node, prev[previous_node])
+        if observer is not None:
+            observer.inspected_from(curr_node, prev[curr_node])
+
+        other_dist = self.dists[1 - side]
+        if curr_node in other_dist:
+            self.check_meeting(side, curr_node, curr_node, 0)
+        relax = self.relax
+        for neighbour, edge in self.core.neighbours(curr_node):
+            self.stats.relaxed += 1
+            if relax(side, curr_node, neighbour, edge):
+                if observer is not None:
+                    if neighbour in prev:  # neighbour is no longer reached over its old connection
+                        observer.reset_connection(neighbour, prev[neighbour])
+                    if side == 0:
+                        observer.enqueued_from(neighbour, curr_node)
+                    else:
+                        observer.enqueued_backward_from(neighbour, curr_node)
+                prev[neighbour] = curr_node
+            if neighbour in other_dist:
+                self.check_meeting(side, curr_node, neighbour, self.edge_length(edge))
+        self.previous_nodes[side] = curr_node
+
+    def finish(self):
+        if self.meeting is None:
+            self.not_connected()
+            return
+        self.finished = True
+        self.reconstruct_path()
+
+    def reconstruct_path(self):
+        forward_node, backward_node = self.meeting
         path = []
-        curr_node = self.end_node
-        while curr_node is not None:
+        curr_node = forward_node
+        while curr_node != -1:  # from meeting point back to start node
             path.append(curr_node)
-            curr_node = self.prev[curr_node]
+            curr_node = self.prevs[0][curr_node]
         path.reverse()
-        self.graph.highlight_final_path(path)
-        print("PATH FOUND AND HIGHLIGHTED")
+        curr_node = backward_node if backward_node != forward_node else self.prevs[1][backward_node]
+        while curr_node != -1:  # from meeting point to end node
+            path.append(curr_node)
+            curr_node = self.prevs[1][curr_node]
+        self.set_path(path)
 
 
-class DepthFirst:
+# breadth-first search from both ends (shortest path in an unweighted graph)
+class BidirectionalBreadthFirst(BidirectionalSearch):
     def __init__(self, graph, start, end):
-        self.graph = graph
-        self.start_node = start
-        self.end_node = end
-        self.stack = []
-        self.stack.append(self.start_node)
+        super().__init__(graph, start, end)
+        self.queues = (deque([self.start_node]), deque([self.end_node]))
+
+    def frontier_empty(self, side):
+        return len(self.queues[side]) == 0
+
+    def frontier_sizes(self):
+        return len(self.queues[0]), len(self.queues[1])
+
+    def pop(self, side):
+        return self.queues[side].popleft()
+
+    def relax(self, side, node, neighbour, edge):
+        dist = self.dists[side]
+        if neighbour in dist:
+            return False
+        dist[neighbour] = dist[node] + 1
+        self.queues[side].append(neighbour)
+        return True
+
+    def edge_length(self, edge):
+        return 1
+
+    def lower_bound(self):  # every path that was not found yet contains a node that is still queued on both sides
+        return self.dists[0][self.queues[0][0]] + self.dists[1][self.queues[1][0]] + 1
+
+    def choose_side(self):  # expand the smaller frontier
+        return 0 if len(self.queues[0]) <= len(self.queues[1]) else 1
+
+
+# dijkstra from both ends (shortest path in a weighted graph)
+class BidirectionalDijkstra(BidirectionalSearch):
+    def __init__(self, graph, start, end):
+        super().__init__(graph, start, end)
+        self.heaps = ([(0, self.start_node)], [(0, self.end_node)])
+        self.settled = (set(), set())
+
+    # lazy deletion: remove outdated entries from the top of the heap of side
+    def clean(self, side):
+        heap, settled = self.heaps[side], self.settled[side]
+        while len(heap) > 0 and heap[0][1] in settled:
+            heapq.heappop(heap)
+
+    def frontier_empty(self, side):
+        self.clean(side)
+        return len(self.heaps[side]) == 0
+
+    def frontier_sizes(self):
+        return len(self.heaps[0]), len(self.heaps[1])
+
+    def pop(self, side):
+        self.clean(side)
+        _, node = heapq.heappop(self.heaps[side])
+        self.settled[side].add(node)
+        return node
+
+    def relax(self, side, node, neighbour, edge):
+        dist = self.dists[side]
+        if neighbour in self.settled[side]:
+            return False
+        new_dist = dist[node] + self.core.edge_w[edge]
+        if new_dist >= dist.get(neighbour, math.inf):
+            return False
+        dist[neighbour] = new_dist
+        heapq.heappush(self.heaps[side], (new_dist, neighbour))
+        return True
+
+    def edge_length(self, edge):
+        return self.core.edge_w[edge]
+
+    def lower_bound(self):  # both searches have settled every node closer than the top of their heaps
+        return self.heaps[0][0][0] + self.heaps[1][0][0]
+
+    def choose_side(self):  # expand the side with the smaller radius, so both grow evenly
+        return 0 if self.heaps[0][0][0] <= self.heaps[1][0][0] else 1
+
+    def finish(self):
+        if self.meeting is not None:
+            self.cost = self.best
+        super().finish()
+
+
+# lifelong planning A* (LPA*): an A* search that keeps its distances after it finished, so that it can repair the
+# shortest path after the graph was edited instead of searching from scratch. Only nodes whose distance from the
+# start node changed by an edit are looked at again. g = distance of a node when it was last expanded,
+# rhs = distance according to its neighbours; a node is queued while both differ (it is "inconsistent").
+# On a NetworkGraph the search listens to the edits of the graph once it found its first result.
+class LPAStar(Search):
+    def __init__(self, graph, start, end):
+        self.scale = unpack_graph(graph)[0].weight_scale()  # heuristic as in AStar
+        super().__init__(graph, start, end)
+        self.g = {}  # node id -> distance from start node (missing --> infinite)
+        self.rhs = {self.start_node: 0}  # node id -> distance from start node over the best neighbour
+        self.keys = {}  # node id -> key of the node in the heap (only queued nodes)
+        self.heap = []  # entries (key, node id); outdated entries are skipped (lazy deletion)
+        self.listening = False  # True if the search is registered as listener of the graph
+        self.push(self.start_node)
+
+    def heuristic(self, node):
+        xs, ys = self.core.xs, self.core.ys
+        return self.scale * math.hypot(xs[node] - xs[self.end_node], ys[node] - ys[self.end_node])
+
+    def key(self, node):
+        distance = min(self.g.get(node, math.inf), self.rhs.get(node, math.inf))
+        return distance + self.heuristic(node), distance
+
+    def push(self, node):
+        key = self.key(node)
+        self.keys[node] = key
+        heapq.heappush(self.heap, (key, node))
+
+    # recompute rhs (and prev) of a node from its neighbours and queue it if it became inconsistent
+    def update_node(self, node):
+        g, rhs, prev, observer = self.g, self.rhs, self.prev, self.observer
+        if node != self.start_node:
+            best, best_prev = math.inf, -1
+            if self.core.has_node(node):
+                weights = self.core.edge_w
+                for neighbour, edge in self.core.neighbours(node):
+                    self.stats.relaxed += 1
+                    distance = g.get(neighbour, math.inf) + weights[edge]
+                    if distance < best:
+                        best, best_prev = distance, neighbour
+            old_prev = prev.get(node, -1)
+            if best_prev != old_prev:
+                if observer is not None and old_prev != -1 and self.core.find_edge(node, old_prev) != -1:
+                    observer.reset_connection(node, old_prev)  # node is no longer reached over its old connection
+                if best_prev == -1:
+                    prev.pop(node, None)
+                else:
+                    prev[node] = best_prev
+            if best == math.inf:
+                rhs.pop(node, None)
+            else:
+                rhs[node] = best
+        if g.get(node, math.inf) != rhs.get(node, math.inf):
+            self.push(node)
+            if observer is not None and node in prev:
+                observer.enqueued_from(node, prev[node])
+        else:
+            self.keys.pop(node, None)
+
+    def top_key(self):
+        heap, keys = self.heap, self.keys
+        while len(heap) > 0 and keys.get(heap[0][1]) != heap[0][0]:  # outdated entry
+            heapq.heappop(heap)
+        return heap[0][0] if len(heap) > 0 else (math.inf, math.inf)
+
+    def frontier_size(self):
+        return len(self.keys)
+
+    def expand(self):
+        end = self.end_node
+        if (self.top_key() >= self.key(end)
+                and self.g.get(end, math.inf) == self.rhs.get(end, math.inf)):  # shortest path to end node is known
+            self.finish()
+            return
+        _, curr_node = heapq.heappop(self.heap)
+        del self.keys[curr_node]
+        self.stats.expanded += 1
+        observer = self.observer
+
+        self.finish_previous_node()
+        if observer is not None:
+            observer.inspected_from(curr_node, self.prev.get(curr_node, -1))
+
+        g, rhs = self.g, self.rhs
+        if g.get(curr_node, math.inf) > rhs.get(curr_node, math.inf):  # distance decreased --> final for now
+            g[curr_node] = rhs[curr_node]
+            self.previous_node = curr_node
+        else:  # distance increased --> node and its neighbours have to be looked at again
+            g.pop(curr_node, None)
+            self.update_node(curr_node)
+            self.previous_node = -1
+        for neighbour, _ in self.core.neighbours(curr_node):
+            self.update_node(neighbour)
+
+    def finish_previous_node(self):
+        if self.previous_node != -1 and self.observer is not None:
+            self.observer.visited_from(self.previous_node, self.prev.get(self.previous_node, -1))
+            self.previous_node = -1
+
+    def finish(self):
+        self.finished = True
+        if self.end_node in self.g:
+            self.cost = self.g[self.end_node]
+            self.reconstruct_path()
+        else:
+            self.path = None
+            self.cost = None
+            self.not_connected()
+        if (not self.listening and self.observer is not None and self.observer.target is self.graph
+                and hasattr(self.graph, "add_listener")):
+            self.graph.add_listener(self)
+            self.listening = True
+
+    def reconstruct_path(self):
+        super().reconstruct_path()
+        if self.verbose and self.path is not None:
+            print(f"PATH LENGTH: {self.cost:.1f}")
+
+    # stop listening to the edits of the graph
+    def detach(self):
+        if self.listening:
+            self.graph.remove_listener(self)
+            self.listening = False
+
+    # search again (at full speed) after the graph was edited; the old path is shown as visited again
+    def repair(self):
+        observer, core = self.observer, self.core
+        if observer is not None and self.path is not None:
+            for i, node in enumerate(self.path):
+                if core.has_node(node):
+                    from_id = self.path[i - 1] if i > 0 and core.find_edge(node, self.path[i - 1]) != -1 else -1
+                    observer.visited_from(node, from_id)
         self.finished = False
-        self.prev = {node: None for node in self.graph.get_nodes()}
-        self.previous_node = None
+        self.path = None
+        self.cost = None
+        self.stats = SearchStats()  # metrics of the repair only
+        self.memory_baseline = None
+        if observer is not None:
+            observer.stats = self.stats
+        while not self.finished:
+            self.step()
 
-    def has_finished(self):
-        return self.finished
+    # listener method: connections at the given nodes were added or removed
+    def edges_changed(self, node_ids):
+        for node in node_ids:
+            self.update_node(node)
+        self.repair()
 
-    def step(self):
-        if len(self.stack) > 0: # check if there are nodes left to check
-            curr_node = self.stack.pop()
+    # listener method: start or end node of the graph changed
+    def endpoints_changed(self):
+        graph = self.graph
+        if graph.start_id == -1 or graph.end_id == -1:  # nothing to search for anymore
+            self.detach()
+            return
+        if graph.start_id != self.start_node:  # all distances refer to the old start node --> search from scratch
+            verbose = self.verbose
+            self.detach()
+            graph.reset_states()
+            self.__init__(graph, graph.start_id, graph.end_id)
+            self.verbose = verbose
+            self.repair()
+        elif graph.end_id != self.end_node:  # distances stay valid, only the heuristic changes
+            self.end_node = graph.end_id
+            self.heap = [(self.key(node), node) for node in self.keys]
+            heapq.heapify(self.heap)
+            self.keys = {node: key for key, node in self.heap}
+            self.repair()
+
+
+# jump point search: A* for grids (GridMap only). Runs through open areas are skipped in a single step, only
+# "jump points" (cells where a shortest path may have to turn) are put into the heap. Uses the same moves as
+# the GridMap (8 directions, no cutting corners), so its paths are as short as the ones of A*
+class JumpPointSearch(Search):
+    def __init__(self, graph, start, end):
+        super().__init__(graph, start, end)
+        if not hasattr(self.core, "free_offsets"):
+            raise ValueError("jump point search needs a GridMap")
+        self.diagonal_cost = self.core.edge_w[4]  # cost of a diagonal move (the first 4 moves are straight)
+        self.dist = {self.start_node: 0}  # distance from start node (jump points only)
+        self.settled = set()
+        self.heap = [(self.heuristic(self.start_node), self.start_node)]
+        self.end_index = self.core.free_index(self.end_node)
+
+    # octile distance between two cells (length of the shortest path if there are no walls)
+    def octile(self, u, v):
+        width = self.core.width
+        dx, dy = abs(u % width - v % width), abs(u // width - v // width)
+        return abs(dx - dy) + self.diagonal_cost * min(dx, dy)
+
+    def heuristic(self, node):
+        return self.octile(node, self.end_node)
+
+    def frontier_size(self):
+        return len(self.heap)
 
-            if self.previous_node is not None:
-                self.previous_node.visited_from(self.prev[self.previous_node])
+    # follow a straight run from index i into direction step; returns the index of the jump point (-1 if the run
+    # ends at a wall). side = offset perpendicular to step
+    def jump_straight(self, i, step, side):
+        free, end = self.core.free, self.end_index
+        while True:
+            i += step
+            if not free[i]:
+                return -1
+            if i == end:
+                return i
+            # forced neighbour: a cell next to the run is free, but could not be reached diagonally from the
+            # previous cell because the cell behind it is blocked --> paths may turn here
+            if (free[i + side] and not free[i - step + side]) or (free[i - side] and not free[i - step - side]):
+                return i
 
-            curr_node.inspected_from(self.prev[curr_node])
+    # follow a diagonal run from index i into direction (dx, dy); a cell is a jump point if a straight run
+    # starting there finds one
+    def jump_diagonal(self, i, dx, dy):
+        free, end = self.core.free, self.end_index
+        vertical = dy * (self.core.width + 2)
+        while True:
+            if not (free[i + dx] and free[i + vertical]):  # move would cut a corner
+                return -1
+            i += dx + vertical
+            if not free[i]:
+                return -1
+            if i == end:
+                return i
+            if self.jump_straight(i, dx, vertical) != -1 or self.jump_straight(i, vertical, dx) != -1:
+                return i
 
-            if curr_node.is_end_node():
+    # jump points that are reached from a node (runs in the directions a shortest path can continue in)
+    def successors(self, node):
+        core = self.core
+        row = core.width + 2
+        i = core.free_index(node)
+        parent = self.prev[node]
+        if parent == -1:  # start node --> all directions
+            directions = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+        else:
+            dx = (node % core.width > parent % core.width) - (node % core.width < parent % core.width)
+            dy = (node // core.width > parent // core.width) - (node // core.width < parent // core.width)
+            if dx and dy:  # diagonal run continues diagonally or straight in both of its directions
+                directions = [(dx, dy), (dx, 0), (0, dy)]
+            elif dx:  # straight runs can turn where a wall ends (forced neighbours)
+                directions = [(dx, 0), (0, 1), (0, -1), (dx, 1), (dx, -1)]
+            else:
+                directions = [(0, dy), (1, 0), (-1, 0), (1, dy), (-1, dy)]
+        jump_points = []
+        for dx, dy in directions:
+            if dx and dy:
+                j = self.jump_diagonal(i, dx, dy)
+            elif dx:
+                j = self.jump_straight(i, dx, row)
+            else:
+                j = self.jump_straight(i, dy * row, 1)
+            if j != -1:
+                jump_points.append(core.cell_id(j))
+        return jump_points
+
+    def expand(self):
+        while len(self.heap) > 0 and self.heap[0][1] in self.settled:  # outdated entries (lazy deletion)
+            heapq.heappop(self.heap)
+        if len(self.heap) > 0:
+            _, curr_node = heapq.heappop(self.heap)
+            self.settled.add(curr_node)
+            self.stats.expanded += 1
+            observer = self.observer
+
+            self.finish_previous_node()
+
+            if observer is not None:
+                observer.inspected_from(curr_node, self.prev[curr_node])
+
+            if curr_node == self.end_node:
+                self.cost = self.dist[curr_node]
                 self.reconstruct_path()
                 self.finished = True
                 return
-            for neighbour in curr_node.get_neighbours():
-                if not neighbour.already_visited():
-                    self.stack.append(neighbour)
-                    neighbour.enqueued_from(curr_node)
-                    self.prev[neighbour] = curr_node
+            dist, prev = self.dist, self.prev
+            for jump_point in self.successors(curr_node):
+                self.stats.relaxed += 1
+                if jump_point in self.settled:
+                    continue
+                new_dist = dist[curr_node] + self.octile(curr_node, jump_point)
+                if new_dist < dist.get(jump_point, math.inf):
+                    if observer is not None and jump_point in prev:
+                        observer.reset_connection(jump_point, prev[jump_point])
+                    dist[jump_point] = new_dist
+                    prev[jump_point] = curr_node
+                    heapq.heappush(self.heap, (new_dist + self.heuristic(jump_point), jump_point))
+                    if observer is not None:
+                        observer.enqueued_from(jump_point, curr_node)
             self.previous_node = curr_node
         else:
-            self.finished = True
-            print("\nSTART AND END NODE ARE NOT CONNECTED --> NO PATH CAN BE FOUND")
+            self.not_connected()
 
+    # the path over the jump points is filled up with the cells between them
     def reconstruct_path(self):
-        path = []
+        jump_points = []
         curr_node = self.end_node
-        while curr_node is not None:
-            path.append(curr_node)
+        while curr_node != -1:
+            jump_points.append(curr_node)
             curr_node = self.prev[curr_node]
-        path.reverse()
-        self.graph.highlight_final_path(path)
-        print("PATH FOUND AND HIGHLIGHTED")
\ No newline at end of file
+        jump_points.reverse()
+        width = self.core.width
+        path = jump_points[:1]
+        for node in jump_points[1:]:
+            dx = (node % width > path[-1] % width) - (node % width < path[-1] % width)
+            dy = (node // width > path[-1] // width) - (node // width < path[-1] // width)
+            while path[-1] != node:
+                path.append(path[-1] + dx + dy * width)
+        self.path = path
+        if self.observer is not None:
+            self.observer.highlight_final_path(path)
+        if self.verbose:
+            print("PATH FOUND AND HIGHLIGHTED")
+            print(f"PATH LENGTH: {self.cost:.1f}")
@@ -1,144 +1,557 @@
+import argparse
+import math
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # importing pygame prints nothing
 import pygame
 import sys
+import time
+from BackgroundSearch import BackgroundSearch
+from Camera import Camera
 from ColorCollection import Colors
-from Graph import NetworkGraph
-from Pathfinding import BreadthFirst, DepthFirst
+from Graph import NODE_RADIUS, ConnectMode, NetworkGraph
+from GraphIO import save_graph, load_graph
+from Landmarks import landmark_path, load_landmarks, save_landmarks
+from Renderer import GraphRenderer, GridRenderer
+from Pathfinding import BreadthFirst, DepthFirst, Dijkstra, AStar, BidirectionalBreadthFirst, BidirectionalDijkstra, LPAStar, ALTStar, JumpPointSearch, TracePlayer
 
-########################################################################################################################
-# create the application window
-########################################################################################################################
-pygame.init()
-WIDTH = 800
-HEIGHT = 800
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Pathfinding Visualization")
-# icon from: https://www.iconfinder.com/icons/1891030/blue_direction_gps_location_map_marker_navigation_icon
-pygame.display.set_icon(pygame.image.load("icon.png"))
+# start: python -m PathfindingVisualizer [graph file] [--size WIDTH HEIGHT] [--grid] [--headless] [--frames N] [--quiet]
+# (or python PathfindingVisualizer.py ...). Importing the module opens no window and prints nothing, see main
 
 ########################################################################################################################
 # initialize components, variables, functions
 ########################################################################################################################
-clock = pygame.time.Clock()
-time_elapsed = 0
+WIDTH = 800  # default size of the window
+HEIGHT = 800
+# icon from: https://www.iconfinder.com/icons/1891030/blue_direction_gps_location_map_marker_navigation_icon
+ICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.png")
+MAX_FPS = 60  # frame rate cap; the loop sleeps for the rest of a frame, so an idle application uses (almost) no CPU
+STEP_RATES = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, math.inf)  # selectable algorithm steps per second
+MAX_STEP_BACKLOG = 5000  # steps that may pile up when frames take longer than expected
+UNBOUNDED_STEP_TIME = 0.5 / MAX_FPS  # seconds per frame that are spent on steps at unbounded speed
+GRAPH_FILE = "graph.pfvg"  # file the graph is saved to/ loaded from
+GRID_CELL_SIZE = 10  # size of a cell in the grid mode (in pixels) --> the grid fills the window
+grid_size = None  # (width, height) of the grid in cells; None --> as many cells of GRID_CELL_SIZE as fit the window
+MAZE_LOOPS = 0.05  # fraction of the inner walls of a maze that is removed (the maze gets alternative paths)
+WALL_DENSITY = 0.3  # probability that a cell is blocked in a grid with random walls
+ZOOM_STEP = 1.25  # zoom factor per step of the mouse wheel
+PAN_STEP = 100  # pixels the view moves per press of an arrow key
+PAN_KEYS = {pygame.K_LEFT: (1, 0), pygame.K_RIGHT: (-1, 0), pygame.K_UP: (0, 1), pygame.K_DOWN: (0, -1)}
+screen = None  # surface of the application window (created by open_window)
+clock = None
+step_rate_index = 1  # index into STEP_RATES --> 2 steps per second (one step every 500 milliseconds)
+step_backlog = 0  # steps that are due but were not performed yet (fractional)
 network_graph = NetworkGraph()
+camera = Camera()  # part of the graph that is shown (pan with right mouse button/ arrow keys, zoom with mouse wheel)
+renderer = GraphRenderer(network_graph, camera)  # redraws only the parts of the graph that changed
+panning = False  # True while the view is dragged with the right mouse button
 algorithm = None
-screen.fill(Colors.WHITE)  # make background white initially
+algorithm_name = None  # name of the algorithm that is shown
+grid_view = None  # GridView of the grid mode (None --> the network graph is shown)
+painting = None  # grid mode: True/False while walls are painted/ erased with the mouse, None otherwise
+paint_pos = None  # grid mode: mouse position at which the last wall was painted
+show_metrics = False  # show the metrics of the algorithm in an overlay (memory is traced meanwhile)
+background = False  # True --> algorithms run in a worker thread, the window only shows their progress
 
 
-########################################################################################################################
-# Print information to console
-########################################################################################################################
-print("\n\nThis is a pathfinding visualization. Two algorithms were implemented to find a path from a specified start to an end node.")
-print("The visualization consists of nodes and connections between them, all of which can be manually added/ deleted.")
-print("Here's a brief introduction on how to use this tool:")
-print("     1. Create Nodes (left clicking with mouse)")
-print("     2. Select Nodes (click on existing node) and connect ('c') them --> be aware, that all selected nodes are connected with each other!")
-print("     3. If needed, remove nodes (put mouse cursor on node and press 'r') or disconnect them (select nodes and press 'd')")
-print("     4. Choose a start node (put mouse on node and press 's') and a target/end node (put mouse on node and press 'e')")
-print("     5. Run pathfinding algorithm visualization ('1' for BreadthFirstSearch, '2' for DepthFirstSearch) --> be aware that to you need to specify a start and end node to start the pathfinding (However, they do not need to be connected)")
-print("     6. Reset the pathfinding algorithm progress ('SPACE')")
-
-print("Now you should have a general clue of what to do. Below you find further information...")
-print("Below you find an summary of controls, as well as an explanation for what the different colors stand for...")
-########################################################################################################################
-# Print controls to console
-########################################################################################################################
-print("\n#############################  CONTROLS  #############################")
-print("'mouse_left_click'               --> create OR select node")
-print("'mouse_cursor_on_node'  +  's'   --> mark node as start node --> start node has one ring around it")
-print("'mouse_cursor_on_node'  +  'e'   --> mark node as end node --> end node has two rings around it")
-print("'mouse_cursor_on_node'  +  'r'   --> remove node")
-print("'c'                              --> connect all selected nodes (to select a node, click on it)")
-print("'d'                              --> disconnect all selected nodes (to select a node, click on it)")
-print("'1'                              --> start bread-first algorithm")
-print("'2'                              --> start depth-first algorithm")
-print("'SPACE'                          --> reset the pathfinding algorithm progress")
+# create the application window; headless --> SDL's dummy video driver, nothing is shown (e.g. on a server or in
+# automated runs, same as setting SDL_VIDEODRIVER=dummy). Only the display is initialized, fonts are loaded when
+# a label is drawn for the first time
+def open_window(width=WIDTH, height=HEIGHT, headless=False):
+    global screen, clock
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.display.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("Pathfinding Visualization")
+    pygame.display.set_icon(pygame.image.load(ICON_FILE))
+    clock = pygame.time.Clock()
+    screen.fill(Colors.WHITE)  # make background white initially
+
+
+# print the introduction, the controls and the meaning of the colors to the console
+def print_introduction():
+    # Print information to console
+    print("\n\nThis is a pathfinding visualization. Nine algorithms were implemented to find a path from a specified start to an end node.")
+    print("The visualization consists of nodes and connections between them, all of which can be manually added/ deleted.")
+    print("Here's a brief introduction on how to use this tool:")
+    print("     1. Create Nodes (left clicking with mouse)")
+    print("     2. Select Nodes (click on existing node) and connect ('c') them --> be aware, that all selected nodes are connected with each other!")
+    print("     3. If needed, remove nodes (put mouse cursor on node and press 'r') or disconnect them (select nodes and press 'd')")
+    print("     4. Choose a start node (put mouse on node and press 's') and a target/end node (put mouse on node and press 'e')")
+    print("     5. Run pathfinding algorithm visualization ('1' for BreadthFirstSearch, '2' for DepthFirstSearch, '3' for Dijkstra, '4' for A*, '5'/'6' for bidirectional BreadthFirst/Dijkstra, '7' for LPA*, '8' for ALT) --> be aware that to you need to specify a start and end node to start the pathfinding (However, they do not need to be connected)")
+    print("     6. Reset the pathfinding algorithm progress ('SPACE')")
+
+    print("     7. Switch to the grid mode ('g'), paint walls with the mouse or create a maze ('m') and search a path through it ('9' for Jump Point Search)")
+
+    print("Now you should have a general clue of what to do. Below you find further information...")
+    print("Below you find an summary of controls, as well as an explanation for what the different colors stand for...")
+    # Print controls to console
+    print("\n#############################  CONTROLS  #############################")
+    print("'mouse_left_click'               --> create OR select node")
+    print("'mouse_right_drag' / arrow keys  --> move the view")
+    print("'mouse_wheel'                    --> zoom in/ out (labels, nodes and connections are drawn simpler when zoomed out)")
+    print("'f'                              --> fit the whole graph into the window")
+    print("'mouse_cursor_on_node'  +  's'   --> mark node as start node --> start node has one ring around it")
+    print("'mouse_cursor_on_node'  +  'e'   --> mark node as end node --> end node has two rings around it")
+    print("'mouse_cursor_on_node'  +  'r'   --> remove node")
+    print("'c'                              --> connect all selected nodes (to select a node, click on it)")
+    print("'k'                              --> connect every selected node with its 3 nearest selected nodes (all nodes if none is selected)")
+    print("'t'                              --> connect the selected nodes by a triangulation without crossings (all nodes if none is selected)")
+    print("'w'                              --> connect all selected nodes that are close to each other (all nodes if none is selected)")
+    print("'d'                              --> disconnect all selected nodes (to select a node, click on it)")
+    print("'1'                              --> start bread-first algorithm")
+    print("'2'                              --> start depth-first algorithm")
+    print("'3'                              --> start dijkstra algorithm")
+    print("'4'                              --> start A* algorithm")
+    print("'5'                              --> start bidirectional bread-first algorithm")
+    print("'6'                              --> start bidirectional dijkstra algorithm")
+    print("'7'                              --> start LPA* (incremental A*) --> afterwards, edits of the graph update the path right away")
+    print("'8'                              --> start ALT (A* with landmark distances, prepared once until the graph is edited)")
+    print("'SHIFT' + '1' - '8'              --> run the algorithm to completion, then replay its progress")
+    print("'+' / '-'                        --> make the algorithm visualization faster/ slower (1 step per second up to unbounded)")
+    print("'mouse_cursor_on_node'  +  'h'   --> color all nodes by their distance from the node, yellow (close) to red (far) (start node if no node is under the cursor)")
+    print("'b'                              --> switch background mode on/ off (algorithms run in a separate thread, the window never freezes)")
+    print("'i'                              --> show/ hide the metrics of the algorithm (nodes expanded, time spent searching vs. coloring, ...)")
+    print("'SPACE'                          --> reset the pathfinding algorithm progress (and the distance colors), cancels a background search")
+    print("'CTRL' + 's' / 'CTRL' + 'l'      --> save the graph to/ load the graph from 'graph.pfvg'")
+    print("'g'                              --> switch between graph and grid mode (needs numpy)")
+    print("grid mode: 'mouse_left_drag'     --> paint walls (erase them if the drag starts on a wall)")
+    print("grid mode: 's' / 'e'             --> mark the cell under the mouse cursor as start/ end cell")
+    print("grid mode: 'm' / 'n' / 'x'       --> create a maze/ random walls/ remove all walls")
+    print("grid mode: '1' - '7', '9'        --> start an algorithm ('9' --> jump point search, A* that skips open areas)")
+
+    # Print the meaning of colors to console
+    print("\n#############################  COLORS  #############################")
+    print("The color of a node or a connection represents its current state. Below a list of possible colors and their meanings...")
+    print("BLACK        --> Default node state")
+    print("BLUE         --> Node is currently selected and can be connected ('c') or disconnected ('d') with other selected nodes. Note that a node does not have to be selected to delete it/ mark it as start or end point")
+    print("Lime/Green   --> The lime colored node is the one that is currently looked at from the pathfinding algorithm")
+    print("GREY         --> grey nodes/ paths mean that they are currently on the 'waiting list', waiting to be be visited by the algorithm (but have not been visited yet)")
+    print("PURPLE       --> Nodes that were already visited by the pathfinding algorithm")
+    print("SKYBLUE      --> bidirectional search: nodes/ paths on the 'waiting list' of the search from the end node")
+    print("ORANGE       --> bidirectional search: nodes that were already visited by the search from the end node")
+    print("PINK         --> After a pathfinding algorithm was successfull, the path from start to end node is colored pink")
+    print("grid mode: BLACK cells are walls, the start cell is TURQUOISE and the end cell RED")
+
+
+# algorithms that can be started with the number keys and the message that is shown when starting them
+ALGORITHMS = {
+    pygame.K_1: (BreadthFirst, "Started BreadFirst Algorithm. This returns the shortest path in an unweighted graph."),
+    pygame.K_2: (DepthFirst, "Started DepthFirst Algorithm. This does NOT return the shortest path (tree structure excepted)."),
+    pygame.K_3: (Dijkstra, "Started Dijkstra Algorithm. This returns the shortest path in a weighted graph (weight = length of connection)."),
+    pygame.K_4: (AStar, "Started A* Algorithm. This returns the shortest path as well, but looks at nodes in direction of the end node first."),
+    pygame.K_5: (BidirectionalBreadthFirst, "Started bidirectional BreadthFirst Algorithm. This searches from start and end node until both searches meet."),
+    pygame.K_6: (BidirectionalDijkstra, "Started bidirectional Dijkstra Algorithm. This searches from start and end node until both searches meet."),
+    pygame.K_7: (LPAStar, "Started LPA* (incremental A*). After it finished, the path is repaired right away whenever the graph is edited."),
+    pygame.K_8: (ALTStar, "Started ALT Algorithm. This is A* with lower bounds from the distances to a few landmark nodes (computed once until the graph is edited)."),
+}
+# algorithms of the grid mode (ALT needs a graph, jump point search a grid)
+GRID_ALGORITHMS = {key: value for key, value in ALGORITHMS.items() if key != pygame.K_8}
+GRID_ALGORITHMS[pygame.K_9] = (JumpPointSearch, "Started Jump Point Search. This is A* for grids that skips over open areas and only looks at cells where the path may turn.")
+
+
+# start the algorithm that belongs to key; in batch mode it is run to completion first and its trace is replayed
+def start_algorithm(key, batch=False):
+    global algorithm, algorithm_name
+    stop_algorithm()
+    view = grid_view if grid_view is not None else network_graph
+    if view.get_start_node() is None or view.get_end_node() is None:
+        print("You have to specify start and end node to start the algorithm!")
+        return
+    algorithm_class, message = (GRID_ALGORITHMS if grid_view is not None else ALGORITHMS)[key]
+    print(message)
+    algorithm_name = algorithm_class.__name__
+    if background:  # search runs in a worker thread, its progress is shown as it comes in
+        algorithm = BackgroundSearch(view, algorithm_class, view.get_start_node(), view.get_end_node())
+        algorithm_name = f"{algorithm_class.__name__} (background)"
+        return
+    algorithm = algorithm_class(view, view.get_start_node(), view.get_end_node())
+    if batch:
+        result = algorithm.run()
+        if result.path is None:
+            print("START AND END NODE ARE NOT CONNECTED --> NO PATH CAN BE FOUND")
+        else:
+            print(f"PATH FOUND (LENGTH {result.cost:.1f}, {len(result.trace)} EVENTS) --> replaying the search")
+        algorithm = TracePlayer(view, result.trace, result.stats)
+        algorithm_name = f"{algorithm_class.__name__} (replay)"
+
+
+# switch the background mode on/ off (applies to the algorithms started afterwards)
+def toggle_background():
+    global background
+    background = not background
+    print("Background mode on: algorithms run in a separate thread" if background else "Background mode off")
+
+
+# switch the metrics overlay on/ off; memory allocations are only traced while it is shown (slows down the search)
+def toggle_metrics():
+    global show_metrics
+    import tracemalloc  # imported on first use, the import is slow
+    show_metrics = not show_metrics
+    if show_metrics:
+        tracemalloc.start()
+    else:
+        tracemalloc.stop()
+
+
+# text of the metrics overlay for the current algorithm
+def metrics_lines():
+    if algorithm is None:
+        return ["No algorithm running"]
+    stats = algorithm.stats
+    phases = stats.phases
+    memory = "-" if stats.peak_memory is None else f"{stats.peak_memory / 1024:.1f} KB"
+    share = phases["visualization"] / stats.total_time() * 100 if stats.total_time() > 0 else 0
+    lines = [
+        f"{algorithm_name} ({'finished' if algorithm.has_finished() else 'running'})",
+        f"steps {stats.steps}   expanded {stats.expanded}   relaxed {stats.relaxed}",
+        f"max frontier {stats.max_frontier}   peak memory {memory}",
+        f"search {phases['search'] * 1e3:.1f} ms   visualization {phases['visualization'] * 1e3:.1f} ms ({share:.0f} %)",
+    ]
+    if phases["preprocessing"] > 0:
+        lines.append(f"preprocessing {phases['preprocessing'] * 1e3:.1f} ms")
+    return lines
+
+
+# keys for connecting the selected nodes and how they are connected
+CONNECT_MODES = {
+    pygame.K_c: ConnectMode.CLIQUE,
+    pygame.K_k: ConnectMode.NEAREST,
+    pygame.K_t: ConnectMode.DELAUNAY,
+    pygame.K_w: ConnectMode.RADIUS,
+}
+
+
+# stop the current algorithm (an incremental search no longer follows the edits of the graph,
+# a background search is cancelled)
+def stop_algorithm():
+    global algorithm
+    if isinstance(algorithm, LPAStar):
+        algorithm.detach()
+    if isinstance(algorithm, BackgroundSearch):
+        algorithm.cancel()
+    algorithm = None
+
+
+# a background search reads the graph while it runs --> it is cancelled before the graph is edited
+# (what it found so far is still shown)
+def before_edit():
+    if isinstance(algorithm, BackgroundSearch) and algorithm.is_running():
+        algorithm.cancel()
+        print("Background search cancelled, the graph was edited")
+
+
+# color all nodes by their distance from node (heat map)
+def show_distances(node):
+    if node is None:
+        print("Put the mouse cursor on a node (or specify a start node) to show the distances from it!")
+        return
+    network_graph.clear_heat_map()
+    reached, farthest = network_graph.show_distances(node)
+    print(f"Distances from node {node}: {reached} nodes reachable, farthest one is {farthest:.1f} away")
+
+
+# show another graph (instead of the current one) as a whole
+def set_graph(graph):
+    global network_graph, renderer
+    stop_algorithm()
+    network_graph = graph
+    fit_camera()
+    renderer = GraphRenderer(network_graph, camera)
+
+
+# open a graph file: a saved graph (.pfvg, with its landmarks if they were saved) or a graph file in one of the
+# formats of GraphImport (.gr, .csv, .osm)
+def open_graph(path):
+    if path.endswith(".pfvg"):
+        graph = load_graph(path)
+        load_landmarks(graph, landmark_path(path))
+    else:
+        from GraphImport import import_graph  # imported here, only needed for graph files of other formats
+        graph = NetworkGraph(import_graph(path, width=screen.get_width(), height=screen.get_height()))
+    set_graph(graph)
+    print(f"Graph loaded from '{path}' ({network_graph.get_node_count()} nodes)")
+
+
+# save the graph to GRAPH_FILE (save=True) or replace the graph with the one stored in GRAPH_FILE (save=False)
+def save_or_load(save):
+    if save:
+        before_edit()  # saving compacts the adjacency arrays, which a background search may be reading
+        save_graph(network_graph, GRAPH_FILE)
+        landmarks = network_graph.core.cache.get("landmarks")
+        if landmarks is not None:  # landmarks of ALT were prepared --> store them next to the graph
+            save_landmarks(landmarks, landmark_path(GRAPH_FILE))
+        elif os.path.exists(landmark_path(GRAPH_FILE)):  # landmarks of the graph that was saved there before
+            os.remove(landmark_path(GRAPH_FILE))
+        print(f"Graph saved to '{GRAPH_FILE}'")
+    elif not os.path.exists(GRAPH_FILE):
+        print(f"There is no saved graph ('{GRAPH_FILE}') that could be loaded...")
+    else:
+        open_graph(GRAPH_FILE)
+
+
+# switch between the graph and the grid mode; the graph is kept while the grid is shown and vice versa
+def toggle_grid_mode():
+    global grid_view, renderer
+    stop_algorithm()
+    if grid_view is not None:
+        grid_view = None
+        renderer = GraphRenderer(network_graph, camera)
+        print("Graph mode")
+        return
+    try:
+        from GridMap import GridMap, GridView
+    except ImportError:
+        print("The grid mode needs numpy (python3 -m pip install numpy)")
+        return
+    if grid_size is None:
+        grid_view = GridView(GridMap(screen.get_width() // GRID_CELL_SIZE, screen.get_height() // GRID_CELL_SIZE),
+                             GRID_CELL_SIZE)
+    else:  # the cells shrink (to fractions of a pixel) until the whole grid fits into the window
+        width, height = grid_size
+        grid_view = GridView(GridMap(width, height),
+                             min(GRID_CELL_SIZE, screen.get_width() / width, screen.get_height() / height))
+    renderer = GridRenderer(grid_view)
+    print(f"Grid mode ({grid_view.core.width} x {grid_view.core.height} cells)")
+
+
+# replace the grid of the grid mode by a new one (key 'm' --> maze, 'n' --> random walls, 'x' --> no walls)
+def new_grid(key):
+    from GridMap import maze_grid, open_grid, random_grid
+    stop_algorithm()
+    width, height = grid_view.core.width, grid_view.core.height
+    if key == pygame.K_m:
+        grid_view.set_core(maze_grid(width, height, loops=MAZE_LOOPS))
+    elif key == pygame.K_n:
+        grid_view.set_core(random_grid(width, height, density=WALL_DENSITY))
+    else:
+        grid_view.set_core(open_grid(width, height))
+
+
+# paint walls (or erase them) on the cells between the previous and the current mouse position
+def paint(pos):
+    global paint_pos
+    before_edit()
+    grid_view.paint_walls(grid_view.cells_on_line(paint_pos, pos), painting)
+    paint_pos = pos
+
+
+# method for handling user input in the grid mode
+def handle_grid_input():
+    global painting, paint_pos
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            sys.exit()  # end application
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            cell = grid_view.cell_at_pos(event.pos)
+            if cell != -1:
+                painting = grid_view.core.has_node(cell)  # drag starts on a free cell --> paint, else erase walls
+                paint_pos = event.pos
+                paint(event.pos)
+        if event.type == pygame.MOUSEMOTION and painting is not None:
+            paint(event.pos)
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            painting = None
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_s, pygame.K_e):  # 's'/'e' --> mark start/ end cell
+                cell = grid_view.cell_at_pos(pygame.mouse.get_pos())
+                marked = grid_view.set_start_node(cell) if event.key == pygame.K_s else grid_view.set_end_node(cell)
+                if not marked:
+                    print("Start and end cell have to be free cells!")
+            elif event.key in (pygame.K_m, pygame.K_n, pygame.K_x):  # 'm'/'n'/'x' --> maze/ random walls/ no walls
+                new_grid(event.key)
+            elif event.key == pygame.K_g:  # 'g' --> back to the graph mode
+                toggle_grid_mode()
+            elif event.key == pygame.K_i:
+                toggle_metrics()
+            elif event.key == pygame.K_b:
+                toggle_background()
+            elif event.key in GRID_ALGORITHMS:  # '1' - '7', '9' --> start algorithm (+ 'SHIFT' --> run to completion first)
+                start_algorithm(event.key, event.mod & pygame.KMOD_SHIFT)
+            elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                change_step_rate(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                change_step_rate(-1)
+            elif event.key == pygame.K_SPACE:  # 'SPACE' --> reset grid
+                stop_algorithm()
+                grid_view.reset_states()
+
+
+# show all nodes of the graph (with some space around them) in the window;
+# a graph that fits into the window as it was created is shown without zoom
+def fit_camera():
+    core = network_graph.core
+    nodes = list(core.node_ids())
+    if not nodes:
+        return
+    x0, x1 = min(core.xs[u] for u in nodes), max(core.xs[u] for u in nodes)
+    y0, y1 = min(core.ys[u] for u in nodes), max(core.ys[u] for u in nodes)
+    width, height = screen.get_size()
+    if x0 >= 0 and y0 >= 0 and x1 <= width and y1 <= height:
+        camera.x, camera.y, camera.zoom = 0.0, 0.0, 1.0
+    else:
+        camera.fit(x0, y0, x1, y1, (width, height), 2 * NODE_RADIUS)
 
-########################################################################################################################
-# Print the meaning of colors to console
-########################################################################################################################
-print("\n#############################  COLORS  #############################")
-print("The color of a node or a connection represents its current state. Below a list of possible colors and their meanings...")
-print("BLACK        --> Default node state")
-print("BLUE         --> Node is currently selected and can be connected ('c') or disconnected ('d') with other selected nodes. Note that a node does not have to be selected to delete it/ mark it as start or end point")
-print("Lime/Green   --> The lime colored node is the one that is currently looked at from the pathfinding algorithm")
-print("GREY         --> grey nodes/ paths mean that they are currently on the 'waiting list', waiting to be be visited by the algorithm (but have not been visited yet)")
-print("PURPLE       --> Nodes that were already visited by the pathfinding algorithm")
-print("PINK         --> After a pathfinding algorithm was successfull, the path from start to end node is colored pink")
 
 # method for handling user input
 def handle_input():
-    global algorithm, network_graph
-    focused_node = network_graph.get_focused_node(pygame.mouse.get_pos())  # get the node that is currently focused
-    if focused_node is not None:
-        focused_node.hover()
+    global algorithm, network_graph, panning
+    if grid_view is not None:
+        handle_grid_input()
+        return
+    mouse_pos = camera.to_world(pygame.mouse.get_pos())  # position in the graph (nodes are stored in world coordinates)
+    focused_node = network_graph.get_focused_node(mouse_pos)  # get the node that is currently focused
+    network_graph.set_hovered(focused_node.id if focused_node is not None else -1)
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             sys.exit()  # end application
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if focused_node is not None:  # mouse is placed on a node
                 focused_node.click()
-            elif network_graph.has_node_near_pos(pygame.mouse.get_pos()):  # mouse is placed close to another node
+            elif network_graph.has_node_near_pos(mouse_pos):  # mouse is placed close to another node
                 print("Nodes too close to another node!")
             else:  # mouse in free space --> node can be created
-                network_graph.add_node(pygame.mouse.get_pos())
+                before_edit()
+                network_graph.add_node(mouse_pos)
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:  # right mouse button --> drag the view
+            panning = True
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+            panning = False
+        if event.type == pygame.MOUSEMOTION and panning:
+            camera.pan(*event.rel)
+        if event.type == pygame.MOUSEWHEEL:  # zoom in/ out at the mouse cursor
+            camera.zoom_at(pygame.mouse.get_pos(), ZOOM_STEP ** event.y)
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_s:  # 's' --> mark start node
+            if event.mod & pygame.KMOD_CTRL and event.key in (pygame.K_s, pygame.K_l):  # 'CTRL' + 's'/'l' --> save/load
+                save_or_load(event.key == pygame.K_s)
+            elif event.key == pygame.K_s:  # 's' --> mark start node
                 if focused_node is not None:
                     network_graph.set_start_node(focused_node)
             elif event.key == pygame.K_e:  # 'e' --> mark end node
                 if focused_node is not None:
                     network_graph.set_end_node(focused_node)
-            elif event.key == pygame.K_c:  # 'c' --> connect selected nodes
-                network_graph.connect_selected_nodes()
+            elif event.key in CONNECT_MODES:  # 'c'/'k'/'t'/'w' --> connect selected nodes
+                before_edit()
+                added = network_graph.connect_selected_nodes(CONNECT_MODES[event.key])
+                print(f"{added} connections added")
             elif event.key == pygame.K_d:   # 'd' --> disconnect selected nodes
-                network_graph.disconnect_selected_nodes()
+                before_edit()
+                removed = network_graph.disconnect_selected_nodes()
+                print(f"{removed} connections removed")
+            elif event.key in PAN_KEYS:  # arrow keys --> move the view
+                camera.pan(PAN_KEYS[event.key][0] * PAN_STEP, PAN_KEYS[event.key][1] * PAN_STEP)
+            elif event.key == pygame.K_f:   # 'f' --> show the whole graph
+                fit_camera()
+            elif event.key == pygame.K_g:   # 'g' --> switch to the grid mode
+                toggle_grid_mode()
+            elif event.key == pygame.K_i:   # 'i' --> show/ hide metrics of the algorithm
+                toggle_metrics()
+            elif event.key == pygame.K_b:   # 'b' --> background mode on/ off
+                toggle_background()
+            elif event.key == pygame.K_h:   # 'h' --> heat map of the distances from focused node (or start node)
+                show_distances(focused_node if focused_node is not None else network_graph.get_start_node())
             elif event.key == pygame.K_r:   # 'r' --> remove node
                 if focused_node is not None:
+                    before_edit()
                     network_graph.remove_node(focused_node)
-            elif event.key == pygame.K_1:   # '1' --> start bfs
-                if network_graph.get_start_node() is None or network_graph.get_end_node() is None:
-                    print("You have to specify start and end node to start the algorithm!")
-                else:
-                    print("Started BreadFirst Algorithm. This returns the shortest path in an unweighted graph.")
-                    algorithm = BreadthFirst(network_graph, network_graph.get_start_node(), network_graph.get_end_node())
-            elif event.key == pygame.K_2:
-                if network_graph.get_start_node() is None or network_graph.get_end_node() is None:
-                    print("You have to specify start and end node to start the algorithm!")
-                else:
-                    algorithm = DepthFirst(network_graph, network_graph.get_start_node(), network_graph.get_end_node())
-                    print("Started DepthFirst Algorithm. This does NOT return the shortest path (tree structure excepted).")
+            elif event.key in ALGORITHMS:   # '1' - '8' --> start algorithm (+ 'SHIFT' --> run to completion first)
+                start_algorithm(event.key, event.mod & pygame.KMOD_SHIFT)
+            elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):  # '+' --> faster
+                change_step_rate(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):  # '-' --> slower
+                change_step_rate(-1)
             elif event.key == pygame.K_SPACE: # 'SPACE' --> reset graph
-                algorithm = None
+                stop_algorithm()
                 network_graph.reset_states()
+                network_graph.clear_heat_map()
+
 
+# change the number of algorithm steps per second (direction = 1 --> faster, -1 --> slower)
+def change_step_rate(direction):
+    global step_rate_index
+    step_rate_index = min(max(step_rate_index + direction, 0), len(STEP_RATES) - 1)
+    rate = STEP_RATES[step_rate_index]
+    print("Speed: unbounded" if rate == math.inf else f"Speed: {rate} steps per second")
 
-# method for updating the algorithm state
-def update():
-    global time_elapsed, algorithm, clock
-    if algorithm is not None:
-        time_elapsed += clock.tick()
-        if time_elapsed > 500:  # perform step every 500 milliseconds
-            if not algorithm.has_finished():
-                algorithm.step()
-                time_elapsed = 0
+
+# method for updating the algorithm state; dt = milliseconds since the last frame.
+# The simulation runs at its own rate, independent of the frame rate (several steps per frame if necessary)
+def update(dt):
+    global step_backlog
+    if algorithm is None or algorithm.has_finished():
+        step_backlog = 0
+        return
+    rate = STEP_RATES[step_rate_index]
+    if rate == math.inf:  # unbounded --> perform as many steps as fit into the frame
+        deadline = time.perf_counter() + UNBOUNDED_STEP_TIME
+        while can_step() and time.perf_counter() < deadline:
+            algorithm.step()
+        return
+    step_backlog = min(step_backlog + dt / 1000 * rate, MAX_STEP_BACKLOG)
+    while step_backlog >= 1 and can_step():
+        algorithm.step()
+        step_backlog -= 1
+
+
+# True if the algorithm has a step to show now (a background search may not have computed the next one yet)
+def can_step():
+    if isinstance(algorithm, BackgroundSearch) and algorithm.waiting():
+        return False
+    return not algorithm.has_finished()
 
 
 # method for display the updates on canvas
 def draw():
-    global network_graph
-    # override canvas
-    screen.fill(Colors.WHITE)
-    # draw everything on white canvas
-    network_graph.draw(screen)
-    # make the updates visible
-    pygame.display.update()
+    # redraw the regions of the canvas that changed since the last frame
+    rects = renderer.draw(screen)
+    rects += renderer.draw_overlay(screen, metrics_lines() if show_metrics else None, rects)
+    # make the updates visible (nothing to do if the graph did not change)
+    if rects:
+        pygame.display.update(rects)
 
 
 ########################################################################################################################
 # "Game" loop
 ########################################################################################################################
-while True:
-    handle_input()
-    update()
-    draw()
+# run the application until the window is closed (or for the given number of frames)
+def run(frames=None):
+    frame = 0
+    while frames is None or frame < frames:
+        dt = clock.tick(MAX_FPS)  # wait for the next frame
+        handle_input()
+        update(dt)
+        draw()
+        frame += 1
+
+
+def main(argv=None):
+    global grid_size
+    parser = argparse.ArgumentParser(description="Pathfinding visualization")
+    parser.add_argument("graph", nargs="?", help="graph to show: saved graph (.pfvg) or graph file (.gr, .csv, .osm)")
+    parser.add_argument("--size", type=int, nargs=2, default=(WIDTH, HEIGHT), metavar=("WIDTH", "HEIGHT"),
+                        help="size of the window")
+    parser.add_argument("--grid", action="store_true", help="start in grid mode")
+    parser.add_argument("--grid-size", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"),
+                        help="number of cells of the grid mode (default: as many as fit into the window)")
+    parser.add_argument("--headless", action="store_true", help="no window (SDL dummy video driver)")
+    parser.add_argument("--frames", type=int, help="quit after this many frames")
+    parser.add_argument("--quiet", action="store_true", help="do not print the introduction")
+    args = parser.parse_args(argv)
+    if args.grid_size is not None and min(args.grid_size) < 1:
+        parser.error("the grid needs at least one cell in each direction")
+    grid_size = args.grid_size
+    open_window(*args.size, headless=args.headless)
+    if not args.quiet:
+        print_introduction()
+    if args.graph is not None:
+        try:
+            open_graph(args.graph)
+        except (OSError, ValueError) as error:  # missing file, unknown format, ...
+            parser.error(f"cannot open '{args.graph}': {error}")
+    if args.grid:
+        toggle_grid_mode()
+    run(args.frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import math
+import pygame
+from Camera import Camera
+from ColorCollection import Colors
+from Graph import EDGE_WIDTH, LABEL_MIN_RADIUS, NODE_RADIUS, STATE_COLORS, State, Type, draw_node, get_font
+
+SPRITE_HALF_SIZE = NODE_RADIUS + 12  # half size of a node sprite at zoom 1 (node incl. both rings of end nodes)
+MAX_SPRITES = 4096  # sprite cache is cleared when it grows larger than this
+MAX_DIRTY_RECTS = 256  # more dirty regions than this --> redraw the whole screen instead
+OVERLAY_FONT_SIZE = 20  # font size of the text overlay
+OVERLAY_PADDING = 6  # space between the border of the text overlay and its text
+# level of detail: the further the camera zooms out, the less is drawn per node/connection
+# (labels are left out as soon as they do not fit into the nodes anymore, see render_label)
+PIXEL_NODE_RADIUS = 2  # nodes that would be smaller than this (radius on screen) are drawn as a few pixels ...
+PIXEL_NODE_SIZE = 2  # ... namely a square of this size
+MARKER_RADIUS = 5  # start and end node are never drawn smaller than this (radius on screen), so they can be found
+AGGREGATE_CELL_SIZE = 3  # with pixel nodes, nodes and connections are merged into cells of at most this size on screen
+LOD_TILE_CELLS = 64  # merged cells are cached in tiles of this many cells per side (built when a tile becomes visible)
+MAX_LOD_TILES = 1024  # tile cache is cleared when it grows larger than this
+
+
+# retained-mode renderer for a NetworkGraph seen through a camera: the visible connections are drawn once onto a
+# cached background surface, nodes are blitted from cached sprites and only the regions that changed since the last
+# frame are redrawn. Nodes and connections are looked up in the spatial indexes of the graph, so the time for drawing
+# depends on what is visible, not on the size of the graph. The background is redrawn when the camera moves.
+# Zoomed out (pixel nodes), nodes and connections are merged into cells of a power of two world units, so that a cell
+# is 1.5 - 3 pixels on screen; the merged cells are cached in tiles per cell size, so moving or zooming the camera
+# back and forth only redraws the merged cells instead of every visible node and connection
+class GraphRenderer:
+    def __init__(self, graph, camera=None):
+        self.graph = graph
+        self.camera = camera if camera is not None else Camera()  # camera through which the graph is seen
+        self.background = None  # white surface with the visible connections in default color
+        self.background_version = None  # graph_version the background was drawn for
+        self.camera_state = None  # state of the camera the background was drawn for
+        self.zoom = None  # zoom factor the sprites and the level of detail were chosen for
+        self.pixel_nodes = False  # True --> nodes are drawn as pixels and connections are aggregated
+        self.lod_cell = None  # size of the merged cells in world units (with pixel nodes)
+        self.lod_tiles = {}  # (cell size, tile x, tile y) -> (node cells, connections between cells) of a tile
+        self.lod_version = None  # graph_version the tiles were built for
+        self.sprites = {}  # (color, type, hovered, label) -> pre-rendered node surface (for the current zoom)
+        self.overlay_rect = None  # region of the screen that is covered by the text overlay
+        self.overlay_lines = None  # text of the overlay
+
+    # choose the level of detail for the zoom factor of the camera (sprites of another zoom are dropped)
+    def set_zoom(self, zoom):
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self.pixel_nodes = NODE_RADIUS * zoom < PIXEL_NODE_RADIUS
+            self.lod_cell = 2 ** math.ceil(math.log2(AGGREGATE_CELL_SIZE / zoom)) if self.pixel_nodes else None
+            self.sprites.clear()
+
+    # changes whenever nodes or connections are added or removed
+    def graph_version(self):
+        return self.graph.edges_version, len(self.graph.core.xs)
+
+    # scale a node is drawn with (start and end node are drawn at least with MARKER_RADIUS)
+    def node_scale(self, node_type):
+        if node_type == Type.DEFAULT:
+            return self.zoom
+        return max(self.zoom, MARKER_RADIUS / NODE_RADIUS)
+
+    # half size of the largest sprite of the current zoom (used for the regions nodes may cover)
+    def half_size(self):
+        return math.ceil(SPRITE_HALF_SIZE * max(self.zoom, MARKER_RADIUS / NODE_RADIUS))
+
+    def node_type(self, node_id):
+        if node_id == self.graph.start_id:
+            return Type.START
+        if node_id == self.graph.end_id:
+            return Type.END
+        return Type.DEFAULT
+
+    # get the sprite of a node (rendered once per distinct appearance)
+    def get_sprite(self, node_id):
+        graph = self.graph
+        color = graph.node_color(node_id)
+        node_type = self.node_type(node_id)
+        hovered = node_id == graph.hovered_id
+        scale = self.node_scale(node_type)
+        # labels that would not be readable anyway are left out --> nodes share their sprites
+        label = graph.get_label(node_id) if NODE_RADIUS * scale >= LABEL_MIN_RADIUS else None
+        key = (color, node_type, hovered, label)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            if len(self.sprites) >= MAX_SPRITES:
+                self.sprites.clear()
+            half = math.ceil(SPRITE_HALF_SIZE * scale)
+            sprite = pygame.Surface((2 * half, 2 * half), pygame.SRCALPHA)
+            draw_node(sprite, (half, half), color, node_type, hovered, label, scale)
+            self.sprites[key] = sprite
+        return sprite
+
+    # position of a node on screen; with pixel nodes the center of the merged cell the node lies in
+    def screen_pos(self, node_id):
+        core = self.graph.core
+        if self.pixel_nodes:
+            return self.cell_pos(int(core.xs[node_id] // self.lod_cell), int(core.ys[node_id] // self.lod_cell))
+        x, y = self.camera.to_screen(core.xs[node_id], core.ys[node_id])
+        return int(x), int(y)
+
+    # center of a merged cell on screen
+    def cell_pos(self, cx, cy):
+        x, y = self.camera.to_screen((cx + 0.5) * self.lod_cell, (cy + 0.5) * self.lod_cell)
+        return int(x), int(y)
+
+    def node_rect(self, node_id):
+        x, y = self.screen_pos(node_id)
+        half = self.half_size()
+        return pygame.Rect(x - half, y - half, 2 * half, 2 * half)
+
+    def edge_width(self):
+        return max(1, round(EDGE_WIDTH * self.zoom))
+
+    # pixels a connection may cover beyond the positions of its nodes (width, with pixel nodes moved to cell centers)
+    def edge_margin(self):
+        return self.edge_width() + (AGGREGATE_CELL_SIZE if self.pixel_nodes else 0)
+
+    def edge_rect(self, edge_id):
+        core = self.graph.core
+        (x0, y0), (x1, y1) = self.screen_pos(core.edge_u[edge_id]), self.screen_pos(core.edge_v[edge_id])
+        x0, x1 = sorted((x0, x1))
+        y0, y1 = sorted((y0, y1))
+        width = self.edge_margin()
+        return pygame.Rect(x0 - width, y0 - width, x1 - x0 + 2 * width + 1, y1 - y0 + 2 * width + 1)
+
+    def draw_edge(self, surface, edge_id, color):
+        core = self.graph.core
+        pygame.draw.line(surface, color, self.screen_pos(core.edge_u[edge_id]), self.screen_pos(core.edge_v[edge_id]),
+                         self.edge_width())
+
+    # True if a node looks different from a node in default color (drawn on top of the background when zoomed out)
+    def is_marked(self, node_id):
+        return (self.node_type(node_id) != Type.DEFAULT or node_id == self.graph.hovered_id
+                or self.graph.node_color(node_id) != STATE_COLORS[State.DEFAULT])
+
+    def draw_node(self, surface, node_id):
+        if self.pixel_nodes and self.node_type(node_id) == Type.DEFAULT and node_id != self.graph.hovered_id:
+            x, y = self.screen_pos(node_id)
+            surface.fill(self.graph.node_color(node_id), (x - PIXEL_NODE_SIZE // 2, y - PIXEL_NODE_SIZE // 2,
+                                                          PIXEL_NODE_SIZE, PIXEL_NODE_SIZE))
+            return
+        sprite = self.get_sprite(node_id)
+        x, y = self.screen_pos(node_id)
+        surface.blit(sprite, (x - sprite.get_width() // 2, y - sprite.get_height() // 2))
+
+    # world area (x0, y0, x1, y1) that is shown in a region of the screen (grown by margin pixels)
+    def world_area(self, rect, margin=0):
+        x0, y0 = self.camera.to_world((rect.left - margin, rect.top - margin))
+        x1, y1 = self.camera.to_world((rect.right + margin, rect.bottom + margin))
+        return x0, y0, x1, y1
+
+    # merged cells of a tile: (set of cells that contain a node, set of connections between two different cells)
+    # of the current cell size; built from the spatial indexes of the graph when the tile is needed for the first time
+    def get_tile(self, tx, ty):
+        if self.lod_version != self.graph_version():
+            self.lod_tiles.clear()
+            self.lod_version = self.graph_version()
+        key = (self.lod_cell, tx, ty)
+        tile = self.lod_tiles.get(key)
+        if tile is None:
+            if len(self.lod_tiles) >= MAX_LOD_TILES:
+                self.lod_tiles.clear()
+            graph, cell = self.graph, self.lod_cell
+            xs, ys, edge_u, edge_v = graph.core.xs, graph.core.ys, graph.core.edge_u, graph.core.edge_v
+            size = LOD_TILE_CELLS * cell
+            area = (tx * size, ty * size, (tx + 1) * size, (ty + 1) * size)
+            nodes = {(int(xs[u] // cell), int(ys[u] // cell)) for u in graph.nodes_in_area(*area)}
+            segments = set()
+            for e in graph.edges_in_area(*area):
+                u, v = edge_u[e], edge_v[e]
+                a, b = (int(xs[u] // cell), int(ys[u] // cell)), (int(xs[v] // cell), int(ys[v] // cell))
+                if a != b:
+                    segments.add((a, b) if a < b else (b, a))
+            tile = self.lod_tiles[key] = (nodes, segments)
+        return tile
+
+    # draw the visible connections in default color onto the background surface; zoomed out (pixel nodes), the
+    # merged cells of the visible tiles are drawn instead: every cell with nodes as one pixel node and every pair of
+    # connected cells as one line (dense regions become a few lines)
+    def rebuild_background(self, size):
+        self.background = pygame.Surface(size)
+        self.background.fill(Colors.WHITE)
+        color = STATE_COLORS[State.DEFAULT]
+        x0, y0, x1, y1 = self.world_area(self.background.get_rect(), self.edge_width())
+        if self.pixel_nodes:
+            tile_size = LOD_TILE_CELLS * self.lod_cell
+            nodes, segments = set(), set()
+            for tx in range(int(x0 // tile_size), int(x1 // tile_size) + 1):
+                for ty in range(int(y0 // tile_size), int(y1 // tile_size) + 1):
+                    tile_nodes, tile_segments = self.get_tile(tx, ty)
+                    nodes.update(tile_nodes)
+                    segments.update(tile_segments)  # long connections are part of several tiles
+            for a, b in segments:
+                pygame.draw.line(self.background, color, self.cell_pos(*a), self.cell_pos(*b))
+            half = PIXEL_NODE_SIZE // 2
+            for cx, cy in nodes:
+                x, y = self.cell_pos(cx, cy)
+                self.background.fill(color, (x - half, y - half, PIXEL_NODE_SIZE, PIXEL_NODE_SIZE))
+        else:
+            for e in self.graph.edges_in_area(x0, y0, x1, y1):
+                self.draw_edge(self.background, e, color)
+        self.background_version = self.graph_version()
+        self.camera_state = self.camera.state()
+
+    # redraw the whole screen
+    def draw_all(self, screen):
+        graph = self.graph
+        self.set_zoom(self.camera.zoom)
+        if (self.background is None or self.background_version != self.graph_version()
+                or self.camera_state != self.camera.state() or self.background.get_size() != screen.get_size()):
+            self.rebuild_background(screen.get_size())
+        screen.blit(self.background, (0, 0))
+        if self.pixel_nodes:
+            self.draw_marked(screen)
+        else:
+            self.draw_content(screen, screen.get_rect())
+
+    # draw the colored connections and the nodes that overlap a region of the screen
+    def draw_content(self, screen, rect):
+        graph = self.graph
+        edge_state = graph.edge_state
+        for e in graph.edges_in_area(*self.world_area(rect, self.edge_margin())):
+            if edge_state[e] != State.DEFAULT.value:
+                self.draw_edge(screen, e, STATE_COLORS[State(edge_state[e])])
+        for u in graph.nodes_in_area(*self.world_area(rect, self.half_size())):
+            if not self.pixel_nodes or self.is_marked(u):  # default pixel nodes are part of the background
+                self.draw_node(screen, u)
+
+    # zoomed out, the background already shows all nodes and connections in default color --> only the colored
+    # connections and the nodes that look different are drawn on top, found without looking at every visible node
+    def draw_marked(self, screen):
+        graph = self.graph
+        core = graph.core
+        xs, ys, edge_u, edge_v, alive = core.xs, core.ys, core.edge_u, core.edge_v, core.alive
+        edge_state, edge_alive = graph.edge_state, core.edge_alive
+        x0, y0, x1, y1 = self.world_area(screen.get_rect(), self.half_size())
+        for e in graph.touched_edges:
+            u, v = edge_u[e], edge_v[e]
+            if edge_alive[e] and (min(xs[u], xs[v]) <= x1 and max(xs[u], xs[v]) >= x0
+                    and min(ys[u], ys[v]) <= y1 and max(ys[u], ys[v]) >= y0):
+                self.draw_edge(screen, e, STATE_COLORS[State(edge_state[e])])
+        if graph.heat_source != -1:  # the heat map colors (nearly) all nodes
+            nodes = graph.nodes_in_area(x0, y0, x1, y1)
+        else:
+            nodes = set(graph.touched_nodes)
+            nodes.update(u for u in (graph.start_id, graph.end_id, graph.hovered_id) if u != -1)
+            selected = graph.node_selected
+            u = selected.find(1)
+            while u != -1:
+                nodes.add(u)
+                u = selected.find(1, u + 1)
+            nodes = [u for u in nodes if alive[u] and x0 <= xs[u] <= x1 and y0 <= ys[u] <= y1]
+        for u in nodes:
+            self.draw_node(screen, u)
+
+    # redraw one dirty region: restore background, then draw colored connections and nodes that overlap it
+    def draw_region(self, screen, rect):
+        screen.set_clip(rect)
+        screen.blit(self.background, rect, rect)
+        self.draw_content(screen, rect)
+        screen.set_clip(None)
+
+    # bring the screen up to date; returns the list of rectangles that changed (empty if nothing changed)
+    def draw(self, screen):
+        graph = self.graph
+        dirty_nodes, dirty_edges = graph.dirty_nodes, graph.dirty_edges
+        graph.dirty_nodes, graph.dirty_edges = set(), set()
+        if (self.background is None or self.background_version != self.graph_version()
+                or self.camera_state != self.camera.state()
+                or self.background.get_size() != screen.get_size()
+                or len(dirty_nodes) + len(dirty_edges) > MAX_DIRTY_RECTS):
+            self.draw_all(screen)
+            return [screen.get_rect()]
+
+        rects = [self.edge_rect(e) for e in dirty_edges]
+        rects += [self.node_rect(u) for u in dirty_nodes if u != -1]
+        screen_rect = screen.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects]
+        rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+        for rect in rects:
+            self.draw_region(screen, rect)
+        return rects
+
+    # draw lines of text in a box in the upper left corner on top of the graph (lines = None --> no overlay);
+    # has to be called after every draw with the rectangles it returned. Returns the list of rectangles that changed
+    def draw_overlay(self, screen, lines, changed_rects):
+        if lines == self.overlay_lines and (self.overlay_rect is None
+                                            or self.overlay_rect.collidelist(changed_rects) == -1):
+            return []  # overlay is still visible and up to date
+        self.overlay_lines = lines
+        rects = []
+        if self.overlay_rect is not None:  # restore the graph below the previous overlay
+            self.draw_region(screen, self.overlay_rect)
+            rects.append(self.overlay_rect)
+            self.overlay_rect = None
+        if lines:
+            font = get_font(OVERLAY_FONT_SIZE)
+            texts = [font.render(line, True, Colors.BLACK) for line in lines]
+            width = max(text.get_width() for text in texts) + 2 * OVERLAY_PADDING
+            height = sum(text.get_height() for text in texts) + 2 * OVERLAY_PADDING
+            self.overlay_rect = pygame.Rect(0, 0, width, height).clip(screen.get_rect())
+            screen.fill(Colors.GREY, self.overlay_rect)
+            y = OVERLAY_PADDING
+            for text in texts:
+                screen.blit(text, (OVERLAY_PADDING, y))
+                y += text.get_height()
+            rects.append(self.overlay_rect)
+        return rects
+
+
+# renderer for the grid mode (GridView): the cells are drawn into an image with one pixel per cell, which is scaled
+# to the size of the cells on screen; redrawn whenever a cell changed. Shares the text overlay with GraphRenderer
+class GridRenderer(GraphRenderer):
+    def draw_all(self, screen):
+        view = self.graph
+        size = (max(1, round(view.core.width * view.cell_size)), max(1, round(view.core.height * view.cell_size)))
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(Colors.WHITE)
+        self.background.blit(pygame.transform.scale(view.image(), size), (0, 0))
+        screen.blit(self.background, (0, 0))
+
+    def draw_region(self, screen, rect):
+        screen.blit(self.background, rect, rect)
+
+    def draw(self, screen):
+        if self.background is not None and not self.graph.dirty and self.background.get_size() == screen.get_size():
+            return []
+        self.draw_all(screen)
+        return [screen.get_rect()]
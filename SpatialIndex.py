@@ -0,0 +1,144 @@
+import math
+from array import array
+
+
+# uniform grid over the plane; every cell holds the ids of the points that lie in it.
+# With a cell size in the order of the query radius, a query only has to look at a few cells,
+# so hit-testing is O(1) amortized independent of the number of points.
+class SpatialGrid:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of point ids
+        self.count = 0  # number of points in the grid
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    # add point with id at coordinate (x, y)
+    def insert(self, point_id, x, y):
+        self.cells.setdefault(self._cell(x, y), []).append(point_id)
+        self.count += 1
+
+    # remove point with id that was inserted at coordinate (x, y)
+    def remove(self, point_id, x, y):
+        key = self._cell(x, y)
+        cell = self.cells.get(key)
+        if cell is not None and point_id in cell:
+            cell.remove(point_id)
+            self.count -= 1
+            if not cell:
+                del self.cells[key]
+
+    # iterate over the ids of all points in cells that overlap the rectangle (x0, y0) - (x1, y1)
+    def candidates(self, x0, y0, x1, y1):
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        cells = self.cells
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):  # rectangle covers more cells than there are filled ones
+            for (cx, cy), cell in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield from cell
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    yield from cell
+
+    # get the id of the point closest to (x, y) within radius; -1 if there is none
+    def nearest_within(self, x, y, radius, xs, ys):
+        best, best_dist = -1, radius * radius
+        for point_id in self.candidates(x - radius, y - radius, x + radius, y + radius):
+            dist = (xs[point_id] - x) ** 2 + (ys[point_id] - y) ** 2
+            if dist <= best_dist:
+                best, best_dist = point_id, dist
+        return best
+
+    # check whether there is any point within radius of (x, y)
+    def any_within(self, x, y, radius, xs, ys):
+        radius_sq = radius * radius
+        for point_id in self.candidates(x - radius, y - radius, x + radius, y + radius):
+            if (xs[point_id] - x) ** 2 + (ys[point_id] - y) ** 2 <= radius_sq:
+                return True
+        return False
+
+    # get the ids of the k points closest to (x, y) (sorted by distance, point exclude is skipped);
+    # looks at rings of cells around the query point until the k closest points are certain
+    def k_nearest(self, x, y, k, xs, ys, exclude=-1):
+        cx, cy = self._cell(x, y)
+        found = []  # (squared distance, id)
+        seen = 0
+        ring = 0
+        while True:
+            for cell_x in range(cx - ring, cx + ring + 1):
+                step = 1 if abs(cell_x - cx) == ring else 2 * ring  # inner columns: only top and bottom cell
+                for cell_y in range(cy - ring, cy + ring + 1, max(step, 1)):
+                    cell = self.cells.get((cell_x, cell_y))
+                    if cell:
+                        seen += len(cell)
+                        found.extend(((xs[i] - x) ** 2 + (ys[i] - y) ** 2, i) for i in cell if i != exclude)
+            found.sort()
+            # every point within distance ring * cell_size lies in the rings that were looked at
+            if len(found) >= k and found[k - 1][0] <= (ring * self.cell_size) ** 2 or seen >= self.count:
+                return [i for _, i in found[:k]]
+            ring += 1
+
+
+# spatial index of the edges of a GraphCore (line segments between two nodes): an edge is put into a grid by its
+# midpoint, edges that are longer than the cell size are kept in a list that every query returns. Edges that were
+# added to the graph are indexed on the next query (edge ids only grow); removed edges are filtered out by the caller
+class EdgeGrid:
+    def __init__(self, core, cell_size):
+        self.core = core
+        self.grid = SpatialGrid(cell_size)  # midpoints of edges that are at most cell_size long
+        self.long_edges = array('i')  # edges that are longer than cell_size
+        self.indexed = 0  # edges with smaller ids are in the index
+
+    # add the edges that were added to the graph since the last query
+    def update(self):
+        core = self.core
+        xs, ys, edge_u, edge_v = core.xs, core.ys, core.edge_u, core.edge_v
+        cell_size = self.grid.cell_size
+        for e in range(self.indexed, len(edge_u)):
+            u, v = edge_u[e], edge_v[e]
+            if abs(xs[u] - xs[v]) > cell_size or abs(ys[u] - ys[v]) > cell_size:
+                self.long_edges.append(e)
+            else:
+                self.grid.insert(e, (xs[u] + xs[v]) / 2, (ys[u] + ys[v]) / 2)
+        self.indexed = len(edge_u)
+
+    # iterate over the ids of all edges that may overlap the rectangle (x0, y0) - (x1, y1)
+    def candidates(self, x0, y0, x1, y1):
+        self.update()
+        half = self.grid.cell_size / 2  # a short edge reaches at most this far from its midpoint (in x and y)
+        yield from self.grid.candidates(x0 - half, y0 - half, x1 + half, y1 + half)
+        yield from self.long_edges
+
+
+# pairs (us, vs) of all points (ids) that are at most radius apart
+def pairs_within_radius(ids, xs, ys, radius):
+    grid = SpatialGrid(radius)
+    for u in ids:
+        grid.insert(u, xs[u], ys[u])
+    us, vs = array('i'), array('i')
+    radius_sq = radius * radius
+    for u in ids:
+        x, y = xs[u], ys[u]
+        for v in grid.candidates(x - radius, y - radius, x + radius, y + radius):
+            if u < v and (xs[v] - x) ** 2 + (ys[v] - y) ** 2 <= radius_sq:
+                us.append(u)
+                vs.append(v)
+    return us, vs
+
+
+# pairs (us, vs) that connect every point (id) with its k nearest other points
+def k_nearest_pairs(ids, xs, ys, k, cell_size):
+    grid = SpatialGrid(cell_size)
+    for u in ids:
+        grid.insert(u, xs[u], ys[u])
+    us, vs = array('i'), array('i')
+    for u in ids:
+        for v in grid.k_nearest(xs[u], ys[u], k, xs, ys, exclude=u):
+            us.append(u)
+            vs.append(v)
+    return us, vs
@@ -0,0 +1,188 @@
+from array import array
+
+
+# twice the signed area of triangle (a, b, c); > 0 if the points are in counter-clockwise order
+def _orientation(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+# > 0 if point (px, py) lies inside the circumcircle of the counter-clockwise triangle (a, b, c)
+def _in_circumcircle(ax, ay, bx, by, cx, cy, px, py):
+    ax, ay, bx, by, cx, cy = ax - px, ay - py, bx - px, by - py, cx - px, cy - py
+    return ((ax * ax + ay * ay) * (bx * cy - cx * by)
+            - (bx * bx + by * by) * (ax * cy - cx * ay)
+            + (cx * cx + cy * cy) * (ax * by - bx * ay)) > 0
+
+
+# the vertices of the super triangle lie at distance M --> infinity from the center of the points, in these directions.
+# A finite super triangle cuts off parts of the triangulation next to the convex hull (the circumcircles of nearly
+# collinear points on the hull are huge and contain its vertices), an infinite one never does
+SUPER_DIRECTIONS = ((-1, -1), (1, -1), (0, 1))
+
+
+# sum, difference and product of polynomials in M (lists of coefficients, lowest degree first)
+def _add(a, b):
+    return [(a[i] if i < len(a) else 0) + (b[i] if i < len(b) else 0) for i in range(max(len(a), len(b)))]
+
+
+def _subtract(a, b):
+    return _add(a, [-x for x in b])
+
+
+def _multiply(a, b):
+    product = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            product[i + j] += x * y
+    return product
+
+
+def _cross(ax, ay, bx, by):
+    return _subtract(_multiply(ax, by), _multiply(ay, bx))
+
+
+# sign of a polynomial in M for M --> infinity (sign of its highest non-zero coefficient)
+def _sign(polynomial):
+    for coefficient in reversed(polynomial):
+        if coefficient:
+            return 1 if coefficient > 0 else -1
+    return 0
+
+
+# _orientation of (a, b, c) where a lies at infinity in direction (dx, dy); b and c relative to the center of the points
+def _orientation_at_infinity(dx, dy, bx, by, cx, cy):
+    orientation = dx * (by - cy) - dy * (bx - cx)
+    return orientation if orientation else bx * cy - by * cx
+
+
+# _in_circumcircle of (a, b, c) where c lies at infinity: the circumcircle becomes the half-plane to the left of a-b
+# (on the line itself, only the points between a and b are inside the circle)
+def _in_half_plane(ax, ay, bx, by, px, py):
+    side = _orientation(ax, ay, bx, by, px, py)
+    if side:
+        return side > 0
+    return (px - ax) * (bx - px) + (py - ay) * (by - py) > 0
+
+
+# _in_circumcircle for points (x, y) whose coordinates are polynomials in M
+def _symbolic_in_circumcircle(a, b, c, p):
+    (ax, ay), (bx, by), (cx, cy) = [(_subtract(x, p[0]), _subtract(y, p[1])) for x, y in (a, b, c)]
+    a2 = _add(_multiply(ax, ax), _multiply(ay, ay))
+    b2 = _add(_multiply(bx, bx), _multiply(by, by))
+    c2 = _add(_multiply(cx, cx), _multiply(cy, cy))
+    determinant = _add(_subtract(_multiply(a2, _cross(bx, by, cx, cy)), _multiply(b2, _cross(ax, ay, cx, cy))),
+                       _multiply(c2, _cross(ax, ay, bx, by)))
+    return _sign(determinant) > 0
+
+
+# pairs (us, vs) of the edges of the delaunay triangulation of the points (ids) --> Bowyer-Watson algorithm.
+# Points are inserted in the order of a grid walk, so that the triangle containing the next point is found with a
+# short walk over neighbouring triangles, and only the triangles around a new point (its cavity) are looked at.
+def delaunay_pairs(ids, xs, ys, cell_size=40):
+    ids = list(ids)
+    us, vs = array('i'), array('i')
+    if len(ids) < 2:
+        return us, vs
+    if len(ids) == 2:
+        us.append(ids[0])
+        vs.append(ids[1])
+        return us, vs
+
+    # local coordinates; the indices n, n + 1 and n + 2 are the vertices of the (infinitely large) super triangle
+    px, py = [xs[i] for i in ids], [ys[i] for i in ids]
+    min_x, max_x, min_y, max_y = min(px), max(px), min(py), max(py)
+    mid_x, mid_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+    n = len(ids)
+
+    triangles = {0: (n, n + 1, n + 2)}  # triangle id -> counter-clockwise vertices
+    owner = {(n, n + 1): 0, (n + 1, n + 2): 0, (n + 2, n): 0}  # directed edge -> triangle it belongs to
+    next_triangle = 1
+    last = 0
+
+    # coordinates of a point as polynomials in M
+    def symbolic(i):
+        if i < n:
+            return [px[i]], [py[i]]
+        dx, dy = SUPER_DIRECTIONS[i - n]
+        return [mid_x, dx], [mid_y, dy]
+
+    # _orientation of edge u-v and point p, where u and/ or v is a vertex of the super triangle
+    def outer_orientation(u, v, p):
+        if u >= n and v >= n:
+            (ux, uy), (vx, vy) = SUPER_DIRECTIONS[u - n], SUPER_DIRECTIONS[v - n]
+            return ux * vy - uy * vx
+        if v >= n:  # orientation(u, v, p) = orientation(v, p, u)
+            u, v, p = v, p, u
+        dx, dy = SUPER_DIRECTIONS[u - n]
+        return _orientation_at_infinity(dx, dy, px[v] - mid_x, py[v] - mid_y, px[p] - mid_x, py[p] - mid_y)
+
+    # _in_circumcircle of triangle (a, b, c) and point p, where the triangle has vertices of the super triangle
+    def outer_in_circumcircle(a, b, c, p):
+        if (a >= n) + (b >= n) + (c >= n) == 1:
+            while c < n:
+                a, b, c = b, c, a
+            return _in_half_plane(px[a], py[a], px[b], py[b], px[p], py[p])
+        return _symbolic_in_circumcircle(symbolic(a), symbolic(b), symbolic(c), symbolic(p))
+
+    # insertion order: row by row through a grid, alternating direction (keeps consecutive points close together)
+    def order_key(i):
+        row = int((py[i] - min_y) // cell_size)
+        column = int((px[i] - min_x) // cell_size)
+        return row, column if row % 2 == 0 else -column
+
+    for p in sorted(range(n), key=order_key):
+        x, y = px[p], py[p]
+        # walk towards the point until the triangle containing it is found
+        t = last if last in triangles else next(iter(triangles))
+        for _ in range(len(triangles)):
+            a, b, c = triangles[t]
+            for u, v in ((a, b), (b, c), (c, a)):
+                if u < n and v < n:
+                    beyond = _orientation(px[u], py[u], px[v], py[v], x, y) < 0
+                else:
+                    beyond = outer_orientation(u, v, p) < 0
+                if beyond:  # point lies beyond edge u-v
+                    t = owner[(v, u)]
+                    break
+            else:
+                break
+        else:  # walk did not end (degenerate configuration) --> look for a suitable triangle in all triangles
+            t = next(t for t, (a, b, c) in triangles.items()
+                     if (_in_circumcircle(px[a], py[a], px[b], py[b], px[c], py[c], x, y) if a < n and b < n and c < n
+                         else outer_in_circumcircle(a, b, c, p)))
+        # cavity: all triangles whose circumcircle contains the point (connected, starting at the found triangle)
+        bad, stack = {t}, [t]
+        while stack:
+            a, b, c = triangles[stack.pop()]
+            for u, v in ((a, b), (b, c), (c, a)):
+                neighbour = owner.get((v, u))
+                if neighbour is not None and neighbour not in bad:
+                    d, e, f = triangles[neighbour]
+                    if d < n and e < n and f < n:
+                        inside = _in_circumcircle(px[d], py[d], px[e], py[e], px[f], py[f], x, y)
+                    else:
+                        inside = outer_in_circumcircle(d, e, f, p)
+                    if inside:
+                        bad.add(neighbour)
+                        stack.append(neighbour)
+        # border of the cavity: edges of removed triangles whose other side stays
+        boundary = [(u, v) for t in bad for u, v in zip(triangles[t], triangles[t][1:] + triangles[t][:1])
+                    if owner.get((v, u)) not in bad]
+        for t in bad:  # remove cavity
+            a, b, c = triangles.pop(t)
+            for edge in ((a, b), (b, c), (c, a)):
+                del owner[edge]
+        for u, v in boundary:  # connect the point with the border of the cavity
+            triangles[next_triangle] = (u, v, p)
+            owner[(u, v)] = owner[(v, p)] = owner[(p, u)] = next_triangle
+            last = next_triangle
+            next_triangle += 1
+
+    edges = set()
+    for u, v in owner:
+        if u < n and v < n:  # edges to the super triangle are dropped
+            edges.add((u, v) if u < v else (v, u))
+    for u, v in edges:
+        us.append(ids[u])
+        vs.append(ids[v])
+    return us, vs
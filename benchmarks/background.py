@@ -0,0 +1,78 @@
+# benchmark: frame times while a long search runs. Run to completion on the main thread (as with 'SHIFT' + key), the
+# window is blocked for the whole search; in the background (BackgroundSearch) the frames go on and only show the
+# progress that was published so far. Also measures how long cancelling a running background search takes
+# usage: python benchmarks/background.py [number of nodes]
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from BackgroundSearch import BackgroundSearch
+from Camera import Camera
+from Graph import NetworkGraph
+from GraphGenerators import random_geometric_graph
+from Pathfinding import Dijkstra
+from Renderer import GraphRenderer
+
+NODES = 10 ** 5
+SCREEN_SIZE = (800, 800)
+STEP_TIME = 0.5 / 60  # seconds per frame that are spent on showing steps (as in the visualizer at unbounded speed)
+MAX_FRAME_TIME = 0.1  # longest frame that is accepted while searching in the background
+
+
+# one frame of the visualizer: show the published steps for at most STEP_TIME, then draw what changed
+def frame(search, renderer, screen):
+    deadline = time.perf_counter() + STEP_TIME
+    while not search.waiting() and not search.has_finished() and time.perf_counter() < deadline:
+        search.step()
+    renderer.draw(screen)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NODES
+    pygame.init()
+    screen = pygame.Surface(SCREEN_SIZE)
+    graph = NetworkGraph(random_geometric_graph(n, seed=1))
+    nodes = list(graph.core.node_ids())
+    start, end = nodes[0], nodes[-1]  # opposite corners
+    side = max(graph.core.xs)
+    renderer = GraphRenderer(graph, Camera(side / 2 - SCREEN_SIZE[0] / 2, side / 2 - SCREEN_SIZE[1] / 2))
+    renderer.draw(screen)
+
+    begin = time.perf_counter()
+    result = Dijkstra(graph.core, start, end).run()
+    blocked = time.perf_counter() - begin
+    print(f"{n} nodes, Dijkstra over {len(result.trace)} events")
+    print(f"main thread:  window blocked for {blocked * 1e3:.0f} ms (run to completion)")
+
+    frames = []
+    begin = time.perf_counter()
+    search = BackgroundSearch(graph, Dijkstra, start, end)
+    search.verbose = False
+    while not search.has_finished():
+        frame_begin = time.perf_counter()
+        frame(search, renderer, screen)
+        frames.append(time.perf_counter() - frame_begin)
+    total = time.perf_counter() - begin
+    print(f"background:   {len(frames)} frames in {total * 1e3:.0f} ms, longest frame {max(frames) * 1e3:.1f} ms, "
+          f"average {sum(frames) / len(frames) * 1e3:.1f} ms")
+    if search.cost != result.cost:
+        sys.exit("the background search found another path")
+
+    graph.reset_states()
+    search = BackgroundSearch(graph, Dijkstra, start, end)
+    for _ in range(10):
+        frame(search, renderer, screen)
+    running = search.is_running()
+    begin = time.perf_counter()
+    search.cancel()
+    print(f"cancel:       {(time.perf_counter() - begin) * 1e3:.1f} ms after 10 frames "
+          f"({'while searching' if running else 'search had already finished'})")
+    if max(frames) > MAX_FRAME_TIME:
+        sys.exit(f"a frame took longer than {MAX_FRAME_TIME * 1e3:.0f} ms while searching in the background")
+
+
+if __name__ == "__main__":
+    main()
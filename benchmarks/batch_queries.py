@@ -0,0 +1,38 @@
+# benchmark: answering many (start, end) queries on one graph with a growing number of worker processes
+# usage: python benchmarks/batch_queries.py [number of queries]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from BatchSearch import solve_queries
+from GraphGenerators import random_geometric_graph
+from Pathfinding import AStar
+
+NODES = 10 ** 5
+QUERIES = 400
+
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else QUERIES
+    core = random_geometric_graph(NODES, seed=1)
+    rng = random.Random(2)
+    pairs = [(rng.randrange(NODES), rng.randrange(NODES)) for _ in range(queries)]
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    print(f"{NODES} nodes, {queries} queries, {os.cpu_count()} cpu cores")
+    print(f"{'processes':>9} {'time':>10} {'queries/s':>10} {'speedup':>8}")
+    base_time, base_results = None, None
+    for processes in counts:
+        begin = time.perf_counter()
+        results = solve_queries(core, pairs, AStar, processes)
+        seconds = time.perf_counter() - begin
+        if base_results is None:
+            base_time, base_results = seconds, results
+        for base, result in zip(base_results, results):  # every process count has to give the same answers
+            assert base.path == result.path
+        print(f"{processes:>9} {seconds:>8.2f} s {queries / seconds:>10.1f} {base_time / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmark: bidirectional searches vs. their one-sided counterparts on random geometric graphs
+# usage: python benchmarks/bidirectional.py [number of nodes ...]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import random_geometric_graph
+from Pathfinding import BreadthFirst, Dijkstra, BidirectionalBreadthFirst, BidirectionalDijkstra
+
+SIZES = (10 ** 4, 10 ** 5)
+QUERIES = 20
+PAIRS = ((BreadthFirst, BidirectionalBreadthFirst), (Dijkstra, BidirectionalDijkstra))
+
+
+# run all queries with one algorithm; returns (average time, average number of inspected nodes, results)
+def run_queries(algorithm_class, core, queries):
+    seconds, inspected, results = 0, 0, []
+    for start, end in queries:
+        algorithm = algorithm_class(core, start, end)
+        begin = time.perf_counter()
+        result = algorithm.run(record_trace=False)
+        seconds += time.perf_counter() - begin
+        if hasattr(algorithm, "dists"):
+            inspected += sum(len(prev) for prev in algorithm.prevs)
+        else:
+            inspected += len(algorithm.prev)
+        results.append(result)
+    return seconds / len(queries), inspected / len(queries), results
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rng = random.Random(7)
+    print(f"{'nodes':>8} {'algorithm':>26} {'time':>10} {'reached nodes':>14} {'speedup':>8}")
+    for n in sizes:
+        core = random_geometric_graph(n, seed=n)
+        queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+        for one_sided, bidirectional in PAIRS:
+            base_time, base_reached, base_results = run_queries(one_sided, core, queries)
+            bi_time, bi_reached, bi_results = run_queries(bidirectional, core, queries)
+            for base, bi in zip(base_results, bi_results):  # both have to find equally short paths
+                assert (base.path is None) == (bi.path is None)
+                if one_sided is Dijkstra and base.path is not None:
+                    assert abs(base.cost - bi.cost) < 1e-6, (base.cost, bi.cost)
+                elif base.path is not None:
+                    assert len(base.path) == len(bi.path)
+            print(f"{n:>8} {one_sided.__name__:>26} {base_time * 1e3:>7.1f} ms {base_reached:>14.0f}")
+            print(f"{n:>8} {bidirectional.__name__:>26} {bi_time * 1e3:>7.1f} ms {bi_reached:>14.0f} "
+                  f"{base_time / bi_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmark: A* vs. jump point search on 1000 x 1000 grids (open, random walls, maze) from the upper left to the
+# lower right corner, and the memory of a grid compared with the same number of nodes in a GraphCore
+# usage: python benchmarks/grid_search.py [side length]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import grid_graph
+from GridMap import maze_grid, open_grid, random_grid
+from Pathfinding import AStar, JumpPointSearch
+
+SIDE = 1000
+GRIDS = {
+    "open": lambda side: open_grid(side, side),
+    "random walls": lambda side: random_grid(side, side, density=0.2, seed=1),
+    "maze": lambda side: maze_grid(side + 1, side + 1, loops=0.1, seed=1),
+}
+
+
+def main():
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else SIDE
+    print(f"{'grid':>13} {'algorithm':>16} {'time':>10} {'expanded':>9} {'cost':>9}")
+    for name, make_grid in GRIDS.items():
+        grid = make_grid(side)
+        start, end = grid.cell_at(1, 1), grid.cell_at(grid.width - 2, grid.height - 2)
+        grid.set_walls([start, end], False)
+        costs = []
+        for algorithm_class in (AStar, JumpPointSearch):
+            begin = time.perf_counter()
+            result = algorithm_class(grid, start, end).run(record_trace=False)
+            seconds = time.perf_counter() - begin
+            costs.append(result.cost)
+            cost = f"{result.cost:.1f}" if result.cost is not None else "-"
+            print(f"{name:>13} {algorithm_class.__name__:>16} {seconds:>8.2f} s {result.stats.expanded:>9} {cost:>9}")
+        if costs[0] is not None and abs(costs[0] - costs[1]) > 1e-6:
+            sys.exit(f"jump point search found a path of another length on the {name} grid")
+
+    grid = open_grid(side, side)
+    core = grid_graph(side, side)  # 4 connections per node only, a grid with diagonal moves would be larger
+    print(f"\nmemory for {side * side} cells: grid {grid.nbytes() / 2 ** 20:.1f} MB, "
+          f"graph {core.nbytes() / 2 ** 20:.1f} MB (without node/connection objects)")
+
+
+if __name__ == "__main__":
+    main()
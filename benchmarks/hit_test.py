@@ -0,0 +1,57 @@
+# benchmark: hit-testing (get_focused_node) with the spatial grid vs. a linear scan over all nodes; the spatial grid
+# is built on first use, its construction is timed separately (not as part of the queries)
+# usage: python benchmarks/hit_test.py
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Graph import NetworkGraph, NODE_RADIUS
+
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5)
+QUERIES = 2000
+
+
+# hit-test as it was done before the spatial index: scan every node
+def linear_focused_node(graph, mouse_pos):
+    for u in graph.core.node_ids():
+        if math.dist(mouse_pos, graph.core.pos(u)) <= NODE_RADIUS:
+            return u
+    return -1
+
+
+# create a graph with n random nodes (about one node per grid cell, like a clicked/imported graph)
+def random_graph(n, rng):
+    side = math.sqrt(n) * 2 * NODE_RADIUS
+    graph = NetworkGraph()
+    for _ in range(n):
+        graph.add_node((rng.uniform(0, side), rng.uniform(0, side)))
+    return graph, side
+
+
+def time_queries(function, queries):
+    start = time.perf_counter()
+    for pos in queries:
+        function(pos)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'nodes':>8} {'linear scan':>14} {'grid build':>12} {'spatial grid':>14} {'speedup':>9}")
+    for n in SIZES:
+        graph, side = random_graph(n, rng)
+        queries = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(QUERIES)]
+        linear_queries = queries[:max(10, QUERIES * 1000 // n)]  # the scan is slow, use fewer queries for it
+        linear = time_queries(lambda pos: linear_focused_node(graph, pos), linear_queries)
+        start = time.perf_counter()
+        graph.spatial_index  # build the grid before the queries are timed
+        build = time.perf_counter() - start
+        grid = time_queries(graph.get_focused_node, queries)
+        print(f"{n:>8} {linear * 1e6:>11.1f} us {build * 1e3:>9.1f} ms {grid * 1e6:>11.2f} us {linear / grid:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmark: importing road networks (DIMACS, csv edge list, OSM XML); the bundled samples are imported first,
+# then a generated DIMACS/ csv file of a large grid graph (no download needed)
+# usage: python benchmarks/import_graphs.py [grid side length]
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from GraphGenerators import grid_graph
+from GraphImport import import_dimacs, import_edge_list, import_graph, import_osm
+
+SAMPLES = os.path.join(ROOT, "samples")
+
+
+# write a core as DIMACS .gr/.co files (both directions of every edge, like in road networks)
+def write_dimacs(core, gr_path, co_path):
+    with open(co_path, "w") as file:
+        file.write(f"p aux sp co {core.node_count}\n")
+        for u in core.node_ids():
+            file.write(f"v {u + 1} {int(11e6 + core.xs[u] * 10)} {int(48e6 + core.ys[u] * 10)}\n")
+    with open(gr_path, "w") as file:
+        file.write(f"p sp {core.node_count} {2 * core.edge_count}\n")
+        for e in core.edge_ids():
+            u, v, weight = core.edge_u[e] + 1, core.edge_v[e] + 1, int(core.edge_w[e])
+            file.write(f"a {u} {v} {weight}\na {v} {u} {weight}\n")
+
+
+def write_edge_list(core, path):
+    with open(path, "w") as file:
+        file.write("source,target,weight\n")
+        for e in core.edge_ids():
+            file.write(f"{core.edge_u[e]},{core.edge_v[e]},{core.edge_w[e]}\n")
+
+
+def timed(name, function, *args):
+    begin = time.perf_counter()
+    core = function(*args)
+    seconds = time.perf_counter() - begin
+    print(f"{name:>24} {core.node_count:>9} nodes {core.edge_count:>9} edges {seconds:>8.2f} s")
+    return core
+
+
+def main():
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    timed("sample DIMACS", import_graph, os.path.join(SAMPLES, "tiny.gr"))
+    timed("sample csv", import_edge_list, os.path.join(SAMPLES, "tiny_edges.csv"),
+          os.path.join(SAMPLES, "tiny_nodes.csv"))
+    timed("sample OSM", import_osm, os.path.join(SAMPLES, "tiny.osm"))
+    source = grid_graph(side, side)
+    with tempfile.TemporaryDirectory() as directory:
+        gr_path, co_path = os.path.join(directory, "grid.gr"), os.path.join(directory, "grid.co")
+        csv_path = os.path.join(directory, "grid.csv")
+        write_dimacs(source, gr_path, co_path)
+        write_edge_list(source, csv_path)
+        core = timed("generated DIMACS", import_dimacs, gr_path, co_path)
+        assert (core.node_count, core.edge_count) == (source.node_count, source.edge_count)
+        core = timed("generated csv", import_edge_list, csv_path)
+        assert (core.node_count, core.edge_count) == (source.node_count, source.edge_count)
+
+
+if __name__ == "__main__":
+    main()
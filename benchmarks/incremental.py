@@ -0,0 +1,46 @@
+# benchmark: repairing the shortest path with LPA* after a connection on the path was removed vs. searching again
+# usage: python benchmarks/incremental.py [grid width ...]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Graph import NetworkGraph
+from GraphGenerators import grid_graph
+from Pathfinding import AStar, LPAStar
+
+SIZES = (100, 300)
+EDITS = 10
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'nodes':>8} {'first search':>13} {'repair':>10} {'A* again':>10} {'speedup':>8}")
+    for width in sizes:
+        graph = NetworkGraph(grid_graph(width, width, spacing=10))
+        start, end = 0, width * width - 1
+        graph.set_start_node(graph.node(start))
+        graph.set_end_node(graph.node(end))
+        search = LPAStar(graph, start, end)
+        search.verbose = False
+        begin = time.perf_counter()
+        while not search.has_finished():
+            search.step()
+        first = time.perf_counter() - begin
+
+        repair, again = 0, 0
+        for _ in range(EDITS):  # cut the current path in its middle; the search repairs it as listener of the graph
+            i = len(search.path) // 2
+            begin = time.perf_counter()
+            graph.disconnect_nodes(graph.node(search.path[i]), graph.node(search.path[i + 1]))
+            repair += time.perf_counter() - begin
+            begin = time.perf_counter()
+            result = AStar(graph.core, start, end).run(record_trace=False)
+            again += time.perf_counter() - begin
+            assert abs(result.cost - search.cost) < 1e-6, (result.cost, search.cost)
+        print(f"{width * width:>8} {first * 1e3:>10.1f} ms {repair / EDITS * 1e3:>7.1f} ms "
+              f"{again / EDITS * 1e3:>7.1f} ms {again / repair:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
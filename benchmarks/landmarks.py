@@ -0,0 +1,66 @@
+# benchmark: ALT preprocessing (landmark distance tables) --> preprocessing time, memory, file size and query speedup
+# compared to Dijkstra and A* on random geometric graphs
+# usage: python benchmarks/landmarks.py [number of nodes ...]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import random_geometric_graph
+from Landmarks import build_landmarks, load_landmarks, save_landmarks
+from Pathfinding import AStar, ALTStar, Dijkstra
+
+SIZES = (10 ** 4, 10 ** 5)
+QUERIES = 20
+
+
+# average time and number of settled nodes of the queries with one algorithm
+def run_queries(algorithm_class, core, queries):
+    seconds, settled, costs = 0, 0, []
+    for start, end in queries:
+        algorithm = algorithm_class(core, start, end)
+        begin = time.perf_counter()
+        result = algorithm.run(record_trace=False)
+        seconds += time.perf_counter() - begin
+        settled += len(algorithm.settled)
+        costs.append(result.cost)
+    return seconds / len(queries), settled / len(queries), costs
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rng = random.Random(5)
+    for n in sizes:
+        core = random_geometric_graph(n, seed=n)
+        begin = time.perf_counter()
+        table = build_landmarks(core, seed=n)
+        preprocessing = time.perf_counter() - begin
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.pfvl")
+            save_landmarks(table, path)
+            file_size = os.path.getsize(path)
+            begin = time.perf_counter()
+            assert load_landmarks(core, path) is not None
+            loading = time.perf_counter() - begin
+            queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+            print(f"{n} nodes, {len(table.landmarks)} landmarks: preprocessing {preprocessing:.2f} s, "
+                  f"table {table.nbytes() / 1e6:.1f} MB (graph {core.nbytes() / 1e6:.1f} MB), "
+                  f"file {file_size / 1e6:.1f} MB loaded in {loading * 1e3:.2f} ms")
+            print(f"{'algorithm':>10} {'time':>10} {'settled nodes':>14} {'speedup':>8}")
+            base_time, base_costs = None, None
+            for algorithm_class in (Dijkstra, AStar, ALTStar):  # ALTStar uses the table loaded from the file
+                seconds, settled, costs = run_queries(algorithm_class, core, queries)
+                if base_time is None:  # dijkstra is the baseline
+                    base_time, base_costs = seconds, costs
+                for base, cost in zip(base_costs, costs):
+                    assert (base is None) == (cost is None) and (base is None or abs(base - cost) < 1e-6)
+                print(f"{algorithm_class.__name__:>10} {seconds * 1e3:>7.1f} ms {settled:>14.0f} "
+                      f"{base_time / seconds:>7.1f}x")
+            del table
+            core.cache.clear()  # release the memory-mapped file before the directory is removed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmark: metrics of all searchers for the same queries on a random geometric graph (nodes expanded, connections
+# relaxed, largest frontier, peak memory and time), so that the algorithms can be compared on equal terms
+# usage: python benchmarks/search_metrics.py [number of nodes]
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import random_geometric_graph
+from Pathfinding import (BreadthFirst, DepthFirst, Dijkstra, AStar, ALTStar, BidirectionalBreadthFirst,
+                         BidirectionalDijkstra, LPAStar)
+
+NODES = 10 ** 4
+QUERIES = 10
+ALGORITHMS = (BreadthFirst, DepthFirst, Dijkstra, AStar, ALTStar, BidirectionalBreadthFirst, BidirectionalDijkstra,
+              LPAStar)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NODES
+    core = random_geometric_graph(n, seed=3)
+    rng = random.Random(4)
+    queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+    print(f"{n} nodes, averages of {QUERIES} queries (trace recorded, memory traced)")
+    print(f"{'algorithm':>26} {'expanded':>9} {'relaxed':>9} {'frontier':>9} {'memory':>10} "
+          f"{'search':>10} {'trace':>10} {'prepare':>10}")
+    tracemalloc.start()
+    for algorithm_class in ALGORITHMS:
+        totals = {}
+        for start, end in queries:
+            stats = algorithm_class(core, start, end).run().stats
+            for key, value in stats.as_dict().items():
+                totals[key] = totals.get(key, 0) + (value or 0)
+        average = {key: value / QUERIES for key, value in totals.items()}
+        print(f"{algorithm_class.__name__:>26} {average['expanded']:>9.0f} {average['relaxed']:>9.0f} "
+              f"{average['max_frontier']:>9.0f} {average['peak_memory'] / 1024:>7.0f} KB "
+              f"{average['search'] * 1e3:>7.1f} ms {average['visualization'] * 1e3:>7.1f} ms "
+              f"{average['preprocessing'] * 1e3:>7.1f} ms")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmark: breadth-first/depth-first search on grid graphs of growing size;
+# the time per node has to stay (roughly) constant, i.e. the searches scale linearly
+# usage: python benchmarks/search_scaling.py
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import grid_graph
+from Pathfinding import BreadthFirst, DepthFirst
+
+SIZES = (10 ** 4, 10 ** 5, 10 ** 6)
+MAX_SLOWDOWN = 2.0  # allowed growth of the time per node between the smallest and the largest graph
+
+
+# seconds of a search from start to end (no messages are printed meanwhile) and its stats
+def time_search(algorithm_class, core, start, end):
+    algorithm = algorithm_class(core, start, end)
+    algorithm.verbose = False
+    begin = time.perf_counter()
+    while not algorithm.has_finished():
+        algorithm.step()
+    return time.perf_counter() - begin, algorithm.stats
+
+
+def main():
+    print(f"{'nodes':>8} {'algorithm':>14} {'time':>10} {'per node':>10}")
+    per_node = {}
+    for n in SIZES:
+        side = int(math.sqrt(n))
+        core = grid_graph(side, side)
+        nodes, edges = core.node_count, core.edge_count
+        unreachable = core.add_node(-1, -1)  # isolated end node --> the whole grid is searched
+        for algorithm_class in (BreadthFirst, DepthFirst):
+            seconds, stats = time_search(algorithm_class, core, 0, unreachable)
+            # every node is expanded once and every connection is looked at once from each side
+            if stats.expanded != nodes or stats.relaxed != 2 * edges:
+                sys.exit(f"{algorithm_class.__name__} expanded {stats.expanded} of {nodes} nodes and relaxed "
+                         f"{stats.relaxed} instead of {2 * edges} connections")
+            per_node.setdefault(algorithm_class.__name__, []).append(seconds / core.node_count)
+            print(f"{core.node_count:>8} {algorithm_class.__name__:>14} {seconds:>8.2f} s "
+                  f"{seconds / core.node_count * 1e6:>7.2f} us")
+    for name, times in per_node.items():
+        slowdown = times[-1] / times[0]
+        if slowdown > MAX_SLOWDOWN:
+            sys.exit(f"{name} does not scale linearly: time per node grew by {slowdown:.1f}x")
+    print("time per node is constant --> searches scale linearly")
+
+
+if __name__ == "__main__":
+    main()
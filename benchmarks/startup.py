@@ -0,0 +1,52 @@
+# benchmark: import time of the modules in a fresh interpreter each (best of 5 runs) and whether the import pulled in
+# pygame or initialized SDL. The search core has to be importable in well under 50 ms without pygame, the visualizer
+# must not open a window or initialize anything on import
+# usage: python benchmarks/startup.py
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_MODULES = ("GraphCore", "Pathfinding", "Distances", "Landmarks", "GraphIO", "GraphGenerators")
+VIEW_MODULES = ("Graph", "Renderer", "PathfindingVisualizer")
+CORE_LIMIT = 0.05  # seconds
+RUNS = 5
+# measured in the child process: seconds for the import, pygame imported?, SDL video initialized?
+MEASURE = """
+import sys, time
+begin = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - begin
+pygame = sys.modules.get("pygame")
+print(seconds, pygame is not None, pygame is not None and pygame.display.get_init())
+"""
+
+
+# (best import time in seconds, pygame imported, display initialized) of a module
+def measure(module):
+    best = None
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, "-c", MEASURE.format(module=module)], cwd=REPO_DIR, check=True,
+                                capture_output=True, text=True).stdout.splitlines()[-1].split()
+        seconds, pygame, display = float(output[0]), output[1] == "True", output[2] == "True"
+        best = seconds if best is None else min(best, seconds)
+    return best, pygame, display
+
+
+def main():
+    failures = []
+    print(f"{'module':>22} {'import':>10} {'pygame':>7} {'display':>8}")
+    for module in CORE_MODULES + VIEW_MODULES:
+        seconds, pygame, display = measure(module)
+        print(f"{module:>22} {seconds * 1e3:>7.1f} ms {'yes' if pygame else 'no':>7} {'yes' if display else 'no':>8}")
+        if module in CORE_MODULES and (seconds > CORE_LIMIT or pygame):
+            failures.append(module)
+        if display:
+            failures.append(module)
+    if failures:
+        sys.exit(f"too slow or initializes pygame/ SDL on import: {', '.join(failures)}")
+    print(f"search core imports in less than {CORE_LIMIT * 1e3:.0f} ms without pygame, no module initializes SDL")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# benchmark suite: construction, hit-testing, searching, resetting and drawing on generated graph families of growing
+# size. All random choices use fixed seeds, so every run measures the same work. The results are written as JSON and
+# compared with a baseline: a measurement that got clearly slower is measured once more, if it is still slower it is
+# reported and the suite fails (exit code 1). Times depend on the machine, so the baseline is not part of the
+# repository: the first run records it (benchmarks/baseline.json), --save-baseline replaces it.
+# usage: python benchmarks/suite.py [--sizes 100 1000 ...] [--full] [--families grid ...] [--output results.json]
+#                                   [--baseline baseline.json] [--save-baseline] [--tolerance 0.5]
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # drawing goes to offscreen surfaces, no window is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from Graph import NetworkGraph
+from GraphGenerators import grid_graph, random_geometric_graph, erdos_renyi_graph, scale_free_graph
+from Landmarks import build_landmarks
+from Pathfinding import (BreadthFirst, DepthFirst, Dijkstra, AStar, ALTStar, BidirectionalBreadthFirst,
+                         BidirectionalDijkstra, LPAStar)
+from Renderer import GraphRenderer
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results.json")
+SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5)
+FULL_SIZES = SIZES + (10 ** 6,)
+SEED = 7
+QUERIES = 3  # searches per algorithm (same start/end pairs for all algorithms)
+HIT_QUERIES = 1000  # mouse positions per hit-testing measurement
+SURFACE_SIZE = (1000, 1000)  # size of the offscreen surface the graph is drawn onto
+REPEAT_LIMIT = 10 ** 4  # graphs up to this size are measured REPEATS times (best time counts), larger ones once
+REPEATS = 5
+TOLERANCE = 1.0  # a measurement regresses if it is more than twice as slow as the baseline ...
+MIN_DIFFERENCE = 0.005  # ... and at least 5 ms slower (very short measurements are mostly noise)
+ALGORITHMS = (BreadthFirst, DepthFirst, Dijkstra, AStar, ALTStar, BidirectionalBreadthFirst, BidirectionalDijkstra,
+              LPAStar)
+
+# graph families: name -> function that creates a GraphCore with about n nodes (deterministic for a seed)
+FAMILIES = {
+    "grid": lambda n, seed: grid_graph(math.isqrt(n), math.isqrt(n)),
+    "geometric": lambda n, seed: random_geometric_graph(n, seed=seed),
+    "erdos-renyi": lambda n, seed: erdos_renyi_graph(n, seed=seed),
+    "scale-free": lambda n, seed: scale_free_graph(n, seed=seed),
+}
+
+
+# best (smallest) time in seconds of running function repeats times; prepare is called before every run (not timed)
+def best_time(function, repeats, prepare=None):
+    best = math.inf
+    for _ in range(repeats):
+        if prepare is not None:
+            prepare()
+        begin = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+# all measurements for one graph family and size: name -> seconds
+def measure(family, n, seed):
+    repeats = REPEATS if n <= REPEAT_LIMIT else 1
+    results = {}
+    results["construction"] = best_time(lambda: FAMILIES[family](n, seed), repeats)
+    core = FAMILIES[family](n, seed)
+    graph = NetworkGraph(core)
+    rng = random.Random(seed)
+    nodes = list(core.node_ids())
+
+    # hit-testing: the spatial index is built on first use (timed separately), then the mouse hovers at random
+    # positions close to nodes (about half of them hit a node)
+    results["spatial_index"] = best_time(lambda: graph.spatial_index, repeats,
+                                         prepare=lambda: setattr(graph, "_spatial_index", None))
+    positions = [(core.xs[u] + rng.uniform(-20, 20), core.ys[u] + rng.uniform(-20, 20))
+                 for u in (rng.choice(nodes) for _ in range(HIT_QUERIES))]
+    results["hit_test"] = best_time(lambda: [graph.get_focused_node(pos) for pos in positions], repeats)
+
+    # searches without visualization; the landmarks of ALT* are built once per graph (preprocessing)
+    queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(QUERIES)]
+    results["landmarks"] = best_time(lambda: build_landmarks(core, seed=seed), 1)
+    for algorithm_class in ALGORITHMS:
+        results["search/" + algorithm_class.__name__] = best_time(
+            lambda: [algorithm_class(core, start, end).run(record_trace=False) for start, end in queries], repeats)
+
+    # reset after a visualized search (the search colors the nodes and connections of the graph)
+    def visualized_search():
+        algorithm = BreadthFirst(graph, *queries[0])
+        algorithm.verbose = False
+        while not algorithm.has_finished():
+            algorithm.step()
+    results["reset"] = best_time(graph.reset_states, repeats, prepare=visualized_search)
+
+    # drawing onto an offscreen surface: immediate mode (NetworkGraph.draw) and the cached renderer (full redraw)
+    surface = pygame.Surface(SURFACE_SIZE)
+    results["draw"] = best_time(lambda: graph.draw(surface), repeats, prepare=lambda: surface.fill((255, 255, 255)))
+    renderer = GraphRenderer(graph)
+    results["render"] = best_time(lambda: renderer.draw_all(surface), repeats)
+    return results
+
+
+# measure all families and sizes; results keeps the best time of this and earlier runs (key -> seconds)
+def run(families, sizes, results):
+    for family in families:
+        for n in sizes:
+            for name, seconds in measure(family, n, SEED).items():
+                key = f"{family}/{n}/{name}"
+                results[key] = min(seconds, results.get(key, math.inf))
+                print(f"{key:>50} {seconds * 1e3:>9.2f} ms")
+
+
+# measurements that are slower than in the baseline: list of (key, baseline seconds, seconds)
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for key, seconds in results.items():
+        before = baseline.get(key)
+        if before is not None and seconds > before * (1 + tolerance) and seconds - before > MIN_DIFFERENCE:
+            regressions.append((key, before, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark suite of the pathfinding visualizer")
+    parser.add_argument("--sizes", type=int, nargs="+", help=f"numbers of nodes (default: {SIZES})")
+    parser.add_argument("--full", action="store_true", help=f"include graphs with {FULL_SIZES[-1]} nodes")
+    parser.add_argument("--families", nargs="+", choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="file the results are written to")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown (0.5 --> 50%%)")
+    args = parser.parse_args()
+    sizes = args.sizes or (FULL_SIZES if args.full else SIZES)
+
+    pygame.init()
+    results = {}
+    print(f"{'measurement':>50} {'time':>12}")
+    run(args.families, sizes, results)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        # a single slow run is mostly noise (other processes, frequency scaling) --> the graphs with regressions are
+        # measured once more and only measurements that are slow in both runs count
+        regressions = find_regressions(results, baseline["results"], args.tolerance)
+        suspects = sorted({(key.split("/")[0], int(key.split("/")[1])) for key, _, _ in regressions})
+        if suspects:
+            print(f"\nmeasuring {len(suspects)} graphs once more that look slower than the baseline")
+            for family, n in suspects:
+                run((family,), (n,), results)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seed": SEED,
+            "sizes": list(sizes),
+            "families": args.families,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"results written to {args.output}")
+    if baseline is None:  # first run on this machine (or --save-baseline) --> later runs are compared with this one
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return
+    regressions = find_regressions(results, baseline["results"], args.tolerance)
+    compared = sum(key in baseline["results"] for key in results)
+    if regressions:
+        print(f"\n!!! {len(regressions)} of {compared} measurements REGRESSED (more than {args.tolerance:.0%} slower "
+              f"than the baseline from {baseline['meta']['date']}):")
+        for key, before, seconds in regressions:
+            print(f"!!! {key:>50} {before * 1e3:>9.2f} ms --> {seconds * 1e3:>9.2f} ms ({seconds / before:.1f}x)")
+        sys.exit(1)
+    print(f"no regressions in {compared} measurements compared with the baseline")
+
+
+if __name__ == "__main__":
+    main()
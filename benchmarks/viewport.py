@@ -0,0 +1,66 @@
+# benchmark: full redraw of an 800 x 800 window through a camera on random geometric graphs of growing size.
+# Zoomed in (zoom 1), only the visible part is looked up in the spatial indexes --> the time has to stay the same
+# for all sizes. Zoomed out to the whole graph, the level of detail (pixel nodes, merged cells) applies: the first
+# redraw merges the nodes and connections into cells, every further one (e.g. after moving the camera) only draws them
+# usage: python benchmarks/viewport.py [number of nodes ...]
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+from Camera import Camera
+from Graph import NetworkGraph
+from GraphGenerators import random_geometric_graph
+from Renderer import GraphRenderer
+
+SIZES = (10 ** 4, 10 ** 5)
+SCREEN_SIZE = (800, 800)
+MAX_SLOWDOWN = 3.0  # allowed growth of the zoomed-in redraw time between the smallest and the largest graph
+
+
+# seconds for a full redraw (background and sprites are rebuilt, as after the camera moved)
+def time_redraw(renderer, screen):
+    renderer.background = None
+    begin = time.perf_counter()
+    renderer.draw_all(screen)
+    return time.perf_counter() - begin
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    pygame.init()
+    screen = pygame.Surface(SCREEN_SIZE)
+    print(f"{'nodes':>8} {'indexes':>10} {'zoomed in':>10} {'immediate':>10} {'zoomed out':>11} {'again':>9} "
+          f"{'zoom':>7}")
+    zoomed_in = []
+    for n in sizes:
+        graph = NetworkGraph(random_geometric_graph(n, seed=1))
+        begin = time.perf_counter()
+        graph.nodes_in_area(0, 0, 1, 1)  # builds the spatial index of the nodes ...
+        graph.edges_in_area(0, 0, 1, 1)  # ... and of the connections
+        indexes = time.perf_counter() - begin
+        side = max(graph.core.xs) + 1
+        camera = Camera(side / 2 - SCREEN_SIZE[0] / 2, side / 2 - SCREEN_SIZE[1] / 2)  # center of the graph
+        renderer = GraphRenderer(graph, camera)
+        time_redraw(renderer, screen)  # sprites are rendered once
+        seconds = min(time_redraw(renderer, screen) for _ in range(3))
+        zoomed_in.append(seconds)
+        begin = time.perf_counter()
+        graph.draw(screen, camera)  # immediate mode (draws every visible node and connection)
+        immediate = time.perf_counter() - begin
+        camera.fit(0, 0, side, side, SCREEN_SIZE)
+        zoomed_out = time_redraw(renderer, screen)
+        camera.pan(10, 10)
+        again = time_redraw(renderer, screen)
+        print(f"{n:>8} {indexes * 1e3:>7.0f} ms {seconds * 1e3:>7.1f} ms {immediate * 1e3:>7.1f} ms "
+              f"{zoomed_out * 1e3:>8.0f} ms {again * 1e3:>6.0f} ms {camera.zoom:>7.4f}")
+    slowdown = zoomed_in[-1] / zoomed_in[0]
+    if slowdown > MAX_SLOWDOWN:
+        sys.exit(f"zoomed-in redraw depends on the size of the graph: {slowdown:.1f}x slower")
+    print("zoomed-in redraw time does not depend on the size of the graph")
+
+
+if __name__ == "__main__":
+    main()
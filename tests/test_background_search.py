@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from BackgroundSearch import BackgroundSearch
+from Graph import NetworkGraph
+from GraphGenerators import random_geometric_graph
+from Pathfinding import ALTStar, Dijkstra
+
+MAX_CANCEL_TIME = 0.5  # seconds
+
+
+class BackgroundSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = NetworkGraph(random_geometric_graph(20000, seed=1))
+
+    def test_finds_path(self):
+        search = BackgroundSearch(self.graph, Dijkstra, 0, 19999)
+        search.verbose = False
+        while not search.has_finished():
+            search.step()
+        self.assertEqual(search.cost, Dijkstra(self.graph.core, 0, 19999).run(record_trace=False).cost)
+
+    # cancelling while the landmarks of ALT* are built returns right away and caches no (incomplete) landmarks
+    def test_cancel_during_preprocessing(self):
+        search = BackgroundSearch(self.graph, ALTStar, 0, 19999)
+        search.verbose = False
+        time.sleep(0.1)
+        begin = time.perf_counter()
+        search.cancel()
+        self.assertLess(time.perf_counter() - begin, MAX_CANCEL_TIME)
+        self.assertTrue(search.has_finished())
+        self.assertNotIn("landmarks", self.graph.core.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
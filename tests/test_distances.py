@@ -0,0 +1,30 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Distances import MAX_CACHED_TREES, dijkstra_tree, shortest_path_tree
+from GraphGenerators import grid_graph
+
+
+class ShortestPathTreeTest(unittest.TestCase):
+    def setUp(self):
+        self.core = grid_graph(5, 5)
+
+    def test_tree(self):
+        self.assertEqual(shortest_path_tree(self.core, 7), dijkstra_tree(self.core, 7))
+
+    # one tree per heat map source must not grow the cache without bound; the least recently used tree is dropped
+    def test_cache_is_limited(self):
+        first = shortest_path_tree(self.core, 0)
+        for source in range(1, 3 * MAX_CACHED_TREES):
+            shortest_path_tree(self.core, source)
+            shortest_path_tree(self.core, 0)  # keeps the first tree recently used
+        self.assertEqual(len(self.core.cache["trees"]), MAX_CACHED_TREES)
+        self.assertIs(shortest_path_tree(self.core, 0), first)
+        self.assertNotIn(1, self.core.cache["trees"])
+
+    def test_cache_is_cleared_on_edit(self):
+        shortest_path_tree(self.core, 0)
+        self.core.remove_edge(0, 1)
+        self.assertEqual(shortest_path_tree(self.core, 0)[0][1], 3 * 50)  # around the removed connection
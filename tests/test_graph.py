@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Graph import NetworkGraph, State
+from GraphGenerators import grid_graph
+
+
+class NetworkGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = NetworkGraph(grid_graph(3, 3))
+        for _, e in self.graph.core.neighbours(4):  # color all connections of the center node
+            self.graph.set_edge_state(e, State.VISITED)
+
+    # removed connections must not stay colored (they would still be drawn)
+    def test_remove_node_forgets_its_connections(self):
+        self.graph.remove_node(self.graph.node(4))
+        self.assertEqual(self.graph.touched_edges, set())
+        self.assertFalse(any(self.graph.edge_state))
+
+    def test_disconnect_forgets_the_connection(self):
+        e = self.graph.core.find_edge(4, 5)
+        self.graph.disconnect_node_pairs((5,), (4,))
+        self.assertNotIn(e, self.graph.touched_edges)
+        self.assertEqual(self.graph.edge_state[e], State.DEFAULT.value)
+        self.assertEqual(len(self.graph.touched_edges), 3)
+
+    # the distances of the heat map are outdated after an edit --> the heat map is removed
+    def test_edits_remove_the_heat_map(self):
+        edits = (lambda: self.graph.disconnect_node_pairs((4,), (5,)),
+                 lambda: self.graph.connect_node_pairs((0,), (8,)),
+                 lambda: self.graph.remove_node(self.graph.node(8)))
+        for edit in edits:
+            self.graph.show_distances(self.graph.node(0))
+            self.assertTrue(any(self.graph.node_heat))
+            edit()
+            self.assertEqual(self.graph.heat_source, -1)
+            self.assertFalse(any(self.graph.node_heat))
+
+    # a new (unconnected) node does not change the distances
+    def test_new_node_keeps_the_heat_map(self):
+        self.graph.show_distances(self.graph.node(0))
+        self.graph.add_node((500, 500))
+        self.assertEqual(self.graph.heat_source, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
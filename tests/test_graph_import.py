@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from GraphImport import import_edge_list, import_graph, import_osm
+
+SAMPLES = os.path.join(ROOT, "samples")
+
+
+class GraphImportTest(unittest.TestCase):
+    def assertCounts(self, core, nodes, edges):
+        self.assertEqual((core.node_count, core.edge_count), (nodes, edges))
+
+    def test_dimacs(self):
+        self.assertCounts(import_graph(os.path.join(SAMPLES, "tiny.gr")), 9, 13)
+
+    def test_edge_list(self):
+        self.assertCounts(import_edge_list(os.path.join(SAMPLES, "tiny_edges.csv"),
+                                           os.path.join(SAMPLES, "tiny_nodes.csv")), 9, 13)
+        self.assertCounts(import_graph(os.path.join(SAMPLES, "tiny_edges.csv")), 9, 13)
+
+    # only the nodes of highways are kept (the building way is skipped), the duplicate footway edge is dropped
+    def test_osm(self):
+        self.assertCounts(import_osm(os.path.join(SAMPLES, "tiny.osm")), 6, 6)
+
+    # the highway tag of a node (traffic signals) does not turn the building way after it into a road
+    def test_osm_tagged_node(self):
+        self.assertCounts(import_osm(os.path.join(SAMPLES, "tagged_node.osm")), 2, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
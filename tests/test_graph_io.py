@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import random_geometric_graph
+from GraphIO import load_core, save_graph
+
+
+class GraphIOTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.pfvg")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # a graph whose arrays are views of the memory-mapped file is saved to the same file again
+    def test_save_over_memory_mapped_file(self):
+        core = random_geometric_graph(500, seed=1)
+        save_graph(core, self.path)
+        loaded, _, _ = load_core(self.path, use_mmap=True)
+        save_graph(loaded, self.path)
+        reloaded, _, _ = load_core(self.path, use_mmap=False)
+        self.assertEqual(list(reloaded.xs), list(core.xs))
+        self.assertEqual(reloaded.edge_count, core.edge_count)
+        self.assertEqual(sorted(reloaded.neighbours(0)), sorted(core.neighbours(0)))
+
+    def test_truncated_file_is_rejected(self):
+        save_graph(random_geometric_graph(500, seed=1), self.path)
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for size in (10, 4096, len(data) - 8):
+            with open(self.path, "wb") as file:
+                file.write(data[:size])
+            with self.assertRaises(ValueError):
+                load_core(self.path, use_mmap=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
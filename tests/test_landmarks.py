@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import random_geometric_graph
+from Landmarks import build_landmarks, load_landmarks, save_landmarks
+
+
+class LandmarksTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.pfvl")
+        self.core = random_geometric_graph(300, seed=1)
+        save_landmarks(build_landmarks(self.core, count=4, seed=1), self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_load(self):
+        table = load_landmarks(random_geometric_graph(300, seed=1), self.path, use_mmap=False)
+        self.assertIsNotNone(table)
+        self.assertEqual(list(table.rows[0]), list(build_landmarks(self.core, count=4, seed=1).rows[0]))
+
+    # same number of nodes and edges, but another graph --> the table must not be used
+    def test_other_graph_of_same_size(self):
+        other = random_geometric_graph(300, seed=1)
+        other.xs[0] += 1
+        self.assertIsNone(load_landmarks(other, self.path, use_mmap=False))
+
+    def test_truncated_file_is_rejected(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for size in (10, 60, len(data) - 8):
+            with open(self.path, "wb") as file:
+                file.write(data[:size])
+            for use_mmap in (False, True):
+                with self.assertRaises(ValueError):
+                    load_landmarks(random_geometric_graph(300, seed=1), self.path, use_mmap=use_mmap)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import math
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from GraphCore import GraphCore
+from GraphGenerators import random_geometric_graph
+from GraphImport import import_graph
+from Pathfinding import AStar, ALTStar, BidirectionalDijkstra, BreadthFirst, Dijkstra, LPAStar
+
+
+# graph like random_geometric_graph(n), but every weight is a random fraction of the length of its edge
+def shortened_weights_graph(n, seed):
+    core = random_geometric_graph(n, seed=seed)
+    rng = random.Random(seed)
+    ws = [w * rng.uniform(0.01, 0.02) for w in core.edge_w]
+    return GraphCore.from_arrays(core.xs, core.ys, core.edge_u, core.edge_v, ws)
+
+
+class AStarTest(unittest.TestCase):
+    # A*, ALT* and LPA* find paths as short as dijkstra
+    def assertShortestPaths(self, core, pairs):
+        for start, end in pairs:
+            expected = Dijkstra(core, start, end).run(record_trace=False).cost
+            for algorithm_class in (AStar, ALTStar, LPAStar):
+                cost = algorithm_class(core, start, end).run(record_trace=False).cost
+                self.assertTrue(math.isclose(cost, expected), f"{algorithm_class.__name__} {start} -> {end}")
+
+    # weights are road lengths in meters, the heuristic is measured in pixels
+    def test_imported_weights(self):
+        core = import_graph(os.path.join(ROOT, "samples", "tiny.gr"), keep_weights=True)
+        nodes = list(core.node_ids())
+        self.assertShortestPaths(core, [(u, v) for u in nodes for v in nodes if u != v])
+
+    def test_weights_shorter_than_distances(self):
+        core = shortened_weights_graph(300, seed=3)
+        nodes = list(core.node_ids())
+        rng = random.Random(3)
+        self.assertShortestPaths(core, [(rng.choice(nodes), rng.choice(nodes)) for _ in range(20)])
+
+    # connections added by the user get the default weight (their length), which is shorter than the weights
+    # of the graph --> the heuristic must not keep the scale of the weighted graph
+    def test_default_weights_after_longer_weights(self):
+        core = random_geometric_graph(300, seed=5)
+        core = GraphCore.from_arrays(core.xs, core.ys, core.edge_u, core.edge_v, [5 * w for w in core.edge_w])
+        self.assertAlmostEqual(core.weight_scale(), 5.0)
+        nodes = list(core.node_ids())
+        rng = random.Random(5)
+        core.add_edge(nodes[0], nodes[-1])
+        core.add_edges([rng.choice(nodes) for _ in range(20)], [rng.choice(nodes) for _ in range(20)])
+        self.assertEqual(core.weight_scale(), 1.0)
+        self.assertShortestPaths(core, [(rng.choice(nodes), rng.choice(nodes)) for _ in range(20)])
+
+    def test_weight_scale(self):
+        core = GraphCore.from_arrays([0, 30, 0], [0, 40, 80], [0], [1])
+        self.assertEqual(core.weight_scale(), 1.0)
+        core.add_edge(1, 2, weight=5.0)  # length 50
+        self.assertEqual(core.weight_scale(), 0.1)
+        core.remove_edge(1, 2)
+        self.assertEqual(core.weight_scale(), 0.1)  # still a lower bound
+
+
+class EditedSearchTest(unittest.TestCase):
+    # a connection of the path is removed between the steps of the search --> it ends without a path
+    # (instead of summing up the weight of an unrelated connection)
+    def test_removed_connection_of_the_path(self):
+        for algorithm_class in (BreadthFirst, Dijkstra, BidirectionalDijkstra):
+            core = GraphCore.from_arrays([0, 40, 80, 120], [0, 0, 0, 0], [0, 1, 2], [1, 2, 3])
+            algorithm = algorithm_class(core, 0, 3)
+            algorithm.verbose = False
+            while 2 not in algorithm.prev:  # node 2 was reached over node 1
+                algorithm.step()
+            core.remove_edge(1, 2)
+            while not algorithm.has_finished():
+                algorithm.step()
+            self.assertIsNone(algorithm.path, algorithm_class.__name__)
+            self.assertIsNone(algorithm.cost, algorithm_class.__name__)
+
+
+if __name__ == "__main__":
+    unittest.main()
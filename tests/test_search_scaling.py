@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GraphGenerators import grid_graph
+from Pathfinding import BreadthFirst, DepthFirst
+
+SIDES = (60, 120)  # grids with 3600 and 14400 nodes
+REPEATS = 3  # best time counts
+MAX_SLOWDOWN = 2.0  # allowed growth of the time per node from the small to the large grid (quadratic: about 4x)
+
+
+# exhaustive search of a side x side grid (the end node is isolated); returns (seconds, stats, nodes, edges)
+def search_grid(algorithm_class, side):
+    core = grid_graph(side, side)
+    nodes, edges = core.node_count, core.edge_count
+    unreachable = core.add_node(-1, -1)
+    best = None
+    for _ in range(REPEATS):
+        algorithm = algorithm_class(core, 0, unreachable)
+        algorithm.verbose = False
+        begin = time.perf_counter()
+        while not algorithm.has_finished():
+            algorithm.step()
+        seconds = time.perf_counter() - begin
+        best = seconds if best is None else min(best, seconds)
+    return best, algorithm.stats, nodes, edges
+
+
+class SearchScalingTest(unittest.TestCase):
+    # every node is expanded once and every connection is looked at once from each side
+    def test_operation_counts(self):
+        for algorithm_class in (BreadthFirst, DepthFirst):
+            for side in SIDES:
+                _, stats, nodes, edges = search_grid(algorithm_class, side)
+                self.assertEqual(stats.expanded, nodes)
+                self.assertEqual(stats.relaxed, 2 * edges)
+
+    def test_time_per_node_is_constant(self):
+        for algorithm_class in (BreadthFirst, DepthFirst):
+            (small, _, small_nodes, _), (large, _, large_nodes, _) = [search_grid(algorithm_class, side)
+                                                                      for side in SIDES]
+            slowdown = (large / large_nodes) / (small / small_nodes)
+            self.assertLess(slowdown, MAX_SLOWDOWN, f"{algorithm_class.__name__} does not scale linearly")
+
+
+if __name__ == "__main__":
+    unittest.main()
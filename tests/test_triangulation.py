@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Triangulation import delaunay_pairs
+
+
+# True if point w lies on the segment u-v (between its end points)
+def on_segment(xs, ys, u, v, w):
+    cross = (xs[v] - xs[u]) * (ys[w] - ys[u]) - (ys[v] - ys[u]) * (xs[w] - xs[u])
+    return cross == 0 and (xs[w] - xs[u]) * (xs[v] - xs[w]) + (ys[w] - ys[u]) * (ys[v] - ys[w]) > 0
+
+
+class TriangulationTest(unittest.TestCase):
+    def assertNoEdgeThroughNodes(self, xs, ys, pairs):
+        for u, v in pairs:
+            for w in range(len(xs)):
+                self.assertFalse(on_segment(xs, ys, u, v, w), f"edge {u}-{v} passes through node {w}")
+
+    # a triangulation of n points, h of them on the convex hull, has 3n - 3 - h edges
+    def test_lattice(self):
+        side = 4
+        xs = [40.0 * (i % side) for i in range(side * side)]
+        ys = [40.0 * (i // side) for i in range(side * side)]
+        pairs = set(zip(*delaunay_pairs(range(side * side), xs, ys)))
+        self.assertNoEdgeThroughNodes(xs, ys, pairs)
+        self.assertEqual(len(pairs), 3 * side * side - 3 - 4 * (side - 1))
+
+    def test_collinear_points(self):
+        xs, ys = [40.0 * i for i in range(6)], [0.0] * 6
+        pairs = set(zip(*delaunay_pairs(range(6), xs, ys)))
+        self.assertEqual({tuple(sorted(pair)) for pair in pairs}, {(i, i + 1) for i in range(5)})
+
+    # no edge next to the convex hull is lost
+    def test_random_points(self):
+        for seed in (10, 71, 191):
+            generator = random.Random(seed)
+            n = generator.randint(3, 120)
+            xs = [generator.uniform(0, 1000) for _ in range(n)]
+            ys = [generator.uniform(0, 1000) for _ in range(n)]
+            pairs = set(zip(*delaunay_pairs(range(n), xs, ys)))
+            hull = set()
+            for u, v in pairs:  # edge u-v is on the hull if all points lie on one side of it
+                sides = {(xs[v] - xs[u]) * (ys[w] - ys[u]) - (ys[v] - ys[u]) * (xs[w] - xs[u]) > 0
+                         for w in range(n) if w != u and w != v}
+                if len(sides) == 1:
+                    hull.update((u, v))
+            self.assertEqual(len(pairs), 3 * n - 3 - len(hull))
+
+
+if __name__ == "__main__":
+    unittest.main()